@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import random
 
+from zobrist import ZobristKeys
+
 class CellState(Enum):
     EMPTY = 0
     SHIP = 1
@@ -18,19 +20,18 @@ class Ship:
         self.position = position
         self.orientation = orientation
         self.hits = 0
+        # Координати обчислюються один раз: позиція корабля після створення не змінюється
+        x, y = position
+        if orientation == Orientation.HORIZONTAL:
+            self.coordinates: Tuple[Tuple[int, int], ...] = tuple((x + i, y) for i in range(size))
+        else:
+            self.coordinates = tuple((x, y + i) for i in range(size))
 
     def is_sunk(self) -> bool:
         return self.hits >= self.size
 
     def get_coordinates(self) -> List[Tuple[int, int]]:
-        coords = []
-        x, y = self.position
-        for i in range(self.size):
-            if self.orientation == Orientation.HORIZONTAL:
-                coords.append((x + i, y))
-            else:
-                coords.append((x, y + i))
-        return coords
+        return list(self.coordinates)
 
 class Board:
     """Клас ігрового поля для морського бою"""
@@ -40,10 +41,15 @@ class Board:
         # Сітка зі станами клітинок
         self.grid = [[CellState.EMPTY for _ in range(size)] for _ in range(size)]
         self.ships: List[Ship] = []
+        # Індекс клітинка -> корабель (ключ — y * size + x)
+        self.ship_at: Dict[int, Ship] = {}
         # Матриця відкритих клітинок (для відстеження пострілів)
         self.revealed = [[False for _ in range(size)] for _ in range(size)]
         # Конфігурація кораблів
         self.ship_sizes = ship_sizes if ship_sizes else [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
+        # Хеш Зобріста того, що видно противнику (оновлюється в attack і mark_surrounding_as_miss)
+        self._zobrist_keys = ZobristKeys.for_board(size)
+        self.zobrist = self._zobrist_keys.fleet(self.ship_sizes)
     
     def can_place_ship(self, size: int, x: int, y: int, orientation: Orientation) -> bool:
         if orientation == Orientation.HORIZONTAL:
@@ -76,8 +82,9 @@ class Board:
         ship = Ship(size, (x, y), orientation)
         self.ships.append(ship)
         
-        for coord_x, coord_y in ship.get_coordinates():
+        for coord_x, coord_y in ship.coordinates:
             self.grid[coord_y][coord_x] = CellState.SHIP
+            self.ship_at[coord_y * self.size + coord_x] = ship
         
         return True
     
@@ -89,25 +96,27 @@ class Board:
         
         if self.grid[y][x] == CellState.SHIP:
             self.grid[y][x] = CellState.HIT
+            self.zobrist ^= self._zobrist_keys.hit[y * self.size + x]
             
-            for ship in self.ships:
-                if (x, y) in ship.get_coordinates():
-                    ship.hits += 1
-                    if ship.is_sunk():
-                        self.mark_surrounding_as_miss(ship)
-                        return True, True, ship
-                    return True, False, ship
-            
-            return True, False, None
+            ship = self.ship_at.get(y * self.size + x)
+            if ship is None:
+                return True, False, None
+
+            ship.hits += 1
+            if ship.is_sunk():
+                self.zobrist ^= self._zobrist_keys.sunk(ship)
+                self.mark_surrounding_as_miss(ship)
+                return True, True, ship
+            return True, False, ship
         elif self.grid[y][x] == CellState.EMPTY:
             self.grid[y][x] = CellState.MISS
+            self.zobrist ^= self._zobrist_keys.miss[y * self.size + x]
             return False, False, None
         
         return False, False, None
     
     def mark_surrounding_as_miss(self, ship: Ship):
-        ship_coords = ship.get_coordinates()
-        for sx, sy in ship_coords:
+        for sx, sy in ship.coordinates:
             for dx in range(-1, 2):
                 for dy in range(-1, 2):
                     nx, ny = sx + dx, sy + dy
@@ -115,19 +124,22 @@ class Board:
                         if self.grid[ny][nx] == CellState.EMPTY:
                             self.grid[ny][nx] = CellState.MISS
                             self.revealed[ny][nx] = True
+                            self.zobrist ^= self._zobrist_keys.miss[ny * self.size + nx]
     
     def all_ships_sunk(self) -> bool:
         return all(ship.is_sunk() for ship in self.ships)
     
-    def place_ships_randomly(self):
-        ship_sizes = self.ship_sizes
-        
-        for size in ship_sizes:
-            placed = False
-            attempts = 0
-            while not placed and attempts < 1000:
-                x = random.randint(0, self.size - 1)
-                y = random.randint(0, self.size - 1)
-                orientation = random.choice([Orientation.HORIZONTAL, Orientation.VERTICAL])
-                placed = self.place_ship(size, x, y, orientation)
-                attempts += 1
\ No newline at end of file
+    def place_ships_randomly(self, rng: random.Random = None):
+        # Імпорт тут, бо placement сам залежить від цього модуля
+        from placement import PlacementTable, generate_fleet
+
+        # Вже поставлені кораблі разом із сусідніми клітинками недоступні
+        table = PlacementTable.for_board(self.size)
+        blocked = 0
+        for ship in self.ships:
+            placement = table.lookup(ship.size, ship.position[0], ship.position[1], ship.orientation)
+            if placement is not None:
+                blocked |= placement.halo
+
+        for placement in generate_fleet(self.size, self.ship_sizes, rng, blocked=blocked):
+            self.place_ship(placement.size, placement.x, placement.y, placement.orientation)
\ No newline at end of file
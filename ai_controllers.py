@@ -1,6 +1,11 @@
 import random
-from typing import Tuple, List, Set, Optional
-from Board import Board
+from collections import Counter
+from typing import Callable, Dict, Tuple, List, Set, Optional
+from Board import Board, CellState
+from placement import PlacementTable
+from zobrist import TranspositionCache
+import density
+import sampler
 
 
 class IAIController:
@@ -12,18 +17,39 @@ class IAIController:
         """Опціональний метод для обробки результатів атаки (реалізується у HardAI)."""
         pass
 
+    def warm_up(self):
+        """Опціональна підготовка на старті гри (наприклад, запуск пулу процесів)."""
+        pass
+
+    def prepare_attack(self):
+        """Опціонально починає рахувати наступний хід у фоні, не блокуючи виклик."""
+        pass
+
+    def attack_ready(self) -> bool:
+        """Чи можна викликати perform_attack без очікування (після prepare_attack)."""
+        return True
+
+    def close(self):
+        """Звільняє ресурси контролера наприкінці гри."""
+        pass
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Статистика кешу оцінок за хешем поля (порожня, якщо кешу немає)."""
+        return {}
+
 
 class EasyAIController(IAIController):
     """Простий бот: стріляє випадково, уникаючи повторів."""
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, rng: random.Random = None):
         self.board = board
         self.size = board.size
+        self.rng = rng or random
         self.attacked: Set[Tuple[int, int]] = set()
 
     def perform_attack(self) -> Tuple[int, int]:
         while True:
-            x = random.randint(0, self.size - 1)
-            y = random.randint(0, self.size - 1)
+            x = self.rng.randint(0, self.size - 1)
+            y = self.rng.randint(0, self.size - 1)
             if (x, y) not in self.attacked:
                 self.attacked.add((x, y))
                 return x, y
@@ -31,9 +57,10 @@ class EasyAIController(IAIController):
 
 class HardAIController(IAIController):
     """Складний бот: покращена стратегія 'пошук і добивання'."""
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, rng: random.Random = None):
         self.board = board
         self.size = board.size
+        self.rng = rng or random
         self.attacked: Set[Tuple[int, int]] = set()
         self.hits: List[Tuple[int, int]] = []         # поточні не потоплені влучання
         self.target_queue: List[Tuple[int, int]] = [] # пріоритетні цілі для добивання
@@ -92,7 +119,7 @@ class HardAIController(IAIController):
             if (x + y) % 2 == 0 and self._is_valid_board_cell(x, y)
         ]
         if candidates:
-            choice = random.choice(candidates)
+            choice = self.rng.choice(candidates)
             self.attacked.add(choice)
             return choice
 
@@ -162,4 +189,609 @@ class HardAIController(IAIController):
             return False
         if self.board.revealed[y][x]:
             return False
-        return True
\ No newline at end of file
+        return True
+
+
+class LegacyAIController(IAIController):
+    """Логіка ходу комп'ютера з ранніх версій гри (колишній BattleshipGame.get_ai_move).
+
+    easy — повністю випадковий постріл по невідкритій клітинці без добивання;
+    hard — режими 'hunt' (шаховий пошук) і 'target' (черга сусідніх клітинок
+    після влучання)."""
+
+    def __init__(self, board: Board, difficulty: str = "easy", rng: random.Random = None):
+        self.board = board
+        self.size = board.size
+        self.rng = rng or random
+        self.difficulty = difficulty
+        self.mode = "hunt"                           # hunt (пошук) або target (добивання)
+        self.target_queue: List[Tuple[int, int]] = []  # черга клітинок для атаки після влучання
+        self.last_hit: Optional[Tuple[int, int]] = None
+
+    def perform_attack(self) -> Tuple[Optional[int], Optional[int]]:
+        revealed = self.board.revealed
+
+        # EASY: повністю випадкова атака по будь-якій невідкритій клітині
+        if self.difficulty == "easy":
+            choices = [
+                (x, y)
+                for y in range(self.size)
+                for x in range(self.size)
+                if not revealed[y][x]
+            ]
+            if not choices:
+                return None, None
+            return self.rng.choice(choices)
+
+        # HARD: режим добивання — атакуємо клітинки поруч з влучаннями
+        if self.mode == "target" and self.target_queue:
+            while self.target_queue:
+                x, y = self.target_queue.pop(0)
+                if 0 <= x < self.size and 0 <= y < self.size:
+                    if not revealed[y][x]:
+                        return x, y
+            # Якщо черга порожня, повертаємося до режиму пошуку
+            self.mode = "hunt"
+
+        # Режим пошуку: шахова модель для ефективності
+        max_attempts = self.size * 20
+        attempts = 0
+        while attempts < max_attempts:
+            x = self.rng.randint(0, self.size - 1)
+            y = self.rng.randint(0, self.size - 1)
+            if not revealed[y][x]:
+                if (x + y) % 2 == 0 or attempts > max_attempts // 2:
+                    return x, y
+            attempts += 1
+
+        # Фолбек — перша невідкрита клітинка
+        for y in range(self.size):
+            for x in range(self.size):
+                if not revealed[y][x]:
+                    return x, y
+
+        return None, None
+
+    def register_result(self, x: int, y: int, hit: bool, sunk: bool):
+        if hit:
+            self.last_hit = (x, y)
+            if not sunk:
+                # Влучання: переходимо в режим добивання, додаємо сусідні клітинки
+                self.mode = "target"
+                self._add_adjacent_targets(x, y)
+            else:
+                # Корабель потоплений: очищаємо цілі, повертаємося до режиму пошуку
+                self.mode = "hunt"
+                self.target_queue.clear()
+                self.last_hit = None
+        else:
+            self.mode = "hunt" if not self.target_queue else "target"
+
+    def _add_adjacent_targets(self, x: int, y: int):
+        """Додає сусідні клітинки до черги цілей (вправо, вниз, вліво, вгору)."""
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                if not self.board.revealed[ny][nx]:
+                    if (nx, ny) not in self.target_queue:
+                        self.target_queue.append((nx, ny))
+
+class DensityAIController(IAIController):
+    """Бот на карті щільності ймовірностей.
+
+    Для кожного розміру корабля, що ще на плаву, підтримує множину розміщень,
+    сумісних з усіма відомими промахами, влучаннями та правилом "кораблі не
+    торкаються", і скільки з них покриває кожну клітинку. Стріляє в невідкриту
+    клітинку з найбільшим покриттям. Розміщення, що проходять через влучання,
+    мають вагу TARGET_WEIGHT за кожне влучання — так бот добиває поранені
+    кораблі. Карта оновлюється інкрементально в register_result, а не
+    перераховується з нуля на кожному ході.
+
+    На великих полях (від VECTORIZED_MIN_SIZE) за наявності NumPy карта
+    щоходу рахується векторно модулем density, а інкрементальні таблиці
+    розміщень не будуються зовсім.
+
+    Найкращі клітинки залежать лише від спостережуваного стану поля, тож
+    вони кешуються за board.zobrist у спільному для всіх партій кеші."""
+
+    TARGET_WEIGHT = density.TARGET_WEIGHT
+    VECTORIZED_MIN_SIZE = 20
+    cache = TranspositionCache("density", 100_000)
+
+    UNKNOWN = 0
+    MISS = 1
+    HIT = 2
+    SUNK = 3
+
+    def __init__(self, board: Board, rng: random.Random = None):
+        self.board = board
+        self.size = board.size
+        self.rng = rng or random
+        self.attacked: Set[Tuple[int, int]] = set()
+        self.table = PlacementTable.for_board(self.size)
+        self.vectorized = density.HAS_NUMPY and self.size >= self.VECTORIZED_MIN_SIZE
+
+        # Скільки кораблів кожного розміру ще не потоплено
+        self.remaining: Dict[int, int] = Counter(board.ship_sizes)
+        self.sizes = [] if self.vectorized else sorted(self.remaining, reverse=True)
+
+        # Що відомо про кожну клітинку (номер клітинки — y * size + x)
+        self.known = bytearray(self.size * self.size)
+        self._known_mask = 0
+        self.open_hits: Set[int] = set()  # влучання в ще не потоплені кораблі
+
+        # Для кожного розміру: живі розміщення, їх ваги та покриття клітинок
+        self._placements = {size: self.table.placements(size) for size in self.sizes}
+        self._by_cell = {}
+        self._by_ring = {}
+        self._alive: Dict[int, bytearray] = {}
+        self._weights: Dict[int, List[int]] = {}
+        self._coverage: Dict[int, List[int]] = {}
+        for size in self.sizes:
+            self._by_cell[size], self._by_ring[size] = self.table.cell_index(size)
+            count = len(self._placements[size])
+            self._alive[size] = bytearray(b"\x01") * count
+            self._weights[size] = [1] * count
+            self._coverage[size] = list(self.table.base_coverage(size))
+
+    def perform_attack(self) -> Tuple[Optional[int], Optional[int]]:
+        if self.vectorized:
+            key = self.board.zobrist
+            best_cells = self.cache.get(key)
+            if best_cells is None:
+                best_cells = density.best_cells(self.board)
+                self.cache.put(key, best_cells)
+            cell = density.pick_cell(best_cells, self.size, self.rng)
+            if cell is None:
+                return None, None
+            self.attacked.add(cell)
+            return cell
+
+        # Таблиці оновлюються завжди: кеш заміняє лише перебір клітинок
+        self._sync_with_board()
+        key = self.board.zobrist
+        best_cells = self.cache.get(key)
+        if best_cells is None:
+            best_cells = self._best_cells()
+            self.cache.put(key, best_cells)
+
+        if not best_cells:
+            return None, None
+
+        cell = self.rng.choice(best_cells)
+        x, y = cell % self.size, cell // self.size
+        self.attacked.add((x, y))
+        return x, y
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self.cache.stats()
+
+    def _best_cells(self) -> List[int]:
+        """Невідкриті клітинки з найбільшим покриттям за поточними таблицями."""
+        best_score = -1
+        best_cells: List[int] = []
+        active = [(self.remaining[size], self._coverage[size]) for size in self.sizes if self.remaining[size] > 0]
+        known = self.known
+        for cell in range(self.size * self.size):
+            if known[cell] != self.UNKNOWN:
+                continue
+            score = 0
+            for multiplier, coverage in active:
+                score += multiplier * coverage[cell]
+            if score > best_score:
+                best_score = score
+                best_cells = [cell]
+            elif score == best_score:
+                best_cells.append(cell)
+        return best_cells
+
+    def register_result(self, x: int, y: int, hit: bool, sunk: bool):
+        """Оновлює карту щільності після пострілу."""
+        self.attacked.add((x, y))
+        if self.vectorized or not (0 <= x < self.size and 0 <= y < self.size):
+            return
+        cell = y * self.size + x
+        if hit:
+            self._mark_hit(cell)
+            if sunk:
+                self._mark_sunk(self._hit_component(cell))
+        else:
+            self._mark_miss(cell)
+
+    # ------------------------------------------------------------------ #
+    # Інкрементальне оновлення
+    # ------------------------------------------------------------------ #
+    def _remove_placement(self, size: int, placement_id: int):
+        alive = self._alive[size]
+        if not alive[placement_id]:
+            return
+        alive[placement_id] = 0
+        weight = self._weights[size][placement_id]
+        coverage = self._coverage[size]
+        for cell in self._placements[size][placement_id].cells:
+            coverage[cell] -= weight
+
+    def _set_known(self, cell: int, state: int):
+        self.known[cell] = state
+        self._known_mask |= 1 << cell
+
+    def _mark_miss(self, cell: int):
+        if self.known[cell] != self.UNKNOWN:
+            return
+        self._set_known(cell, self.MISS)
+        for size in self.sizes:
+            for placement_id in self._by_cell[size][cell]:
+                self._remove_placement(size, placement_id)
+
+    def _mark_hit(self, cell: int):
+        if self.known[cell] != self.UNKNOWN:
+            return
+        self._set_known(cell, self.HIT)
+        self.open_hits.add(cell)
+        for size in self.sizes:
+            # Корабель, що лише торкається влучання, неможливий
+            for placement_id in self._by_ring[size][cell]:
+                self._remove_placement(size, placement_id)
+            # Розміщення через влучання стають пріоритетними
+            alive = self._alive[size]
+            weights = self._weights[size]
+            coverage = self._coverage[size]
+            for placement_id in self._by_cell[size][cell]:
+                if alive[placement_id]:
+                    weights[placement_id] += self.TARGET_WEIGHT
+                    for covered in self._placements[size][placement_id].cells:
+                        coverage[covered] += self.TARGET_WEIGHT
+
+    def _mark_sunk(self, cells: List[int]):
+        for cell in cells:
+            self.open_hits.discard(cell)
+            self._set_known(cell, self.SUNK)
+            for size in self.sizes:
+                for placement_id in self._by_cell[size][cell]:
+                    self._remove_placement(size, placement_id)
+
+        if self.remaining.get(len(cells), 0) > 0:
+            self.remaining[len(cells)] -= 1
+
+        # Навколо потопленого корабля інших кораблів бути не може
+        for cell in cells:
+            cx, cy = cell % self.size, cell // self.size
+            for dx in range(-1, 2):
+                for dy in range(-1, 2):
+                    nx, ny = cx + dx, cy + dy
+                    if 0 <= nx < self.size and 0 <= ny < self.size:
+                        self._mark_miss(ny * self.size + nx)
+
+    def _hit_component(self, cell: int) -> List[int]:
+        """Усі непотоплені влучання, з'єднані з cell по горизонталі/вертикалі.
+
+        Оскільки кораблі не торкаються, це рівно клітинки одного корабля."""
+        component = [cell]
+        seen = {cell}
+        stack = [cell]
+        while stack:
+            current = stack.pop()
+            cx, cy = current % self.size, current // self.size
+            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < self.size and 0 <= ny < self.size:
+                    neighbour = ny * self.size + nx
+                    if neighbour in self.open_hits and neighbour not in seen:
+                        seen.add(neighbour)
+                        component.append(neighbour)
+                        stack.append(neighbour)
+        return component
+
+    def _sync_with_board(self):
+        """Враховує клітинки, відкриті не нашими пострілами (ракети, кракен, ореоли)."""
+        revealed_mask = getattr(self.board, "revealed_mask", None)
+        if revealed_mask is not None:
+            new_mask = revealed_mask & ~self._known_mask
+            new_cells = []
+            while new_mask:
+                low_bit = new_mask & -new_mask
+                new_cells.append(low_bit.bit_length() - 1)
+                new_mask ^= low_bit
+        else:
+            new_cells = [
+                y * self.size + x
+                for y, row in enumerate(self.board.revealed)
+                for x, is_revealed in enumerate(row)
+                if is_revealed and not self.known[y * self.size + x]
+            ]
+        if not new_cells:
+            return
+
+        for cell in new_cells:
+            x, y = cell % self.size, cell // self.size
+            if self.board.grid[y][x] == CellState.HIT:
+                self._mark_hit(cell)
+            else:
+                self._mark_miss(cell)
+
+        # Якщо всі сусіди групи влучань вже відомі, корабель точно потоплено
+        for cell in list(self.open_hits):
+            if cell not in self.open_hits:
+                continue
+            component = self._hit_component(cell)
+            if all(self._neighbours_resolved(c) for c in component):
+                self._mark_sunk(component)
+
+    def _neighbours_resolved(self, cell: int) -> bool:
+        cx, cy = cell % self.size, cell // self.size
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = cx + dx, cy + dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                if self.known[ny * self.size + nx] == self.UNKNOWN:
+                    return False
+        return True
+
+
+class MonteCarloAIController(IAIController):
+    """Бот на випадкових вибірках флотів.
+
+    На кожному ході генерує якомога більше повних флотів, сумісних з усіма
+    промахами, влучаннями і потопленими кораблями, за time_budget_ms і
+    стріляє в невідкриту клітинку, яку кораблі займають найчастіше. Складність
+    регулюється бюджетом часу; кількість вибірок останнього ходу доступна в
+    last_sample_count.
+
+    max_samples замість бюджету часу задає фіксовану кількість вибірок ходу
+    (sampler.fixed_occupancy із зерном від board.zobrist): хід не залежить від
+    швидкості машини, кешу і кількості воркерів, тож партію з тим самим
+    зерном можна повторити. Так грає складність гри; бюджет часу лишається
+    для selfplay і турнірів.
+
+    workers > 1 (або None — усі ядра) розподіляє вибірки між процесами
+    спільного sampler.shared_pool; warm_up() варто викликати на старті гри,
+    щоб перший хід не чекав запуску процесів. Якщо воркер аварійно
+    завершився, хід рахується в цьому процесі, а пул перезапускається. GUI викликає prepare_attack() і забирає
+    хід, коли attack_ready(), тож потік Tk не чекає на воркерів.
+
+    Найкращі клітинки за вибірками кешуються за (board.zobrist, бюджет) у
+    спільному кеші: повторний стан поля не семплюється заново."""
+
+    cache = TranspositionCache("montecarlo", 20_000)
+    # З якого розміру поля складність гри вмикає пул процесів
+    POOL_MIN_SIZE = 14
+
+    def __init__(
+        self,
+        board: Board,
+        time_budget_ms: float = 50,
+        workers: Optional[int] = 1,
+        rng: random.Random = None,
+        max_samples: Optional[int] = None,
+    ):
+        self.board = board
+        self.size = board.size
+        self.rng = rng or random
+        self.time_budget_ms = time_budget_ms
+        self.max_samples = max_samples
+        # Частина ключа кешу: оцінки з різним бюджетом не змішуються
+        self._budget = ("samples", max_samples) if max_samples is not None else time_budget_ms
+        self.attacked: Set[Tuple[int, int]] = set()
+        self.last_sample_count = 0
+        self.pool = sampler.shared_pool(workers) if workers != 1 else None
+        # Вибірки, поставлені prepare_attack: (ключ стану, спостереження, Future воркерів)
+        self._pending = None
+
+    def warm_up(self):
+        if self.pool is not None:
+            self.pool.warm_up(self.size, self.board.ship_sizes)
+
+    def close(self):
+        # Пул спільний для всіх партій: скасовуємо лише свої вибірки
+        self._cancel_pending()
+
+    def prepare_attack(self):
+        """Ставить вибірки цього ходу в пул; GUI забирає хід, коли attack_ready()."""
+        if self.pool is None:
+            return
+        key = (self.board.zobrist, self._budget)
+        if key in self.cache or (self._pending is not None and self._pending[0] == key):
+            return
+        self._cancel_pending()
+        observation = density.observe(self.board)
+        if not observation.unknown:
+            return
+        if self.max_samples is not None:
+            futures = self.pool.submit_fixed(observation, self.max_samples, self.board.zobrist)
+        else:
+            futures = self.pool.submit(observation, self.time_budget_ms, self.rng)
+        self._pending = (key, observation, futures)
+
+    def attack_ready(self) -> bool:
+        return self._pending is None or all(future.done() for future in self._pending[2])
+
+    def _cancel_pending(self):
+        if self._pending is not None:
+            for future in self._pending[2]:
+                future.cancel()
+            self._pending = None
+
+    def perform_attack(self) -> Tuple[Optional[int], Optional[int]]:
+        key = (self.board.zobrist, self._budget)
+        cached = self.cache.get(key)
+        if cached is not None:
+            best_cells, self.last_sample_count = cached
+        else:
+            best_cells = self._sample_best_cells(key)
+            if best_cells is None:
+                # Жодного сумісного флоту за бюджет — стріляємо за картою щільності
+                cell = density.best_cell(self.board, self.rng)
+                self.attacked.add(cell)
+                return cell
+            if best_cells:
+                self.cache.put(key, (best_cells, self.last_sample_count))
+
+        if not best_cells:
+            return None, None
+
+        cell = self.rng.choice(best_cells)
+        x, y = cell % self.size, cell // self.size
+        self.attacked.add((x, y))
+        return x, y
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self.cache.stats()
+
+    def _sample_best_cells(self, key) -> Optional[List[int]]:
+        """Клітинки, які кораблі вибірок займають найчастіше; None — жодної вибірки."""
+        pending, self._pending = self._pending, None
+        if pending is not None and pending[0] == key:
+            # Вибірки вже пораховані у фоні з prepare_attack
+            observation = pending[1]
+            result = self.pool.collect(pending[2], observation.size)
+            if result is None:
+                # Воркер упав або вибірки скасовано — рахуємо хід тут
+                result = self._occupancy(observation)
+            counts, self.last_sample_count = result
+            return self._most_occupied(observation, counts) if self.last_sample_count else None
+        if pending is not None:
+            for future in pending[2]:
+                future.cancel()
+
+        observation = density.observe(self.board)
+        if not observation.unknown:
+            return []
+
+        if self.pool is not None and self.max_samples is not None:
+            result = self.pool.collect(self.pool.submit_fixed(observation, self.max_samples, self.board.zobrist),
+                                       observation.size)
+            counts, self.last_sample_count = result if result is not None else self._occupancy(observation)
+        elif self.pool is not None:
+            counts, self.last_sample_count = self.pool.occupancy(observation, self.time_budget_ms, self.rng)
+        else:
+            counts, self.last_sample_count = self._occupancy(observation)
+        if not self.last_sample_count:
+            return None
+        return self._most_occupied(observation, counts)
+
+    def _occupancy(self, observation: density.Observation) -> Tuple[List[int], int]:
+        """Вибірки ходу в цьому процесі."""
+        if self.max_samples is not None:
+            return sampler.fixed_occupancy(observation, self.max_samples, self.board.zobrist)
+        return sampler.sample_occupancy(observation, self.time_budget_ms, self.rng)
+
+    @staticmethod
+    def _most_occupied(observation: density.Observation, counts: List[int]) -> List[int]:
+        best_score = -1
+        best_cells: List[int] = []
+        unknown = observation.unknown
+        for cell, score in enumerate(counts):
+            if not unknown >> cell & 1:
+                continue
+            if score > best_score:
+                best_score = score
+                best_cells = [cell]
+            elif score == best_score:
+                best_cells.append(cell)
+        return best_cells
+
+    def register_result(self, x: int, y: int, hit: bool, sunk: bool):
+        # Стан щоразу зчитується з поля, тож достатньо запам'ятати постріл
+        self.attacked.add((x, y))
+
+
+class OpeningBookController(IAIController):
+    """Дебютна книга (opening_book.py) поверх іншого контролера.
+
+    Поки стан поля є в книзі, постріл — один запит до словника за
+    board.zobrist (нічия — випадково). Щойно стан виходить за межі книги,
+    до кінця партії стріляє вкладений контролер. Результати пострілів завжди
+    передаються вкладеному контролеру, тож його стан не відстає."""
+
+    def __init__(self, inner: IAIController, book=None, rng: random.Random = None):
+        self.inner = inner
+        self.board = inner.board
+        self.size = self.board.size
+        self.rng = rng or random
+        self.book = book
+        self.in_book = book is not None
+        self.book_moves = 0
+
+    def perform_attack(self) -> Tuple[Optional[int], Optional[int]]:
+        if self.in_book:
+            cells = self.book.get(self.board.zobrist)
+            if cells:
+                cell = self.rng.choice(cells)
+                x, y = cell % self.size, cell // self.size
+                if not self.board.revealed[y][x]:
+                    self.book_moves += 1
+                    return x, y
+            self.in_book = False
+        return self.inner.perform_attack()
+
+    def register_result(self, x: int, y: int, hit: bool, sunk: bool):
+        self.inner.register_result(x, y, hit, sunk)
+
+    def prepare_attack(self):
+        # У книзі хід миттєвий; вкладений контролер готується лише поза нею
+        if not (self.in_book and self.book.get(self.board.zobrist)):
+            self.inner.prepare_attack()
+
+    def attack_ready(self) -> bool:
+        return self.inner.attack_ready()
+
+    def warm_up(self):
+        self.inner.warm_up()
+
+    def close(self):
+        self.inner.close()
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self.inner.cache_stats()
+
+
+# Фабрика контролера: factory(board, rng=None)
+ControllerFactory = Callable[..., IAIController]
+
+
+def with_opening_book(factory: ControllerFactory) -> ControllerFactory:
+    """Фабрика, що загортає контролер у книгу для розміру поля і флоту (якщо книга є).
+
+    Додаткові іменовані аргументи передаються фабриці вкладеного контролера."""
+    def create(board: Board, rng: random.Random = None, **options) -> IAIController:
+        # Імпорт тут, бо opening_book через game_engine залежить від цього модуля
+        from opening_book import book_for
+
+        return OpeningBookController(factory(board, rng=rng, **options), book_for(board.size, board.ship_sizes), rng)
+    return create
+
+# Контролери за назвою: для selfplay, турнірів і вибору складності
+CONTROLLERS: Dict[str, ControllerFactory] = {
+    "easy": EasyAIController,
+    "hard": HardAIController,
+    "legacy-easy": lambda board, rng=None: LegacyAIController(board, "easy", rng),
+    "legacy-hard": lambda board, rng=None: LegacyAIController(board, "hard", rng),
+    "density": DensityAIController,
+    "montecarlo": MonteCarloAIController,
+    "density-book": with_opening_book(DensityAIController),
+    "montecarlo-book": with_opening_book(MonteCarloAIController),
+}
+
+# Складність гри -> (контролер, кількість вибірок ходу Монте-Карло або None).
+# Фіксована кількість вибірок (а не бюджет часу) робить хід відтворюваним за
+# зерном гри; 400 вибірок — приблизно 50 мс на полі 10x10. Перші ходи важкого
+# рівня беруться з дебютної книги (books/), тож вони миттєві навіть на слабкій
+# машині. Навіть з кількома вибірками бот грає на рівні legacy-hard, тому
+# легкий рівень лишається на legacy-easy.
+DIFFICULTIES: Dict[str, Tuple[str, Optional[int]]] = {
+    "easy": ("legacy-easy", None),
+    "hard": ("montecarlo-book", 400),
+}
+
+
+def difficulty_factory(difficulty: str) -> ControllerFactory:
+    """Фабрика контролера комп'ютера для складності гри (невідома — як "easy")."""
+    name, max_samples = DIFFICULTIES.get(difficulty, DIFFICULTIES["easy"])
+    factory = CONTROLLERS[name]
+    if max_samples is None:
+        return factory
+
+    def create(board: Board, rng: random.Random = None) -> IAIController:
+        # На великих полях вибірки рахують усі ядра (GUI забирає лише готовий хід)
+        workers = None if board.size >= MonteCarloAIController.POOL_MIN_SIZE else 1
+        return factory(board, workers=workers, rng=rng, max_samples=max_samples)
+    return create
@@ -4,6 +4,10 @@ import random
 import tkinter as tk
 from typing import TYPE_CHECKING
 
+from animation_clock import get_clock
+from scene import RetainedScene
+from timers import TimerRegistry
+
 if TYPE_CHECKING:
     from battleship import Board
 
@@ -15,8 +19,10 @@ class AIRobot:
         self,
         parent_frame: tk.Frame,
         difficulty: str = "easy",
+        rng: random.Random = None,
     ):
         self.parent_frame = parent_frame
+        self.rng = rng or random
         self.difficulty = difficulty
         self.active = True
         self.animation_phase = 0
@@ -35,6 +41,8 @@ class AIRobot:
             highlightthickness=0,
         )
         self.canvas.pack(expand=True, pady=5)
+        # Елементи персонажа створюються один раз і лише оновлюються
+        self.scene = RetainedScene(self.canvas)
 
         # Колірна палітра
         self.palette = {
@@ -51,10 +59,12 @@ class AIRobot:
             "text": "#ffffff",
         }
 
-        self._blink_timer = random.randint(60, 100)
+        self._blink_timer = self.rng.randint(60, 100)
         self._blink_frames_remaining = 0
         self._blink_frames_total = 4
         self._idle_job = None
+        self.timers = TimerRegistry(parent_frame, "ai_robot")
+        self._hide_job = None
 
         # Текст діалогу
         self.dialogue_text = ""
@@ -67,8 +77,11 @@ class AIRobot:
         # Коефіцієнт масштабування (180/280 ≈ 0.64)
         self.scale = 0.64
 
-        # Запускаємо анімацію
+        # Запускаємо анімацію: кадри дає спільний годинник вікна
         self.animate_idle()
+        self._idle_job = get_clock(parent_frame).subscribe(
+            lambda dt: self.animate_idle(), interval_ms=80, name="ai_robot"
+        )
 
     def set_emotion(self, emotion: str):
         """Встановлює емоцію робота: neutral, happy, angry, thinking, scared"""
@@ -78,8 +91,11 @@ class AIRobot:
         """Показує діалог на певний час (в мілісекундах)"""
         self.dialogue_text = text
         self.dialogue_visible = True
+        # Новий діалог скасовує таймер попереднього, щоб той не сховав його раніше
+        self.timers.cancel(self._hide_job)
+        self._hide_job = None
         if duration > 0:
-            self.parent_frame.after(duration, self.hide_dialogue)
+            self._hide_job = self.timers.after(duration, self.hide_dialogue)
 
     def hide_dialogue(self):
         """Ховає діалог"""
@@ -102,7 +118,7 @@ class AIRobot:
             eye_state = "half" if frame_index in (0, self._blink_frames_total - 1) else "closed"
             self._blink_frames_remaining -= 1
             if self._blink_frames_remaining == 0:
-                self._blink_timer = random.randint(60, 100)
+                self._blink_timer = self.rng.randint(60, 100)
         else:
             if self._blink_timer <= 0:
                 self._blink_frames_remaining = self._blink_frames_total
@@ -112,26 +128,28 @@ class AIRobot:
                 eye_state = "open"
 
         self._draw_robot(body_offset, eye_state)
-        self._idle_job = self.parent_frame.after(80, self.animate_idle)
 
     def _draw_robot(self, body_offset: float, eye_state: str):
         """Малює робота"""
-        self.canvas.delete("all")
+        self.scene.begin("background")
         p = self.palette
 
         # Фон
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             0, 0, self.canvas_width, self.canvas_height,
             fill=p["background"], outline=""
         )
 
+        # Покачування — зсув усього шару одним canvas.move
+        self.scene.begin("body", dy=body_offset)
+
         # Тіло робота (прямокутник з закругленнями) - масштабування
-        body_y = self.center_y + body_offset
+        body_y = self.center_y
         body_width = int(140 * self.scale)
         body_height = int(180 * self.scale)
 
         # Головне тіло
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x - body_width//2,
             body_y - body_height//2,
             self.center_x + body_width//2,
@@ -144,7 +162,7 @@ class AIRobot:
         # Деталі корпусу
         for i in range(3):
             y_pos = body_y - int(40 * self.scale) + i * int(30 * self.scale)
-            self.canvas.create_rectangle(
+            self.scene.create_rectangle(
                 self.center_x - int(50 * self.scale),
                 y_pos,
                 self.center_x + int(50 * self.scale),
@@ -155,7 +173,7 @@ class AIRobot:
 
         # Антена
         antenna_y = body_y - body_height//2 - int(30 * self.scale)
-        self.canvas.create_line(
+        self.scene.create_line(
             self.center_x,
             body_y - body_height//2,
             self.center_x,
@@ -167,7 +185,7 @@ class AIRobot:
         pulse = abs(math.sin(self.animation_phase / 10))
         lamp_color = self._interpolate_color("#ff8800", "#ffff00", pulse)
         lamp_radius = int(8 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - lamp_radius,
             antenna_y - lamp_radius * 2,
             self.center_x + lamp_radius,
@@ -182,7 +200,7 @@ class AIRobot:
         head_width = int(120 * self.scale)
         head_height = int(80 * self.scale)
 
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x - head_width//2,
             head_y - head_height//2,
             self.center_x + head_width//2,
@@ -194,7 +212,7 @@ class AIRobot:
 
         # Екран
         screen_margin = int(10 * self.scale)
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x - head_width//2 + screen_margin,
             head_y - head_height//2 + screen_margin,
             self.center_x + head_width//2 - screen_margin,
@@ -213,7 +231,7 @@ class AIRobot:
 
         # Ліва рука
         left_arm_x = self.center_x - body_width//2 - arm_length
-        self.canvas.create_line(
+        self.scene.create_line(
             self.center_x - body_width//2,
             arm_y,
             left_arm_x + arm_length * math.cos(arm_angle),
@@ -224,7 +242,7 @@ class AIRobot:
         )
         # Кисть
         hand_radius = int(8 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             left_arm_x - hand_radius + arm_length * math.cos(arm_angle),
             arm_y - hand_radius + arm_length * math.sin(arm_angle),
             left_arm_x + hand_radius + arm_length * math.cos(arm_angle),
@@ -236,7 +254,7 @@ class AIRobot:
 
         # Права рука
         right_arm_x = self.center_x + body_width//2 + arm_length
-        self.canvas.create_line(
+        self.scene.create_line(
             self.center_x + body_width//2,
             arm_y,
             right_arm_x - arm_length * math.cos(arm_angle),
@@ -246,7 +264,7 @@ class AIRobot:
             capstyle=tk.ROUND
         )
         # Кисть
-        self.canvas.create_oval(
+        self.scene.create_oval(
             right_arm_x - hand_radius - arm_length * math.cos(arm_angle),
             arm_y - hand_radius - arm_length * math.sin(arm_angle),
             right_arm_x + hand_radius - arm_length * math.cos(arm_angle),
@@ -262,7 +280,7 @@ class AIRobot:
         leg_height = int(30 * self.scale)
         leg_spacing = int(20 * self.scale)
 
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x - leg_width - leg_spacing,
             leg_y,
             self.center_x - leg_spacing,
@@ -271,7 +289,7 @@ class AIRobot:
             outline=p["accent"],
             width=int(2 * self.scale)
         )
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x + leg_spacing,
             leg_y,
             self.center_x + leg_spacing + leg_width,
@@ -283,7 +301,7 @@ class AIRobot:
 
         # Індикатор складності
         difficulty_text = "😴 EASY" if self.difficulty == "easy" else "💀 HARD"
-        self.canvas.create_text(
+        self.scene.create_text(
             self.center_x,
             leg_y + int(40 * self.scale),
             text=difficulty_text,
@@ -291,9 +309,11 @@ class AIRobot:
             fill=p["accent"]
         )
 
-        # Діалог
-        if self.dialogue_visible and self.dialogue_text:
+        # Діалог: хмаринка перемальовується лише при зміні тексту
+        visible_text = self.dialogue_text if self.dialogue_visible else None
+        if self.scene.begin("bubble", key=visible_text) and visible_text:
             self._draw_dialogue_bubble()
+        self.scene.end()
 
     def _draw_eyes(self, head_y: float, eye_state: str):
         """Малює очі робота"""
@@ -314,7 +334,7 @@ class AIRobot:
 
         if eye_state == "closed":
             # Закриті очі (лінії)
-            self.canvas.create_line(
+            self.scene.create_line(
                 self.center_x - eye_spacing - eye_width,
                 eye_y,
                 self.center_x - eye_spacing + eye_width,
@@ -323,7 +343,7 @@ class AIRobot:
                 width=int(3 * self.scale),
                 capstyle=tk.ROUND
             )
-            self.canvas.create_line(
+            self.scene.create_line(
                 self.center_x + eye_spacing - eye_width,
                 eye_y,
                 self.center_x + eye_spacing + eye_width,
@@ -335,7 +355,7 @@ class AIRobot:
         elif eye_state == "half":
             # Напіввідкриті
             for x_offset in [-eye_spacing, eye_spacing]:
-                self.canvas.create_rectangle(
+                self.scene.create_rectangle(
                     self.center_x + x_offset - eye_width//2,
                     eye_y - eye_height//4,
                     self.center_x + x_offset + eye_width//2,
@@ -348,7 +368,7 @@ class AIRobot:
             if self.current_emotion == "happy":
                 # Щасливі очі (дуги)
                 for x_offset in [-eye_spacing, eye_spacing]:
-                    self.canvas.create_arc(
+                    self.scene.create_arc(
                         self.center_x + x_offset - eye_width,
                         eye_y - eye_height,
                         self.center_x + x_offset + eye_width,
@@ -363,7 +383,7 @@ class AIRobot:
                 # Злі очі (трикутники) - масштабовані
                 for x_offset in [-eye_spacing, eye_spacing]:
                     direction = 1 if x_offset < 0 else -1
-                    self.canvas.create_polygon(
+                    self.scene.create_polygon(
                         self.center_x + x_offset - eye_width//2,
                         eye_y + eye_height//2,
                         self.center_x + x_offset + eye_width//2,
@@ -377,7 +397,7 @@ class AIRobot:
             else:
                 # Звичайні очі (прямокутники)
                 for x_offset in [-eye_spacing, eye_spacing]:
-                    self.canvas.create_rectangle(
+                    self.scene.create_rectangle(
                         self.center_x + x_offset - eye_width//2,
                         eye_y - eye_height//2,
                         self.center_x + x_offset + eye_width//2,
@@ -395,7 +415,7 @@ class AIRobot:
         bubble_height = int(60 * self.scale)
 
         # Фон вікна
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             bubble_x,
             bubble_y,
             bubble_x + bubble_width,
@@ -407,7 +427,7 @@ class AIRobot:
 
         # Трикутник (хвостик)
         tail_size = int(10 * self.scale)
-        self.canvas.create_polygon(
+        self.scene.create_polygon(
             self.center_x - tail_size,
             bubble_y + bubble_height,
             self.center_x + tail_size,
@@ -420,7 +440,7 @@ class AIRobot:
         )
 
         # Текст (збільшений шрифт)
-        self.canvas.create_text(
+        self.scene.create_text(
             bubble_x + bubble_width//2,
             bubble_y + bubble_height//2,
             text=self.dialogue_text,
@@ -446,10 +466,8 @@ class AIRobot:
         """Знищує робота"""
         self.active = False
         if self._idle_job is not None:
-            try:
-                self.parent_frame.after_cancel(self._idle_job)
-            except tk.TclError:
-                pass
+            self._idle_job.cancel()
             self._idle_job = None
+        self.timers.cancel_all()
         if hasattr(self, "canvas") and self.canvas:
             self.canvas.destroy()
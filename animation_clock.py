@@ -0,0 +1,264 @@
+"""Спільний таймер кадрів для всіх анімацій вікна.
+
+Замість власного ланцюжка root.after у кожної анімації один AnimationClock
+тікає із заданою частотою кадрів і на кожному кадрі викликає update(dt)
+підписаних анімацій. Якщо кадр не встигає, пропущені кадри відкидаються, а
+не стають у чергу. Для кожного підписника рахується час його кадрів.
+
+Годинник можна призупинити або сповільнити (hold): VisibilityWatcher робить
+це, коли вікно згорнуте, повністю закрите чи застосунок не у фокусі.
+"""
+from typing import Callable, Dict, List, Optional
+import time
+import tkinter as tk
+
+DEFAULT_FPS = 30
+# Частота кадрів, коли вікно не у фокусі або під вікном результатів
+BACKGROUND_FPS = 5
+# Найбільший dt, який отримує анімація (після паузи чи зависання)
+MAX_DT = 0.25
+
+# update(dt) отримує секунди від попереднього виклику; False — анімація завершилась
+UpdateFn = Callable[[float], Optional[bool]]
+
+
+class Animation:
+    """Підписка на AnimationClock.
+
+    interval — мінімальний проміжок між викликами update у секундах (0 —
+    кожен кадр). Так покрокові анімації зберігають свою швидкість за будь-якої
+    частоти кадрів."""
+
+    def __init__(self, clock: "AnimationClock", update: UpdateFn, interval: float, name: str):
+        self.clock = clock
+        self.update = update
+        self.interval = interval
+        self.name = name
+        self.active = True
+        self.elapsed = 0.0
+
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def record(self, cost: float):
+        self.calls += 1
+        self.total_time += cost
+        self.last_time = cost
+        if cost > self.max_time:
+            self.max_time = cost
+
+    def cancel(self):
+        self.clock.unsubscribe(self)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "mean_ms": self.total_time / self.calls * 1000 if self.calls else 0.0,
+            "max_ms": self.max_time * 1000,
+            "last_ms": self.last_time * 1000,
+        }
+
+
+class AnimationClock:
+    """Планувальник кадрів на основі одного ланцюжка widget.after.
+
+    Поки немає підписників, таймер не запланований і Tk не прокидається."""
+
+    def __init__(self, widget: tk.Misc, fps: int = DEFAULT_FPS):
+        self.widget = widget
+        self.fps = fps
+        self._animations: List[Animation] = []
+        self._job = None
+        self._last_tick = 0.0
+        # Причина -> обмеження частоти (0 — пауза)
+        self._holds: Dict[str, int] = {}
+
+        self.frames = 0
+        self.dropped_frames = 0
+
+    @property
+    def paused(self) -> bool:
+        return 0 in self._holds.values()
+
+    @property
+    def effective_fps(self) -> int:
+        return min([self.fps] + list(self._holds.values()))
+
+    @property
+    def frame_time(self) -> float:
+        return 1.0 / max(1, self.effective_fps)
+
+    def set_fps(self, fps: int):
+        self.fps = max(1, int(fps))
+
+    def hold(self, reason: str, fps: int = 0):
+        """Обмежує частоту кадрів до fps (0 — пауза), поки не буде release(reason)."""
+        self._holds[reason] = max(0, int(fps))
+        if self.paused:
+            self.stop()
+
+    def release(self, reason: str):
+        """Знімає обмеження reason; анімації продовжуються з того ж кадру."""
+        if self._holds.pop(reason, None) is None:
+            return
+        if not self.paused and self._animations and self._job is None:
+            # Час паузи не потрапляє в dt, тож анімації не стрибають
+            self._last_tick = time.perf_counter()
+            self._schedule(0.0)
+
+    def subscribe(self, update: UpdateFn, interval_ms: float = 0, name: Optional[str] = None) -> Animation:
+        """Додає анімацію; update(dt) викликатиметься не частіше ніж раз на interval_ms."""
+        animation = Animation(self, update, interval_ms / 1000.0, name or getattr(update, "__name__", "animation"))
+        self._animations.append(animation)
+        if self._job is None and not self.paused:
+            self._last_tick = time.perf_counter()
+            self._schedule(0.0)
+        return animation
+
+    def unsubscribe(self, animation: Animation):
+        animation.active = False
+        if animation in self._animations:
+            self._animations.remove(animation)
+        if not self._animations:
+            self.stop()
+
+    def stop(self):
+        """Скасовує запланований кадр (підписки лишаються)."""
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except tk.TclError:
+                pass
+            self._job = None
+
+    def clear(self):
+        for animation in list(self._animations):
+            animation.active = False
+        self._animations.clear()
+        self.stop()
+
+    def _schedule(self, spent: float):
+        frame = self.frame_time
+        if spent >= frame:
+            # Кадр не вклався у свій час: пропускаємо кадри, що мали вже початися
+            self.dropped_frames += int(spent // frame)
+            spent %= frame
+        delay_ms = max(1, int((frame - spent) * 1000))
+        try:
+            self._job = self.widget.after(delay_ms, self._tick)
+        except tk.TclError:
+            # Вікно вже знищено
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        start = time.perf_counter()
+        dt = min(start - self._last_tick, MAX_DT)
+        self._last_tick = start
+        self.frames += 1
+
+        for animation in list(self._animations):
+            if not animation.active:
+                continue
+            animation.elapsed += dt
+            if animation.elapsed < animation.interval:
+                continue
+            step_dt = animation.elapsed
+            animation.elapsed -= animation.interval
+            if animation.elapsed >= animation.interval:
+                # Не наздоганяємо пропущені кроки
+                animation.elapsed = 0.0
+
+            call_start = time.perf_counter()
+            try:
+                keep = animation.update(step_dt)
+            except tk.TclError:
+                # Canvas анімації знищено
+                keep = False
+            animation.record(time.perf_counter() - call_start)
+            if keep is False:
+                self.unsubscribe(animation)
+
+        if self._animations and self._job is None and not self.paused:
+            self._schedule(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, object]:
+        """Частота, кількість кадрів і вартість кадру кожного підписника."""
+        return {
+            "fps": self.fps,
+            "effective_fps": self.effective_fps,
+            "holds": dict(self._holds),
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "animations": [dict(animation.stats(), name=animation.name) for animation in self._animations],
+        }
+
+
+class VisibilityWatcher:
+    """Призупиняє годинник вікна, поки його не видно, і сповільнює у фоні.
+
+    Згорнуте (Unmap) або повністю закрите іншими вікнами (Visibility) вікно
+    не малює нічого; якщо фокус пішов з усього застосунку, анімації йдуть із
+    частотою BACKGROUND_FPS."""
+
+    def __init__(self, root: tk.Misc, clock: Optional[AnimationClock] = None):
+        self.root = root
+        self.clock = clock or get_clock(root)
+        self._focus_job = None
+        for sequence, handler in (
+            ("<Unmap>", self._on_unmap),
+            ("<Map>", self._on_map),
+            ("<Visibility>", self._on_visibility),
+            ("<FocusIn>", self._on_focus_in),
+            ("<FocusOut>", self._on_focus_out),
+        ):
+            root.bind(sequence, handler, add="+")
+
+    # Події дочірніх віджетів теж приходять сюди через bindtags — їх пропускаємо
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self.clock.hold("hidden")
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self.clock.release("hidden")
+
+    def _on_visibility(self, event):
+        if event.widget is not self.root:
+            return
+        if event.state == "VisibilityFullyObscured":
+            self.clock.hold("obscured")
+        else:
+            self.clock.release("obscured")
+
+    def _on_focus_in(self, event):
+        self.clock.release("background")
+
+    def _on_focus_out(self, event):
+        # Фокус міг лише перейти до іншого віджета; перевіряємо, коли все вляжеться
+        if self._focus_job is None:
+            self._focus_job = self.root.after_idle(self._check_focus)
+
+    def _check_focus(self):
+        self._focus_job = None
+        try:
+            focused = self.root.focus_get()
+        except (KeyError, tk.TclError):
+            # Фокус у вікні, яке tkinter не знає (наприклад, системний діалог)
+            focused = None
+        if focused is None:
+            self.clock.hold("background", BACKGROUND_FPS)
+        else:
+            self.clock.release("background")
+
+
+def get_clock(widget: tk.Misc) -> AnimationClock:
+    """Спільний AnimationClock кореневого вікна віджета (створюється за потреби)."""
+    root = widget._root()
+    clock = getattr(root, "_animation_clock", None)
+    if clock is None:
+        clock = AnimationClock(root)
+        root._animation_clock = clock
+    return clock
@@ -1,20 +1,33 @@
+import sys
 import tkinter as tk
-import random
-from typing import List, Tuple, Optional
+from typing import List
 from kraken import Kraken
+from animation_clock import BACKGROUND_FPS, VisibilityWatcher, get_clock
 from rockets import RocketsManager
-from ai_controllers import EasyAIController, HardAIController
-from Board import Board, CellState, Orientation, Ship
+from game_engine import GameEngine, GameEvent, ship_configuration
+from board_view import BoardView, MotionCoalescer, PreviewOverlay
+from profiler import install_from_args
+from timers import TimerRegistry
+from rng import GameRNG, seed_from_args
+from replay import record_game, replay_dir_from_args
+from Board import Board, Orientation
 from ai_robot import AIRobot
 from player_avatar import PlayerAvatar
 from dialogue_manager import DialogueManager
 from visual_effects import VisualEffects
 
+# Як часто GUI перевіряє, чи AI вже порахував хід у фоні
+AI_POLL_MS = 20
+
 class MainMenu:
     """Головне меню гри з анімацією"""
     
-    def __init__(self, root):
+    def __init__(self, root, seed: int = None, replay_dir: str = None):
         self.root = root
+        # Зерно партій (--seed): None — щоразу нове
+        self.seed = seed
+        # Каталог для записів партій (--replay-dir): None — не записувати
+        self.replay_dir = replay_dir
         self.root.title("Морський бій")
         self.root.resizable(True, True)  # Дозволяємо зміну розміру
         self.root.configure(bg='#1a1a2e')
@@ -37,6 +50,7 @@ class MainMenu:
         self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
         
         self.selected_board_size = 10  # За замовчуванням нормальний розмір
+        self.timers = TimerRegistry(self.root, "menu")
         
         self.setup_menu()
         self.animate_title()
@@ -467,7 +481,7 @@ class MainMenu:
                 try:
                     self.title_label.config(fg=colors[self.color_index % len(colors)])
                     self.color_index += 1
-                    self.root.after(500, pulse)
+                    self.timers.after(500, pulse)
                 except:
                     pass
         
@@ -476,6 +490,7 @@ class MainMenu:
     def stop_animation(self):
         """Зупиняє анімацію перед закриттям меню"""
         self.animation_running = False
+        self.timers.cancel_all()
     
     def show_about(self):
         """Показує інформацію про гру"""
@@ -594,14 +609,21 @@ class MainMenu:
             widget.destroy()
         
         # Запускаємо гру з вибраним розміром та складністю
-        game = BattleshipGame(self.root, self.selected_board_size, self.difficulty)
+        game = BattleshipGame(
+            self.root, self.selected_board_size, self.difficulty, seed=self.seed, replay_dir=self.replay_dir
+        )
 
 
 class BattleshipGame:
     """Головний клас гри Морський бій з GUI"""
     
-    def __init__(self, root, board_size: int = 10, difficulty: str = "easy"):
+    def __init__(
+        self, root, board_size: int = 10, difficulty: str = "easy", seed: int = None, replay_dir: str = None
+    ):
         self.root = root
+        self.seed = seed
+        self.replay_dir = replay_dir
+        self.replay_writer = None
         self.root.title("Морський бій")
         self.root.resizable(True, True)
         self.root.configure(bg='#1a1a2e')
@@ -623,67 +645,83 @@ class BattleshipGame:
         # Конфігурація кораблів залежно від розміру поля
         self.ship_sizes = self.get_ship_configuration(board_size)
         
-        # Ігрові поля з правильною конфігурацією кораблів
-        self.player_board = Board(self.board_size, self.ship_sizes)
-        self.computer_board = Board(self.board_size, self.ship_sizes)
+        # Ігрова логіка (поля, AI, ракети, кракен, рахунок) живе в GameEngine,
+        # а GUI лише підписаний на його події. Уся випадковість гри — з одного
+        # GameRNG: партію можна відтворити за зерном self.rng.seed_value
+        self.rng = GameRNG(seed)
+        self.engine = GameEngine(self.board_size, self.ship_sizes, difficulty=self.difficulty, rng=self.rng)
+        self.engine.subscribe(self.on_engine_event)
+        # Збережені відображення полів: canvas -> BoardView
+        self.board_views = {}
         
-        # Стан гри: setup (розміщення), playing (гра), ended (завершено)
-        self.game_phase = "setup"
         self.current_ship_index = 0
         self.current_orientation = Orientation.HORIZONTAL
-        
-        # Статистика гри
-        self.player_score = 0      # Влучання гравця
-        self.computer_score = 0    # Влучання комп'ютера
-        self.player_shots = 0      # Всього пострілів гравця
-        self.computer_shots = 0    # Всього пострілів комп'ютера
 
         # лічильник використаних мін гравцем
         self.player_mines_used = []
 
-        # Змінні для розумного ШІ
-        self.ai_mode = "hunt"           # Режим: hunt (пошук) або target (добивання)
-        self.ai_target_queue = []       # Черга клітинок для атаки після влучання
-        self.ai_last_hit = None         # Остання успішна атака
-        self.ai_hit_direction = None    # Напрямок послідовних влучань
+        # Затримки (мс) перед наступним ходом комп'ютера та перед перемальовуванням після вибуху
+        self._turn_delay = 500
+        self._redraw_delay = 0
         
         # Ініціалізуємо кракена (None на початку, створимо після старту гри)
         self.kraken = None
         self.kraken_container = None
 
-        # Ініціалізуємо AI-контролер згідно складності
-        if self.difficulty == "easy":
-            self.ai_controller = EasyAIController(self.player_board)
-        else:
-            self.ai_controller = HardAIController(self.player_board)
-
         # Ініціалізуємо робота, аватар гравця та менеджер діалогів
         self.ai_robot = None
         self.ai_robot_container = None
         self.player_avatar = None
         self.player_avatar_container = None
-        self.dialogue_manager = DialogueManager(difficulty=self.difficulty)
+        self.dialogue_manager = DialogueManager(difficulty=self.difficulty, rng=self.rng.split("dialogue"))
+
+        # Відкладені дії гри (хід комп'ютера, перемальовування після вибуху);
+        # скасовуються при новій грі та виході в меню
+        self.timers = TimerRegistry(self.root, "game")
 
         # Ініціалізуємо візуальні ефекти
-        self.visual_effects = VisualEffects(self.root)
+        self.visual_effects = VisualEffects(self.root, rng=self.rng.split("effects"))
 
         self.setup_ui()
         self.center_window()
+
+    # Стан гри береться з рушія
+    @property
+    def player_board(self) -> Board:
+        return self.engine.player_board
+
+    @property
+    def computer_board(self) -> Board:
+        return self.engine.computer_board
+
+    @property
+    def game_phase(self) -> str:
+        """setup (розміщення), playing (гра), ended (завершено)"""
+        return self.engine.phase
+
+    @property
+    def ai_controller(self):
+        return self.engine.ai_controller
+
+    @property
+    def player_score(self) -> int:
+        return self.engine.player_score
+
+    @property
+    def computer_score(self) -> int:
+        return self.engine.computer_score
+
+    @property
+    def player_shots(self) -> int:
+        return self.engine.player_shots
+
+    @property
+    def computer_shots(self) -> int:
+        return self.engine.computer_shots
     
     def get_ship_configuration(self, board_size: int) -> List[int]:
         """Повертає конфігурацію кораблів залежно від розміру поля"""
-        if board_size == 6:
-            # Маленьке поле: 5 кораблів
-            # 1 крейсер (3), 1 есмінець (2), 3 катери (1)
-            return [3, 2, 1, 1, 1]
-        elif board_size == 10:
-            # Нормальне поле: 10 кораблів (класична конфігурація)
-            # 1 лінкор (4), 2 крейсери (3), 3 есмінці (2), 4 катери (1)
-            return [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
-        else:  # 14
-            # Велике поле: 15 кораблів
-            # 1 авіаносець (5), 2 лінкори (4), 3 крейсери (3), 4 есмінці (2), 5 катерів (1)
-            return [5, 4, 4, 3, 3, 3, 2, 2, 2, 2, 1, 1, 1, 1, 1]
+        return ship_configuration(board_size)
     
     def center_window(self):
         """Центрує вікно гри на екрані з адаптивним розміром"""
@@ -807,7 +845,10 @@ class BattleshipGame:
         self.player_canvas.pack()
         # Обробники подій для розміщення кораблів
         self.player_canvas.bind('<Button-1>', self.on_player_board_click)
-        self.player_canvas.bind('<Motion>', self.on_player_board_hover)
+        # Рух миші обробляємо не частіше разу за кадр
+        self.player_motion = MotionCoalescer(self.timers, self.on_player_board_hover)
+        self.player_canvas.bind('<Motion>', self.player_motion)
+        self.player_canvas.bind('<Leave>', lambda e: self.leave_board(self.player_canvas, self.player_motion))
         
         # Поле комп'ютера (праворуч)
         computer_container = tk.Frame(boards_frame, bg='#1a1a2e')
@@ -834,7 +875,14 @@ class BattleshipGame:
         # Обробник кліків для атаки
         self.computer_canvas.bind('<Button-1>', self.on_computer_board_click)
         # Обробник наведення для показу області ураження ракети
-        self.computer_canvas.bind('<Motion>', self.on_computer_board_hover)
+        self.computer_motion = MotionCoalescer(self.timers, self.on_computer_board_hover)
+        self.computer_canvas.bind('<Motion>', self.computer_motion)
+        self.computer_canvas.bind('<Leave>', lambda e: self.leave_board(self.computer_canvas, self.computer_motion))
+        # Пули прямокутників попереднього перегляду: canvas -> PreviewOverlay
+        self.previews = {
+            self.player_canvas: PreviewOverlay(self.player_canvas, self.cell_size, 'ship_preview'),
+            self.computer_canvas: PreviewOverlay(self.computer_canvas, self.cell_size, 'rocket_preview'),
+        }
         
         # Панель керування з кнопками
         control_frame = tk.Frame(self.root, bg='#1a1a2e')
@@ -922,7 +970,7 @@ class BattleshipGame:
         
     def draw_ship(self, canvas: tk.Canvas, ship, cell_size: int):
         """Малює детальні унікальні військові кораблі"""
-        coords = ship.get_coordinates()
+        coords = list(ship.coordinates)
         if not coords:
             return
 
@@ -1496,88 +1544,19 @@ class BattleshipGame:
         self.draw_board(self.computer_canvas, self.computer_board, show_ships=False)
         
     def draw_board(self, canvas: tk.Canvas, board: Board, show_ships: bool):
-        """Малює ігрове поле на canvas
-        show_ships - чи показувати кораблі (True для свого поля, False для противника)"""
-        canvas.delete('all')
-        
-        # Малюємо сітку поля
-        for i in range(self.board_size + 1):
-            # Vertical lines
-            canvas.create_line(
-                i * self.cell_size, 0,
-                i * self.cell_size, self.board_size * self.cell_size,
-                fill='#16213e', width=1
-            )
-            # Horizontal lines
-            canvas.create_line(
-                0, i * self.cell_size,
-                self.board_size * self.cell_size, i * self.cell_size,
-                fill='#16213e', width=1
-            )
-        
-        # Малюємо клітинки з відповідними кольорами та символами
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                cell_state = board.grid[y][x]
-                is_revealed = board.revealed[y][x]
-                
-                x1 = x * self.cell_size
-                y1 = y * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-                
-                # Малюємо фон для всіх клітинок
-                if cell_state == CellState.HIT:
-                    canvas.create_rectangle(x1, y1, x2, y2, fill='#ff4444', outline='#16213e')
-                elif cell_state == CellState.MISS:
-                    canvas.create_rectangle(x1, y1, x2, y2, fill='#4a5568', outline='#16213e')
-                else:
-                    canvas.create_rectangle(x1, y1, x2, y2, fill='#0f3460', outline='#16213e')
-
-        # Малюємо кораблі поверх сітки
-        if show_ships:
-            for ship in board.ships:
-                if not ship.is_sunk():
-                    self.draw_ship(canvas, ship, self.cell_size)
-
-        # Малюємо потоплені кораблі (показуємо навіть на полі противника)
-        for ship in board.ships:
-            if ship.is_sunk():
-                # Потоплені кораблі показуємо темними з червоним хрестом
-                for x, y in ship.get_coordinates():
-                    x1 = x * self.cell_size
-                    y1 = y * self.cell_size
-                    x2 = x1 + self.cell_size
-                    y2 = y1 + self.cell_size
-                    canvas.create_rectangle(x1, y1, x2, y2, fill='#1a1a1a', outline='#ff0000', width=2)
-                    # Хрест
-                    canvas.create_line(x1 + 5, y1 + 5, x2 - 5, y2 - 5, fill='#ff0000', width=3)
-                    canvas.create_line(x2 - 5, y1 + 5, x1 + 5, y2 - 5, fill='#ff0000', width=3)
-
-        # Малюємо попадання/промахи ПОВЕРХ кораблів
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                cell_state = board.grid[y][x]
-                x1 = x * self.cell_size
-                y1 = y * self.cell_size
-
-                if cell_state == CellState.HIT:
-                    # Вогонь на попаданні
-                    canvas.create_text(
-                        x1 + self.cell_size // 2,
-                        y1 + self.cell_size // 2,
-                        text='💥',
-                        font=('Arial', 16)
-                    )
-                elif cell_state == CellState.MISS:
-                    # Промах
-                    canvas.create_text(
-                        x1 + self.cell_size // 2,
-                        y1 + self.cell_size // 2,
-                        text='○',
-                        font=('Arial', 16),
-                        fill='#ffffff'
-                    )
+        """Оновлює ігрове поле на canvas
+        show_ships - чи показувати кораблі (True для свого поля, False для противника)
+
+        Елементи поля створюються один раз (BoardView), далі перемальовуються
+        лише змінені клітинки та кораблі."""
+        view = self.board_views.get(canvas)
+        if view is None:
+            view = BoardView(canvas, self.board_size, self.cell_size, self.draw_ship)
+            self.board_views[canvas] = view
+        # Попередній перегляд живе лише до наступного оновлення поля
+        self.hide_preview(canvas)
+        view.render(board, show_ships)
+
         if canvas == self.player_canvas and show_ships and hasattr(self, "rockets_manager"):
             self.rockets_manager.draw_rockets_on_player_canvas()
 
@@ -1595,7 +1574,7 @@ class BattleshipGame:
         if self.current_ship_index < len(self.ship_sizes):
                 ship_size = self.ship_sizes[self.current_ship_index]
 
-        if self.player_board.place_ship(ship_size, x, y, self.current_orientation):
+        if self.engine.place_player_ship(ship_size, x, y, self.current_orientation):
             self.current_ship_index += 1
 
             # Якщо всі кораблі розміщені — починаємо гру
@@ -1609,24 +1588,40 @@ class BattleshipGame:
             # Показуємо повідомлення про помилку через info_label
             self.info_label.config(text="❌ Неможливо розмістити корабель тут!", fg='#ff4444')
             # Повертаємо нормальний колір через 2 секунди
-            self.root.after(2000, lambda: self.info_label.config(fg='#ffffff'))
+            self.timers.after(2000, lambda: self.info_label.config(fg='#ffffff'))
     
+    def hide_preview(self, canvas: tk.Canvas):
+        """Ховає попередній перегляд на canvas"""
+        preview = getattr(self, "previews", {}).get(canvas)
+        if preview:
+            preview.hide()
+
+    def leave_board(self, canvas: tk.Canvas, motion: MotionCoalescer):
+        """Миша покинула поле: відкладений рух уже не повинен показати перегляд знову"""
+        motion.cancel()
+        self.hide_preview(canvas)
+
+    def cancel_motion(self):
+        """Скасовує відкладені обробники руху миші обох полів"""
+        for motion in (getattr(self, "player_motion", None), getattr(self, "computer_motion", None)):
+            if motion:
+                motion.cancel()
+
     def on_player_board_hover(self, event):
         """Показує попередній перегляд розміщення корабля при наведенні миші"""
         if self.game_phase != "setup" or self.current_ship_index >= len(self.ship_sizes):
+            self.hide_preview(self.player_canvas)
             return
         
         x = event.x // self.cell_size
         y = event.y // self.cell_size
         
-        # Перемальовуємо поле
-        self.draw_board(self.player_canvas, self.player_board, show_ships=True)
-        
         # Показуємо попередній перегляд (зелений - можна, червоний - не можна)
         ship_size = self.ship_sizes[self.current_ship_index]
         can_place = self.player_board.can_place_ship(ship_size, x, y, self.current_orientation)
         color = '#88ff88' if can_place else '#ff8888'
         
+        cells = []
         for i in range(ship_size):
             if self.current_orientation == Orientation.HORIZONTAL:
                 px, py = x + i, y
@@ -1634,56 +1629,46 @@ class BattleshipGame:
                 px, py = x, y + i
             
             if 0 <= px < self.board_size and 0 <= py < self.board_size:
-                x1 = px * self.cell_size
-                y1 = py * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-                self.player_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=color,
-                    outline='#ffffff',
-                    stipple='gray50'
-                )
+                cells.append((px, py))
+
+        # Пул прямокутників лише переміщується, поле не перемальовується
+        self.previews[self.player_canvas].show(
+            cells,
+            fill=color,
+            outline='#ffffff',
+            stipple='gray50'
+        )
     
     def on_computer_board_hover(self, event):
         """Показує попередній перегляд області ураження ракети при наведенні миші"""
-        if not hasattr(self, "rockets_manager"):
-            return
-
         # Показуємо попередній перегляд тільки в режимі кидання ракети
-        if self.rockets_manager.mode != "throw":
+        if not hasattr(self, "rockets_manager") or self.rockets_manager.mode != "throw":
+            self.hide_preview(self.computer_canvas)
             return
 
         x = event.x // self.cell_size
         y = event.y // self.cell_size
 
-        # Перемальовуємо поле
-        self.draw_board(self.computer_canvas, self.computer_board, show_ships=False)
-
         # Отримуємо радіус ураження
         radius = self.rockets_manager._get_rocket_radius()
 
-        # Показуємо попередній перегляд області ураження (зелений напівпрозорий)
+        # Область ураження (зелений напівпрозорий квадрат для кожної клітинки)
+        cells = []
         for dy in range(-radius, radius + 1):
             for dx in range(-radius, radius + 1):
                 tx = x + dx
                 ty = y + dy
 
                 if 0 <= tx < self.board_size and 0 <= ty < self.board_size:
-                    x1 = tx * self.cell_size
-                    y1 = ty * self.cell_size
-                    x2 = x1 + self.cell_size
-                    y2 = y1 + self.cell_size
-
-                    # Малюємо зелений напівпрозорий квадрат для кожної клітинки
-                    self.computer_canvas.create_rectangle(
-                        x1, y1, x2, y2,
-                        fill='#88ff88',
-                        outline='#00ff00',
-                        width=2,
-                        stipple='gray50',
-                        tags=('rocket_preview',)
-                    )
+                    cells.append((tx, ty))
+
+        self.previews[self.computer_canvas].show(
+            cells,
+            fill='#88ff88',
+            outline='#00ff00',
+            width=2,
+            stipple='gray50'
+        )
 
     def on_computer_board_click(self, event):
         """Обробляє клік по полі комп'ютера (стрільба та ракети)"""
@@ -1695,61 +1680,91 @@ class BattleshipGame:
 
         # 🚀 Якщо активований режим ракети
         if hasattr(self, "rockets_manager") and self.rockets_manager.mode == "throw":
-            hit_any, coords = self.rockets_manager.throw_rocket_at("computer", x, y)
-
-            # Ефекти вибуху ракети - більше тремтіння та частинок
-            self.visual_effects.shake_canvas(self.computer_canvas, intensity=8, duration=400)
-            self.visual_effects.create_explosion_particles(
-                self.computer_canvas,
-                x * self.cell_size + self.cell_size // 2,
-                y * self.cell_size + self.cell_size // 2,
-                count=40,
-                colors=['#ff6b6b', '#ff9f43', '#ffd166', '#ff0000', '#ffaa00', '#fff']
-            )
-
-            # Затримуємо перемальовування, щоб показати анімацію вибуху
-            def after_explosion():
-                self.draw_boards()
-                self.update_score()
-
-            self.root.after(850, after_explosion)
+            self.rockets_manager.throw_rocket_at("computer", x, y)
             self.rockets_manager.cancel_throw_mode()
             self.rockets_manager._update_rockets_label()
+            return
 
-            # Аватар гравця радіє від використання ракети
-            if self.player_avatar:
-                if hit_any:
-                    self.player_avatar.set_emotion("excited")
-                    self.player_avatar.show_dialogue("Ракета влучила! 🚀", duration=2500)
-                else:
-                    self.player_avatar.set_emotion("sad")
-                    self.player_avatar.show_dialogue("Ракета промахнулась... 💨", duration=2500)
+        # 🔫 Звичайний постріл (результат покаже on_engine_event)
+        self.engine.player_attack(x, y)
 
-            # Діалог про ракету гравця
-            if self.ai_robot:
-                dialogue = self.dialogue_manager.get_dialogue("player_rocket")
-                emotion = self.dialogue_manager.get_emotion_for_event("player_rocket")
-                self.ai_robot.set_emotion(emotion)
-                self.ai_robot.show_dialogue(dialogue, duration=2500)
+    def on_engine_event(self, event: GameEvent):
+        """Показує події ігрового рушія: постріли, ракети, кракена, зміну ходу та кінець гри"""
+        if event.kind == "shot":
+            self._redraw_delay = 0
+            if event.actor == "player":
+                self.show_player_shot(event)
+            else:
+                self.show_computer_shot(event)
+        elif event.kind == "rocket":
+            if event.actor == "player":
+                self.show_player_rocket(event)
+            else:
+                self.show_computer_rocket(event)
+        elif event.kind == "kraken":
+            self._redraw_delay = 0
+            board_name = "Гравець" if event.target == "player" else "Комп'ютер"
+            self.on_kraken_attack(board_name, event.x, event.y, event.size)
+        elif event.kind == "turn":
+            if event.actor == "computer":
+                # AI рахує хід у фоні, поки GUI витримує паузу перед ним
+                self.engine.prepare_step()
+                self.timers.after(self._turn_delay, self.computer_turn)
+        elif event.kind == "game_over":
+            # Після вибуху ракети спершу даємо дограти анімацію
+            if self._redraw_delay:
+                self.timers.after(self._redraw_delay, lambda: self.end_game(event.actor == "player"))
+            else:
+                self.end_game(event.actor == "player")
+
+    def show_player_rocket(self, event: GameEvent):
+        """Ефекти ракети гравця"""
+        x, y = event.x, event.y
+        # Ефекти вибуху ракети - більше тремтіння та частинок
+        self.visual_effects.shake_canvas(self.computer_canvas, intensity=8, duration=400)
+        self.visual_effects.create_explosion_particles(
+            self.computer_canvas,
+            x * self.cell_size + self.cell_size // 2,
+            y * self.cell_size + self.cell_size // 2,
+            count=40,
+            colors=['#ff6b6b', '#ff9f43', '#ffd166', '#ff0000', '#ffaa00', '#fff']
+        )
+
+        # Затримуємо перемальовування, щоб показати анімацію вибуху
+        def after_explosion():
+            self.draw_boards()
+            self.update_score()
 
-            if hit_any:
-                self.info_label.config(text="🚀 Ракета влучила! Продовжуйте хід!")
+        self._redraw_delay = 850
+        self.timers.after(self._redraw_delay, after_explosion)
+
+        # Аватар гравця радіє від використання ракети
+        if self.player_avatar:
+            if event.hit:
+                self.player_avatar.set_emotion("excited")
+                self.player_avatar.show_dialogue("Ракета влучила! 🚀", duration=2500)
             else:
-                self.info_label.config(text="💨 Ракета не влучила. Хід противника...")
-                self.root.after(1500, self.computer_turn)
-            return
+                self.player_avatar.set_emotion("sad")
+                self.player_avatar.show_dialogue("Ракета промахнулась... 💨", duration=2500)
 
-        # 🔫 Звичайний постріл
-        if not (0 <= x < self.board_size and 0 <= y < self.board_size):
-            return
-        if self.computer_board.revealed[y][x]:
-            return
+        # Діалог про ракету гравця
+        if self.ai_robot:
+            dialogue = self.dialogue_manager.get_dialogue("player_rocket")
+            emotion = self.dialogue_manager.get_emotion_for_event("player_rocket")
+            self.ai_robot.set_emotion(emotion)
+            self.ai_robot.show_dialogue(dialogue, duration=2500)
+
+        if event.hit:
+            self.info_label.config(text="🚀 Ракета влучила! Продовжуйте хід!")
+        else:
+            self.info_label.config(text="💨 Ракета не влучила. Хід противника...")
+            self._turn_delay = 1500
 
-        self.player_shots += 1
-        hit, sunk, ship = self.computer_board.attack(x, y)
+    def show_player_shot(self, event: GameEvent):
+        """Ефекти та діалоги після звичайного пострілу гравця"""
+        x, y, ship = event.x, event.y, event.ship
 
-        if hit:
-            self.player_score += 1
+        if event.hit:
             # Ефекти попадання
             self.visual_effects.shake_canvas(self.computer_canvas, intensity=3, duration=200)
             self.visual_effects.create_hit_flash(self.computer_canvas, x, y, self.cell_size, color='#ff4444')
@@ -1759,7 +1774,7 @@ class BattleshipGame:
                 y * self.cell_size + self.cell_size // 2,
                 count=15
             )
-            if sunk:
+            if event.sunk:
                 # Анімація потоплення корабля
                 def after_sinking_animation():
                     # Після анімації перемальовуємо поле і додаємо дим
@@ -1810,16 +1825,13 @@ class BattleshipGame:
                 emotion = self.dialogue_manager.get_emotion_for_event("player_miss")
                 self.ai_robot.set_emotion(emotion)
                 self.ai_robot.show_dialogue(dialogue, duration=2000)
-            self.root.after(500, self.computer_turn)
+            self._turn_delay = 500
 
         self.draw_boards()
         self.update_score()
-
-        if self.computer_board.all_ships_sunk():
-            self.end_game(True)
     
     def computer_turn(self):
-        """Хід комп'ютера з використанням розумного ШІ"""
+        """Хід комп'ютера: рішення приймає GameEngine, GUI лише показує його події"""
         if self.game_phase != "playing":
             return
 
@@ -1830,18 +1842,24 @@ class BattleshipGame:
             self.ai_robot.set_emotion(emotion)
             self.ai_robot.show_dialogue(dialogue, duration=800)
 
-        # Отримуємо координати для атаки від ШІ
-        x, y = self.get_ai_move()
+        self.wait_for_computer_move()
 
-        if x is None or y is None:
+    def wait_for_computer_move(self):
+        """Робить хід комп'ютера, щойно AI його порахував; до того цикл Tk вільний"""
+        if self.game_phase != "playing":
+            return
+        # Якщо поле змінилось під час паузи (кракен), AI перезапускає обчислення
+        self.engine.prepare_step()
+        if not self.engine.step_ready():
+            self.timers.after(AI_POLL_MS, self.wait_for_computer_move)
             return
+        self.engine.step()
 
-        self.computer_shots += 1
-        hit, sunk, ship = self.player_board.attack(x, y)
+    def show_computer_shot(self, event: GameEvent):
+        """Ефекти та діалоги після пострілу комп'ютера"""
+        x, y, ship = event.x, event.y, event.ship
 
-        if hit:
-            self.computer_score += 1
-            self.ai_last_hit = (x, y)
+        if event.hit:
             # Ефекти попадання комп'ютера
             self.visual_effects.shake_canvas(self.player_canvas, intensity=4, duration=250)
             self.visual_effects.create_hit_flash(self.player_canvas, x, y, self.cell_size, color='#ff0000')
@@ -1852,10 +1870,7 @@ class BattleshipGame:
                 count=20
             )
 
-            if not sunk:
-                # Влучання: переходимо в режим добивання, додаємо сусідні клітинки
-                self.ai_mode = "target"
-                self.add_adjacent_targets(x, y)
+            if not event.sunk:
                 self.info_label.config(text="Противник влучив! Він стріляє знову...")
                 # Аватар гравця стурбований
                 if self.player_avatar:
@@ -1867,15 +1882,7 @@ class BattleshipGame:
                     emotion = self.dialogue_manager.get_emotion_for_event("computer_hit")
                     self.ai_robot.set_emotion(emotion)
                     self.ai_robot.show_dialogue(dialogue, duration=2000)
-                self.root.after(1000, self.computer_turn)
             else:
-                # Корабель потоплений: очищаємо цілі, повертаємося до режиму пошуку
-                self.clean_target_queue_around_ship(ship)
-                self.ai_mode = "hunt"
-                self.ai_target_queue.clear()
-                self.ai_last_hit = None
-                self.ai_hit_direction = None
-
                 # Анімація потоплення корабля гравця
                 def after_player_sinking_animation():
                     # Після анімації перемальовуємо поле і додаємо дим
@@ -1902,9 +1909,8 @@ class BattleshipGame:
                     emotion = self.dialogue_manager.get_emotion_for_event("computer_sunk")
                     self.ai_robot.set_emotion(emotion)
                     self.ai_robot.show_dialogue(dialogue, duration=2500)
-                self.root.after(1000, self.computer_turn)
+            self._turn_delay = 1000
         else:
-            self.ai_mode = "hunt" if not self.ai_target_queue else "target"
             self.info_label.config(text="Противник промахнувся! Ваш хід! 🎯")
             # Аватар гравця радіє
             if self.player_avatar:
@@ -1917,117 +1923,31 @@ class BattleshipGame:
                 self.ai_robot.set_emotion(emotion)
                 self.ai_robot.show_dialogue(dialogue, duration=2000)
 
-        # AI може кинути ракету
-        if hasattr(self, "rockets_manager"):
-            thrown = self.rockets_manager.ai_maybe_throw()
-            if thrown:
-                # Ефекти вибуху ракети AI
-                self.visual_effects.shake_canvas(self.player_canvas, intensity=8, duration=400)
+        self.draw_boards()
+        self.update_score()
 
-                # Діалог про ракету комп'ютера
-                if self.ai_robot:
-                    dialogue = self.dialogue_manager.get_dialogue("computer_rocket")
-                    emotion = self.dialogue_manager.get_emotion_for_event("computer_rocket")
-                    self.ai_robot.set_emotion(emotion)
-                    self.ai_robot.show_dialogue(dialogue, duration=2500)
+    def show_computer_rocket(self, event: GameEvent):
+        """Ефекти ракети, кинутої комп'ютером"""
+        # Ефекти вибуху ракети AI
+        self.visual_effects.shake_canvas(self.player_canvas, intensity=8, duration=400)
 
-                # Затримуємо перемальовування, щоб показати анімацію вибуху
-                def after_ai_explosion():
-                    self.draw_boards()
-                    self.update_score()
-                    if self.player_board.all_ships_sunk():
-                        self.end_game(False)
-                    elif not self.player_board.all_ships_sunk():
-                        self.root.after(600, self.computer_turn)
+        # Діалог про ракету комп'ютера
+        if self.ai_robot:
+            dialogue = self.dialogue_manager.get_dialogue("computer_rocket")
+            emotion = self.dialogue_manager.get_emotion_for_event("computer_rocket")
+            self.ai_robot.set_emotion(emotion)
+            self.ai_robot.show_dialogue(dialogue, duration=2500)
 
-                self.root.after(850, after_ai_explosion)
-                return  # Виходимо, щоб не перекривати анімацію
+        # Затримуємо перемальовування, щоб показати анімацію вибуху
+        def after_ai_explosion():
+            self.draw_boards()
+            self.update_score()
+
+        self._redraw_delay = 850
+        self.timers.after(self._redraw_delay, after_ai_explosion)
+        # Комп'ютер ходить знову вже після анімації вибуху
+        self._turn_delay = 850 + 600
 
-        self.draw_boards()
-        self.update_score()
-        
-        if self.player_board.all_ships_sunk():
-            self.end_game(False)
-    
-    def get_ai_move(self) -> Tuple[Optional[int], Optional[int]]:
-        """Розумне прийняття рішень ШІ про наступну атаку
-        Для EASY — повністю випадково (без добивання).
-        Для HARD — використовує режим 'hunt' і 'target' (існуюча логіка)."""
-        # EASY: повністю випадкова атака по будь-якій невідкритій клітині
-        if getattr(self, "difficulty", "easy") == "easy":
-            choices = [
-                (x, y)
-                for y in range(self.board_size)
-                for x in range(self.board_size)
-                if not self.player_board.revealed[y][x]
-            ]
-            if not choices:
-                return None, None
-            return random.choice(choices)
-
-        # HARD: Режим добивання: атакуємо клітинки поруч з влучаннями
-        if self.ai_mode == "target" and self.ai_target_queue:
-            while self.ai_target_queue:
-                x, y = self.ai_target_queue.pop(0)
-                if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                    if not self.player_board.revealed[y][x]:
-                        return x, y
-            # Якщо черга порожня, повертаємося до режиму пошуку
-            self.ai_mode = "hunt"
-        
-        # Режим пошуку: використовуємо шахову модель для ефективності
-        max_attempts = self.board_size * 20
-        attempts = 0
-        
-        while attempts < max_attempts:
-            x = random.randint(0, self.board_size - 1)
-            y = random.randint(0, self.board_size - 1)
-            
-            if not self.player_board.revealed[y][x]:
-                if (x + y) % 2 == 0 or attempts > max_attempts // 2:
-                    return x, y
-            
-            attempts += 1
-        
-        # Фолбек — перша невідкрита клітинка
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                if not self.player_board.revealed[y][x]:
-                    return x, y
-        
-        return None, None
-    
-    def add_adjacent_targets(self, x: int, y: int):
-        """Додає сусідні клітинки до черги цілей після влучання
-        Перевіряє 4 напрямки: вправо, вниз, вліво, вгору"""
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.board_size and 0 <= ny < self.board_size:
-                if not self.player_board.revealed[ny][nx]:
-                    if (nx, ny) not in self.ai_target_queue:
-                        self.ai_target_queue.append((nx, ny))
-    
-    def clean_target_queue_around_ship(self, ship: Optional[Ship]):
-        """Видаляє клітинки навколо потопленого корабля з черги цілей
-        Це потрібно, щоб ШІ не намагався стріляти по неможливих позиціях"""
-        if ship is None:
-            return
-        
-        ship_coords = ship.get_coordinates()
-        cells_to_remove = set()
-        
-        # Збираємо всі клітинки навколо корабля
-        for sx, sy in ship_coords:
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    nx, ny = sx + dx, sy + dy
-                    cells_to_remove.add((nx, ny))
-        
-        # Фільтруємо чергу, видаляючи клітинки навколо потопленого корабля
-        self.ai_target_queue = [(x, y) for x, y in self.ai_target_queue if (x, y) not in cells_to_remove]
-    
     def rotate_ship(self):
         if self.game_phase == "setup":
             self.current_orientation = (
@@ -2038,24 +1958,26 @@ class BattleshipGame:
     def place_ships_randomly(self):
         """Автоматично розміщує всі кораблі гравця у випадкових позиціях"""
         if self.game_phase == "setup":
-            self.player_board = Board(self.board_size, self.ship_sizes)
-            self.player_board.place_ships_randomly()
+            self.engine.place_player_ships_randomly()
             self.current_ship_index = len(self.ship_sizes)
             self.draw_boards()
             self.start_game()
     
     def start_game(self):
         """Починає гру після розміщення всіх кораблів"""
-        self.game_phase = "playing"
-        # Розміщуємо кораблі комп'ютера
-        self.computer_board.place_ships_randomly()
+        # Запис партії: нова гра — новий файл
+        if self.replay_dir:
+            self.close_replay()
+            self.replay_writer = record_game(self.engine, self.replay_dir)
+
+        # Рушій розміщує кораблі та ракети комп'ютера і готує AI
+        self.engine.start()
 
         if hasattr(self, "rockets_manager"):
-            self.rockets_manager.place_computer_rockets_random()
             self.rockets_manager._update_rockets_label()
 
         # Створюємо кракена (тільки для середніх та великих полів)
-        if self.board_size >= 10:
+        if self.engine.kraken and self.engine.kraken.active:
             # Знищуємо старого кракена, якщо існує
             if self.kraken:
                 self.kraken.destroy()
@@ -2067,14 +1989,15 @@ class BattleshipGame:
                 self.board_size,
                 self.player_board,
                 self.computer_board,
-                self.on_kraken_attack
+                engine=self.engine,
+                rng=self.rng.split("kraken_view"),
             )
 
         # Створюємо аватар гравця
         if self.player_avatar:
             self.player_avatar.destroy()
 
-        self.player_avatar = PlayerAvatar(self.player_avatar_container)
+        self.player_avatar = PlayerAvatar(self.player_avatar_container, rng=self.rng.split("player_avatar"))
         self.player_avatar.set_emotion("neutral")
         self.player_avatar.show_dialogue("Готовий до бою! ⚓", duration=3000)
 
@@ -2084,7 +2007,8 @@ class BattleshipGame:
 
         self.ai_robot = AIRobot(
             self.ai_robot_container,
-            difficulty=self.difficulty
+            difficulty=self.difficulty,
+            rng=self.rng.split("ai_robot"),
         )
 
         # Показуємо початковий діалог
@@ -2150,18 +2074,12 @@ class BattleshipGame:
             self.ai_robot.set_emotion(emotion)
             self.ai_robot.show_dialogue(dialogue, duration=3000)
 
-        # Перевіряємо, чи не закінчилась гра
-        if self.player_board.all_ships_sunk():
-            self.end_game(False)
-        elif self.computer_board.all_ships_sunk():
-            self.end_game(True)
-        else:
-            # Повертаємо нормальний колір тексту через 3 секунди
-            self.root.after(3000, lambda: self.info_label.config(fg='#ffffff'))
+        # Кінець гри (якщо кракен його спричинив) обробить подія game_over рушія
+        # Повертаємо нормальний колір тексту через 3 секунди
+        self.timers.after(3000, lambda: self.info_label.config(fg='#ffffff'))
     
     def end_game(self, player_won: bool):
         """Завершує гру та показує результати"""
-        self.game_phase = "ended"
 
         # Показуємо всі кораблі комп'ютера
         self.draw_board(self.computer_canvas, self.computer_board, show_ships=True)
@@ -2198,6 +2116,14 @@ class BattleshipGame:
         game_over_window.configure(bg='#1a1a2e')
         game_over_window.resizable(False, False)
         game_over_window.grab_set()
+
+        # Поки відкрите вікно результатів, анімації позаду нього сповільнені
+        clock = get_clock(self.root)
+        clock.hold("game_over", BACKGROUND_FPS)
+        game_over_window.bind(
+            "<Destroy>",
+            lambda e: clock.release("game_over") if e.widget is game_over_window else None
+        )
         
         # Центруємо вікно на екрані
         window_width = 500
@@ -2392,9 +2318,16 @@ class BattleshipGame:
     
     def reset_game(self):
         """Скидає гру до початкового стану для нової партії"""
-        # Створюємо нові поля з правильною конфігурацією
-        self.player_board = Board(self.board_size, self.ship_sizes)
-        self.computer_board = Board(self.board_size, self.ship_sizes)
+        # Відкладені дії попередньої партії не повинні спрацювати в новій
+        self.cancel_motion()
+        self.timers.cancel_all()
+        self.info_label.config(fg='#ffffff')
+
+        # Незавершений запис попередньої партії закриваємо до скидання
+        self.close_replay()
+
+        # Нові поля, рахунок і стан AI з правильною конфігурацією
+        self.engine.reset()
 
         # Знищуємо кракена
         if hasattr(self, 'kraken') and self.kraken:
@@ -2411,22 +2344,9 @@ class BattleshipGame:
             self.player_avatar.destroy()
             self.player_avatar = None
         
-        self.game_phase = "setup"
         self.current_ship_index = 0
         self.current_orientation = Orientation.HORIZONTAL
         
-        # Скидаємо статистику
-        self.player_score = 0
-        self.computer_score = 0
-        self.player_shots = 0
-        self.computer_shots = 0
-        
-        # Скидаємо стан ШІ
-        self.ai_mode = "hunt"
-        self.ai_target_queue.clear()
-        self.ai_last_hit = None
-        self.ai_hit_direction = None
-        
         self.rotate_button.config(state=tk.NORMAL)
         self.random_button.config(state=tk.NORMAL)
         self.update_info_label()
@@ -2438,6 +2358,16 @@ class BattleshipGame:
     
     def return_to_menu(self):
         """Повертає гравця до головного меню"""
+        self.engine.close()
+        self.close_replay()
+
+        # Скасовуємо всі відкладені дії гри та її ефектів
+        self.cancel_motion()
+        self.timers.cancel_all()
+        self.visual_effects.timers.cancel_all()
+        if hasattr(self, "rockets_manager"):
+            self.rockets_manager.timers.cancel_all()
+
         # Знищуємо кракена перед поверненням до меню
         if hasattr(self, 'kraken') and self.kraken:
             self.kraken.destroy()
@@ -2455,8 +2385,14 @@ class BattleshipGame:
             widget.destroy()
 
         # Повертаємося до меню
-        menu = MainMenu(self.root)
+        menu = MainMenu(self.root, seed=self.seed, replay_dir=self.replay_dir)
     
+    def close_replay(self):
+        """Закриває запис поточної партії (незавершена партія лишається без події end)"""
+        if self.replay_writer is not None:
+            self.replay_writer.close()
+            self.replay_writer = None
+
     def update_info_label(self):
         """Оновлює інформаційну панель з підказками для гравця"""
         if self.current_ship_index < len(self.ship_sizes):
@@ -2479,7 +2415,15 @@ class BattleshipGame:
 def main():
     """Головна функція для запуску гри"""
     root = tk.Tk()
-    menu = MainMenu(root)
+    # Анімації зупиняються, коли вікно згорнуте, і сповільнюються у фоні
+    VisibilityWatcher(root)
+    # Профілювання GUI: прапорець --profile[=шлях] або змінна BATTLESHIP_PROFILE
+    profiler = install_from_args(root, sys.argv[1:])
+    if profiler:
+        profiler.instrument(BattleshipGame, "draw_board", "computer_turn", "on_engine_event")
+    # Відтворювана гра: --seed=N або змінна BATTLESHIP_SEED;
+    # запис партій: --replay-dir=DIR або змінна BATTLESHIP_REPLAY_DIR
+    menu = MainMenu(root, seed=seed_from_args(sys.argv[1:]), replay_dir=replay_dir_from_args(sys.argv[1:]))
     root.mainloop()
 
 
@@ -0,0 +1,230 @@
+from typing import Dict, List, Tuple, Optional
+import random
+
+from Board import CellState, Orientation, Ship
+from placement import PlacementTable, generate_fleet
+from zobrist import ZobristKeys
+
+
+class _GridRow:
+    """Рядок board.grid, що читає стан клітинок прямо з бітових масок."""
+
+    __slots__ = ("_board", "_y")
+
+    def __init__(self, board: "BitBoard", y: int):
+        self._board = board
+        self._y = y
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self):
+        for x in range(self._board.size):
+            yield self[x]
+
+    def _bit(self, x: int) -> int:
+        if x < 0:
+            x += self._board.size
+        if not 0 <= x < self._board.size:
+            raise IndexError(x)
+        return 1 << (self._y * self._board.size + x)
+
+    def __getitem__(self, x: int) -> CellState:
+        return self._board._cell_state(self._bit(x))
+
+    def __setitem__(self, x: int, value: CellState):
+        self._board._set_cell_state(self._bit(x), value)
+
+
+class _RevealedRow(_GridRow):
+    """Рядок board.revealed поверх маски відкритих клітинок."""
+
+    __slots__ = ()
+
+    def __getitem__(self, x: int) -> bool:
+        return bool(self._board.revealed_mask & self._bit(x))
+
+    def __setitem__(self, x: int, value: bool):
+        if value:
+            self._board.revealed_mask |= self._bit(x)
+        else:
+            self._board.revealed_mask &= ~self._bit(x)
+
+
+class _MaskGridView:
+    """Представлення board.grid / board.revealed у вигляді списку рядків."""
+
+    __slots__ = ("_board", "_row_cls")
+
+    def __init__(self, board: "BitBoard", row_cls):
+        self._board = board
+        self._row_cls = row_cls
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self):
+        for y in range(self._board.size):
+            yield self._row_cls(self._board, y)
+
+    def __getitem__(self, y: int):
+        if y < 0:
+            y += self._board.size
+        if not 0 <= y < self._board.size:
+            raise IndexError(y)
+        return self._row_cls(self._board, y)
+
+
+class BitBoard:
+    """Ігрове поле на цілочисельних бітових масках.
+
+    Має той самий публічний API, що й Board.Board (place_ship, attack,
+    all_ships_sunk, grid/revealed), але перевіряє розміщення та обробляє
+    постріли кількома бітовими операціями. Біт клітинки (x, y) — y * size + x."""
+
+    def __init__(self, size: int = 10, ship_sizes: List[int] = None):
+        self.size = size
+        self.ships: List[Ship] = []
+        self.ship_sizes = ship_sizes if ship_sizes else [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
+
+        # Бітові маски стану поля
+        self.ship_mask = 0      # клітинки з кораблями (включно з підбитими)
+        self.hit_mask = 0       # влучання
+        self.miss_mask = 0      # промахи
+        self.revealed_mask = 0  # відкриті клітинки
+
+        # Індекс клітинка -> корабель (ключ — y * size + x)
+        self.ship_at: Dict[int, Ship] = {}
+        # Маска ореолу кожного корабля (за id корабля)
+        self._ship_halos: Dict[int, int] = {}
+        # Спільна таблиця масок розміщень для полів цього розміру
+        self._table = PlacementTable.for_board(size)
+        # Хеш Зобріста того, що видно противнику (як у Board)
+        self._zobrist_keys = ZobristKeys.for_board(size)
+        self.zobrist = self._zobrist_keys.fleet(self.ship_sizes)
+
+    # ------------------------------------------------------------------ #
+    # Представлення, сумісні з Board
+    # ------------------------------------------------------------------ #
+    @property
+    def grid(self) -> _MaskGridView:
+        return _MaskGridView(self, _GridRow)
+
+    @property
+    def revealed(self) -> _MaskGridView:
+        return _MaskGridView(self, _RevealedRow)
+
+    def _cell_state(self, bit: int) -> CellState:
+        if self.hit_mask & bit:
+            return CellState.HIT
+        if self.miss_mask & bit:
+            return CellState.MISS
+        if self.ship_mask & bit:
+            return CellState.SHIP
+        return CellState.EMPTY
+
+    def _set_cell_state(self, bit: int, value: CellState):
+        self.hit_mask &= ~bit
+        self.miss_mask &= ~bit
+        if value == CellState.HIT:
+            self.hit_mask |= bit
+            self.ship_mask |= bit
+        elif value == CellState.MISS:
+            self.miss_mask |= bit
+            self.ship_mask &= ~bit
+        elif value == CellState.SHIP:
+            self.ship_mask |= bit
+        else:
+            self.ship_mask &= ~bit
+
+    def _masks_for(self, size: int, x: int, y: int, orientation: Orientation) -> Optional[Tuple[int, int]]:
+        placement = self._table.lookup(size, x, y, orientation)
+        if placement is None:
+            return None
+        return placement.mask, placement.halo
+
+    # ------------------------------------------------------------------ #
+    # Розміщення
+    # ------------------------------------------------------------------ #
+    def can_place_ship(self, size: int, x: int, y: int, orientation: Orientation) -> bool:
+        masks = self._masks_for(size, x, y, orientation)
+        if masks is None:
+            return False
+        # Як і в Board._is_cell_free, заважають лише неушкоджені кораблі
+        return not (self.ship_mask & ~self.hit_mask & masks[1])
+
+    def place_ship(self, size: int, x: int, y: int, orientation: Orientation) -> bool:
+        masks = self._masks_for(size, x, y, orientation)
+        if masks is None or self.ship_mask & ~self.hit_mask & masks[1]:
+            return False
+
+        cells_mask, halo_mask = masks
+        ship = Ship(size, (x, y), orientation)
+        self.ships.append(ship)
+
+        self.ship_mask |= cells_mask
+        self.hit_mask &= ~cells_mask
+        self.miss_mask &= ~cells_mask
+        self._ship_halos[id(ship)] = halo_mask
+        for coord_x, coord_y in ship.coordinates:
+            self.ship_at[coord_y * self.size + coord_x] = ship
+
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Бій
+    # ------------------------------------------------------------------ #
+    def attack(self, x: int, y: int) -> Tuple[bool, bool, Optional[Ship]]:
+        if x < 0 or x >= self.size or y < 0 or y >= self.size:
+            return False, False, None
+
+        index = y * self.size + x
+        bit = 1 << index
+        self.revealed_mask |= bit
+
+        if self.hit_mask & bit or self.miss_mask & bit:
+            return False, False, None
+
+        if self.ship_mask & bit:
+            self.hit_mask |= bit
+            self.zobrist ^= self._zobrist_keys.hit[index]
+            ship = self.ship_at.get(index)
+            if ship is None:
+                return True, False, None
+            ship.hits += 1
+            if ship.is_sunk():
+                self.zobrist ^= self._zobrist_keys.sunk(ship)
+                self.mark_surrounding_as_miss(ship)
+                return True, True, ship
+            return True, False, ship
+
+        self.miss_mask |= bit
+        self.zobrist ^= self._zobrist_keys.miss[index]
+        return False, False, None
+
+    def mark_surrounding_as_miss(self, ship: Ship):
+        halo_mask = self._ship_halos.get(id(ship))
+        if halo_mask is None:
+            x, y = ship.position
+            halo_mask = self._masks_for(ship.size, x, y, ship.orientation)[1]
+        # Порожні клітинки ореолу: не корабель і ще не відмічені промахом
+        empty = halo_mask & ~self.ship_mask & ~self.miss_mask
+        self.miss_mask |= empty
+        self.revealed_mask |= empty
+        miss_keys = self._zobrist_keys.miss
+        while empty:
+            low_bit = empty & -empty
+            self.zobrist ^= miss_keys[low_bit.bit_length() - 1]
+            empty ^= low_bit
+
+    def all_ships_sunk(self) -> bool:
+        return all(ship.is_sunk() for ship in self.ships)
+
+    def place_ships_randomly(self, rng: random.Random = None):
+        # Вже поставлені кораблі разом із сусідніми клітинками недоступні
+        blocked = 0
+        for halo_mask in self._ship_halos.values():
+            blocked |= halo_mask
+
+        for placement in generate_fleet(self.size, self.ship_sizes, rng, blocked=blocked):
+            self.place_ship(placement.size, placement.x, placement.y, placement.orientation)
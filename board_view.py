@@ -0,0 +1,360 @@
+"""Збережений (retained-mode) рендер ігрового поля на tk.Canvas.
+
+Елементи сітки та клітинок створюються один раз, далі кожен виклик render
+порівнює поле з останнім намальованим станом і лише перефарбовує змінені
+клітинки (itemconfig), додає або прибирає кораблі та позначки влучань.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import tkinter as tk
+
+from Board import Board, CellState
+from timers import TimerRegistry
+
+GRID_COLOR = '#16213e'
+WATER_COLOR = '#0f3460'
+CELL_COLORS = {
+    CellState.HIT: '#ff4444',
+    CellState.MISS: '#4a5568',
+}
+# Текст і колір позначки поверх клітинки
+MARKERS = {
+    CellState.HIT: ('💥', 'black'),
+    CellState.MISS: ('○', '#ffffff'),
+}
+MARKER_FONT = ('Arial', 16)
+
+# Шари знизу вгору; кожен шар закінчується невидимим «якорем», під який
+# опускаються нові елементи шару, щоб порядок малювання не залежав від часу створення
+LAYERS = ('board_ship', 'board_sunk', 'board_marker')
+
+# Позначка клітинки, яку треба перемалювати незалежно від стану
+_STALE = object()
+
+ShipDrawer = Callable[[tk.Canvas, object, int], None]
+
+
+class _RecordingCanvas:
+    """Записує виклики create_* замість малювання — так отримуємо список відображення спрайта."""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, Tuple[float, ...], Dict[str, object]]] = []
+
+    def __getattr__(self, name):
+        if not name.startswith('create_'):
+            raise AttributeError(name)
+
+        def record(*args, **kw):
+            coords = []
+            for arg in args:
+                if isinstance(arg, (list, tuple)):
+                    coords.extend(arg)
+                else:
+                    coords.append(arg)
+            self.calls.append((name, tuple(coords), kw))
+            return len(self.calls)
+        return record
+
+
+class _OriginShip:
+    """Корабель у лівому верхньому куті поля — ним малюється спрайт."""
+
+    def __init__(self, size: int, horizontal: bool):
+        self.size = size
+        self.coordinates = tuple((i, 0) if horizontal else (0, i) for i in range(size))
+
+
+SpriteKey = Tuple[int, bool, int, bool]
+
+
+class SpriteCache:
+    """Списки відображення кораблів за ключем (розмір, горизонтальний, cell_size, потоплений).
+
+    Корабель малюється один раз у початку координат; далі спрайт лише
+    відтворюється зі зсувом. Зміна cell_size скидає кеш."""
+
+    def __init__(self):
+        self.cell_size: Optional[int] = None
+        self._sprites: Dict[SpriteKey, list] = {}
+
+    def get(self, key: SpriteKey, render: Callable[[object, object], None]) -> list:
+        size, horizontal, cell_size, _ = key
+        if cell_size != self.cell_size:
+            self._sprites.clear()
+            self.cell_size = cell_size
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            recorder = _RecordingCanvas()
+            render(recorder, _OriginShip(size, horizontal))
+            sprite = self._sprites[key] = recorder.calls
+        return sprite
+
+    @staticmethod
+    def draw(canvas: tk.Canvas, sprite: list, dx: float, dy: float, tags: Tuple[str, ...]):
+        for method, coords, options in sprite:
+            shifted = [value + (dx if index % 2 == 0 else dy) for index, value in enumerate(coords)]
+            getattr(canvas, method)(*shifted, **dict(options, tags=tags))
+
+
+# Спільний для всіх полів кеш: спрайти залежать лише від ключа
+SPRITES = SpriteCache()
+
+
+class BoardView:
+    """Відображення одного поля на canvas, що оновлюється інкрементально.
+
+    draw_ship — функція малювання корабля (як BattleshipGame.draw_ship). Вона
+    викликається лише раз на спрайт (SpriteCache); кораблі на полі — копії
+    спрайта з тегом групи. Прибраний корабель ховається і потім переміщується
+    на місце нового корабля з тим самим спрайтом."""
+
+    def __init__(self, canvas: tk.Canvas, board_size: int, cell_size: int, draw_ship: ShipDrawer):
+        self.canvas = canvas
+        self.board_size = board_size
+        self.cell_size = cell_size
+        self.draw_ship = draw_ship
+
+        self._board: Optional[Board] = None
+        # Намальований вигляд клітинки: HIT, MISS або None (вода)
+        self._styles: List[object] = []
+        self._cells: List[int] = []
+        self._markers: Dict[int, int] = {}
+        # Координати корабля -> (тег групи, ключ спрайта, зсув групи)
+        self._ships: Dict[Tuple, Tuple[str, SpriteKey, Tuple[int, int]]] = {}
+        self._sunk: Dict[Tuple, Tuple[str, SpriteKey, Tuple[int, int]]] = {}
+        # Приховані групи, готові до повторного використання
+        self._spare: Dict[SpriteKey, List[Tuple[str, Tuple[int, int]]]] = {}
+        self._next_tag = 0
+
+        self._create_static_items()
+
+    def _create_static_items(self):
+        canvas = self.canvas
+        size = self.board_size
+        cs = self.cell_size
+        for i in range(size + 1):
+            canvas.create_line(i * cs, 0, i * cs, size * cs, fill=GRID_COLOR, width=1, tags=('board', 'board_grid'))
+            canvas.create_line(0, i * cs, size * cs, i * cs, fill=GRID_COLOR, width=1, tags=('board', 'board_grid'))
+
+        for y in range(size):
+            for x in range(size):
+                x1 = x * cs
+                y1 = y * cs
+                self._cells.append(canvas.create_rectangle(
+                    x1, y1, x1 + cs, y1 + cs,
+                    fill=WATER_COLOR, outline=GRID_COLOR, tags=('board', 'board_cell')
+                ))
+        self._styles = [None] * (size * size)
+
+        self._anchors = {
+            layer: canvas.create_line(0, 0, 0, 0, state='hidden', tags=('board', 'board_anchor'))
+            for layer in LAYERS
+        }
+
+    def _place_in_layer(self, tag: str, layer: str):
+        try:
+            self.canvas.tag_lower(tag, self._anchors[layer])
+        except tk.TclError:
+            # Функція малювання не створила жодного елемента (невідомий розмір корабля)
+            pass
+
+    def _new_tag(self, prefix: str) -> str:
+        self._next_tag += 1
+        return f'{prefix}_{self._next_tag}'
+
+    def _forget_board(self):
+        """Нове поле (нова партія): ховає кораблі, решту оновить звичайне порівняння."""
+        for drawn in (self._ships, self._sunk):
+            for key in list(drawn):
+                self._hide_group(drawn, key)
+        self._styles = [_STALE] * (self.board_size * self.board_size)
+
+    def render(self, board: Board, show_ships: bool) -> int:
+        """Приводить canvas у відповідність до board і повертає кількість змінених елементів."""
+        if board is not self._board:
+            self._forget_board()
+            self._board = board
+
+        changes = self._render_cells(board)
+        changes += self._render_ships(board, show_ships)
+        return changes
+
+    def _render_cells(self, board: Board) -> int:
+        canvas = self.canvas
+        size = self.board_size
+        styles = self._styles
+        changes = 0
+        for y, row in enumerate(board.grid):
+            base = y * size
+            for x, state in enumerate(row):
+                # SHIP і EMPTY виглядають однаково — це вода (None)
+                style = state if state in CELL_COLORS else None
+                index = base + x
+                if styles[index] is style:
+                    continue
+                styles[index] = style
+                canvas.itemconfig(self._cells[index], fill=CELL_COLORS.get(style, WATER_COLOR))
+                self._set_marker(index, x, y, MARKERS.get(style))
+                changes += 1
+        return changes
+
+    def _set_marker(self, index: int, x: int, y: int, marker: Optional[Tuple[str, str]]):
+        canvas = self.canvas
+        item = self._markers.get(index)
+        if marker is None:
+            if item is not None:
+                canvas.itemconfig(item, state='hidden')
+            return
+
+        text, color = marker
+        if item is None:
+            cs = self.cell_size
+            item = canvas.create_text(
+                x * cs + cs // 2, y * cs + cs // 2,
+                text=text, font=MARKER_FONT, fill=color, tags=('board', 'board_marker')
+            )
+            self._markers[index] = item
+            self._place_in_layer(item, 'board_marker')
+        else:
+            canvas.itemconfig(item, text=text, fill=color, state='normal')
+
+    def _render_ships(self, board: Board, show_ships: bool) -> int:
+        afloat = {}
+        sunk = {}
+        for ship in board.ships:
+            if ship.is_sunk():
+                sunk[tuple(ship.coordinates)] = ship
+            elif show_ships:
+                afloat[tuple(ship.coordinates)] = ship
+
+        changes = self._sync(self._ships, afloat, False, 'board_ship')
+        changes += self._sync(self._sunk, sunk, True, 'board_sunk')
+        return changes
+
+    def _hide_group(self, drawn, key):
+        tag, sprite_key, offset = drawn.pop(key)
+        self.canvas.itemconfig(tag, state='hidden')
+        self._spare.setdefault(sprite_key, []).append((tag, offset))
+
+    def _sync(self, drawn, wanted: Dict[Tuple, object], sunk: bool, layer: str) -> int:
+        changes = 0
+        for key in [key for key in drawn if key not in wanted]:
+            self._hide_group(drawn, key)
+            changes += 1
+
+        cs = self.cell_size
+        for key, ship in wanted.items():
+            if key in drawn:
+                continue
+            coords = tuple(ship.coordinates)
+            horizontal = len(coords) == 1 or coords[0][1] == coords[1][1]
+            sprite_key = (len(coords), horizontal, cs, sunk)
+            offset = (min(x for x, _ in coords) * cs, min(y for _, y in coords) * cs)
+
+            spare = self._spare.get(sprite_key)
+            if spare:
+                tag, old = spare.pop()
+                self.canvas.move(tag, offset[0] - old[0], offset[1] - old[1])
+                self.canvas.itemconfig(tag, state='normal')
+            else:
+                tag = self._new_tag(layer)
+                render = self._draw_sunk if sunk else self._draw_ship
+                SpriteCache.draw(self.canvas, SPRITES.get(sprite_key, render), offset[0], offset[1],
+                                 ('board', layer, tag))
+            self._place_in_layer(tag, layer)
+            drawn[key] = (tag, sprite_key, offset)
+            changes += 1
+        return changes
+
+    def _draw_ship(self, canvas, ship):
+        self.draw_ship(canvas, ship, self.cell_size)
+
+    def _draw_sunk(self, canvas, ship):
+        """Потоплений корабель: темні клітинки з червоним хрестом."""
+        cs = self.cell_size
+        for x, y in ship.coordinates:
+            x1 = x * cs
+            y1 = y * cs
+            x2 = x1 + cs
+            y2 = y1 + cs
+            canvas.create_rectangle(x1, y1, x2, y2, fill='#1a1a1a', outline='#ff0000', width=2)
+            canvas.create_line(x1 + 5, y1 + 5, x2 - 5, y2 - 5, fill='#ff0000', width=3)
+            canvas.create_line(x2 - 5, y1 + 5, x1 + 5, y2 - 5, fill='#ff0000', width=3)
+
+
+class PreviewOverlay:
+    """Попередній перегляд поверх поля з пулу прямокутників.
+
+    Прямокутники створюються лише тоді, коли пулу не вистачає, і далі тільки
+    переміщуються, перефарбовуються або ховаються. show з тими самими
+    клітинками і стилем нічого не робить."""
+
+    def __init__(self, canvas: tk.Canvas, cell_size: int, tag: str):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.tag = tag
+        self._items: List[int] = []
+        self._cells: Tuple[Tuple[int, int], ...] = ()
+        self._style: Dict[str, object] = {}
+
+    def show(self, cells, **style) -> bool:
+        """Показує прямокутники на клітинках cells; повертає True, якщо щось змінилось."""
+        cells = tuple(cells)
+        if cells == self._cells and style == self._style:
+            return False
+
+        canvas = self.canvas
+        cs = self.cell_size
+        while len(self._items) < len(cells):
+            self._items.append(canvas.create_rectangle(0, 0, 0, 0, state='hidden', tags=(self.tag,), **style))
+
+        restyle = style != self._style
+        for index, (x, y) in enumerate(cells):
+            item = self._items[index]
+            if index >= len(self._cells) or self._cells[index] != (x, y):
+                canvas.coords(item, x * cs, y * cs, x * cs + cs, y * cs + cs)
+            if restyle or index >= len(self._cells):
+                canvas.itemconfig(item, state='normal', **style)
+        for item in self._items[len(cells):len(self._cells)]:
+            canvas.itemconfig(item, state='hidden')
+
+        self._cells = cells
+        self._style = style
+        return True
+
+    def hide(self):
+        for item in self._items[:len(self._cells)]:
+            self.canvas.itemconfig(item, state='hidden')
+        self._cells = ()
+
+
+class MotionCoalescer:
+    """Обробник <Motion>, що викликає handler не частіше одного разу за кадр.
+
+    Події між кадрами лише запам'ятовуються; handler отримує останню з них.
+    Таймер належить реєстру timers, тож cancel_all власника скасовує і його."""
+
+    FRAME_MS = 16
+
+    def __init__(self, timers: TimerRegistry, handler: Callable[[tk.Event], None], interval_ms: int = FRAME_MS):
+        self.timers = timers
+        self.handler = handler
+        self.interval_ms = interval_ms
+        self._event: Optional[tk.Event] = None
+        self._job = None
+
+    def __call__(self, event: tk.Event):
+        self._event = event
+        # Таймер міг скасувати сам реєстр (cancel_all власника)
+        if self._job not in self.timers:
+            self._job = self.timers.after(self.interval_ms, self._flush)
+
+    def _flush(self):
+        self._job = None
+        event, self._event = self._event, None
+        if event is not None:
+            self.handler(event)
+
+    def cancel(self):
+        self.timers.cancel(self._job)
+        self._job = None
+        self._event = None
@@ -0,0 +1,225 @@
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import random
+
+from Board import CellState
+from placement import PlacementTable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необов'язковий: без нього працює чистий Python
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Вага розміщення за кожне непотоплене влучання, яке воно покриває
+TARGET_WEIGHT = 10_000
+
+
+class Observation(NamedTuple):
+    """Те, що стріляючий бачить на полі противника.
+
+    Маски — цілі числа з бітом y * size + x на клітинку. blocked — клітинки,
+    де невідомого корабля бути не може (промахи, потоплені кораблі та їх
+    сусіди), open_hits — влучання в ще не потоплені кораблі, unknown —
+    невідкриті клітинки, remaining — розміри кораблів, що ще на плаву."""
+    size: int
+    blocked: int
+    open_hits: int
+    unknown: int
+    remaining: Dict[int, int]
+
+
+def observe(board) -> Observation:
+    """Збирає спостережуваний стан поля з board.grid / board.revealed і потоплених кораблів."""
+    size = board.size
+    full = (1 << (size * size)) - 1
+
+    revealed_mask = getattr(board, "revealed_mask", None)
+    if revealed_mask is not None:
+        hits = board.hit_mask & revealed_mask
+        misses = revealed_mask & ~hits
+    else:
+        hits = 0
+        misses = 0
+        grid = board.grid
+        for y, row in enumerate(board.revealed):
+            grid_row = grid[y]
+            for x, is_revealed in enumerate(row):
+                if is_revealed:
+                    if grid_row[x] == CellState.HIT:
+                        hits |= 1 << (y * size + x)
+                    else:
+                        misses |= 1 << (y * size + x)
+        revealed_mask = hits | misses
+
+    table = PlacementTable.for_board(size)
+    sunk = 0
+    sunk_halo = 0
+    remaining = Counter(board.ship_sizes)
+    for ship in board.ships:
+        if ship.is_sunk():
+            placement = table.lookup(ship.size, ship.position[0], ship.position[1], ship.orientation)
+            if placement is not None:
+                sunk |= placement.mask
+                sunk_halo |= placement.halo
+            if remaining[ship.size] > 0:
+                remaining[ship.size] -= 1
+
+    return Observation(
+        size=size,
+        blocked=misses | sunk | sunk_halo,
+        open_hits=hits & ~sunk,
+        unknown=full & ~revealed_mask,
+        remaining={s: c for s, c in remaining.items() if c > 0},
+    )
+
+
+def density_map(board, use_numpy: Optional[bool] = None) -> List[List[int]]:
+    """Карта покриття невідкритих клітинок розміщеннями кораблів, що лишились.
+
+    Розміщення враховується, якщо не зачіпає заблокованих клітинок і не
+    торкається непотоплених влучань; його вага — 1 + TARGET_WEIGHT за кожне
+    покрите влучання. Відкриті клітинки мають нульове значення. Якщо
+    use_numpy не задано, NumPy використовується, коли він встановлений."""
+    observation = observe(board)
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy:
+        return _density_numpy(observation).tolist()
+    return _density_python(observation)
+
+
+def best_cells(board, use_numpy: Optional[bool] = None) -> List[int]:
+    """Номери (y * size + x) усіх невідкритих клітинок з найбільшою щільністю.
+
+    Залежить лише від спостережуваного стану поля, тож результат можна
+    кешувати за board.zobrist."""
+    observation = observe(board)
+    if not observation.unknown:
+        return []
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+
+    size = observation.size
+    if use_numpy:
+        density = _density_numpy(observation)
+        unknown = _mask_to_array(observation.unknown, size)
+        density = np.where(unknown, density, -1)
+        return np.flatnonzero(density == density.max()).tolist()
+
+    density = _density_python(observation)
+    best_score = -1
+    candidates = []
+    for cell in range(size * size):
+        if not observation.unknown >> cell & 1:
+            continue
+        score = density[cell // size][cell % size]
+        if score > best_score:
+            best_score = score
+            candidates = [cell]
+        elif score == best_score:
+            candidates.append(cell)
+    return candidates
+
+
+def best_cell(board, rng: random.Random = None, use_numpy: Optional[bool] = None) -> Optional[Tuple[int, int]]:
+    """Невідкрита клітинка з найбільшою щільністю (нічия — випадково) або None."""
+    return pick_cell(best_cells(board, use_numpy), board.size, rng)
+
+
+def pick_cell(candidates: List[int], size: int, rng: random.Random = None) -> Optional[Tuple[int, int]]:
+    """Випадкова клітинка (x, y) з кандидатів best_cells або None."""
+    if not candidates:
+        return None
+    rng = rng or random
+    cell = candidates[rng.randrange(len(candidates))]
+    return cell % size, cell // size
+
+
+# ---------------------------------------------------------------------- #
+# Чистий Python
+# ---------------------------------------------------------------------- #
+def _density_python(observation: Observation) -> List[List[int]]:
+    size = observation.size
+    table = PlacementTable.for_board(size)
+    blocked = observation.blocked
+    hits = observation.open_hits
+    density = [0] * (size * size)
+
+    for ship_size, multiplier in observation.remaining.items():
+        for placement in table.placements(ship_size):
+            if placement.mask & blocked:
+                continue
+            if placement.halo & ~placement.mask & hits:
+                continue
+            weight = multiplier * (1 + TARGET_WEIGHT * (placement.mask & hits).bit_count())
+            for cell in placement.cells:
+                density[cell] += weight
+
+    unknown = observation.unknown
+    return [
+        [density[y * size + x] if unknown >> (y * size + x) & 1 else 0 for x in range(size)]
+        for y in range(size)
+    ]
+
+
+# ---------------------------------------------------------------------- #
+# NumPy: ковзні вікна через префіксні суми
+# ---------------------------------------------------------------------- #
+def _mask_to_array(mask: int, size: int):
+    """Бітова маска -> булевий масив size x size."""
+    cell_count = size * size
+    raw = np.frombuffer(mask.to_bytes((cell_count + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:cell_count].reshape(size, size).astype(bool)
+
+
+def _prefix_sums(values):
+    """Двовимірні префіксні суми масиву, доповненого нулями по 1 клітинці з кожного боку."""
+    padded = np.pad(values.astype(np.int64), 1)
+    prefix = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int64)
+    prefix[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+    return prefix
+
+
+def _horizontal_coverage(blocked, hits, ship_size: int):
+    """Покриття клітинок горизонтальними розміщеннями корабля ship_size."""
+    n = blocked.shape[0]
+    if ship_size > n:
+        return np.zeros((n, n), dtype=np.int64)
+    s = ship_size
+    pb = _prefix_sums(blocked)
+    ph = _prefix_sums(hits)
+
+    def window(p):
+        # Сума по клітинках корабля: рядок y, стовпці x..x+s-1 (у доповнених координатах +1)
+        return p[2:n + 2, 1 + s:n + 2] - p[1:n + 1, 1 + s:n + 2] - p[2:n + 2, 1:n - s + 2] + p[1:n + 1, 1:n - s + 2]
+
+    def halo(p):
+        # Сума по кораблю разом із сусідами: рядки y-1..y+1, стовпці x-1..x+s
+        return p[3:n + 3, s + 2:n + 3] - p[0:n, s + 2:n + 3] - p[3:n + 3, 0:n - s + 1] + p[0:n, 0:n - s + 1]
+
+    hits_inside = window(ph)
+    valid = (window(pb) == 0) & (halo(ph) == hits_inside)
+    weights = np.where(valid, 1 + TARGET_WEIGHT * hits_inside, 0)
+
+    # Клітинку x покривають вікна, що починаються в x-s+1..x
+    padded = np.pad(weights, ((0, 0), (s - 1, s - 1)))
+    cumulative = np.zeros((n, padded.shape[1] + 1), dtype=np.int64)
+    cumulative[:, 1:] = padded.cumsum(axis=1)
+    return cumulative[:, s:s + n] - cumulative[:, 0:n]
+
+
+def _density_numpy(observation: Observation):
+    size = observation.size
+    blocked = _mask_to_array(observation.blocked, size)
+    hits = _mask_to_array(observation.open_hits, size)
+    unknown = _mask_to_array(observation.unknown, size)
+
+    density = np.zeros((size, size), dtype=np.int64)
+    for ship_size, multiplier in observation.remaining.items():
+        coverage = _horizontal_coverage(blocked, hits, ship_size)
+        if ship_size > 1:
+            coverage = coverage + _horizontal_coverage(blocked.T, hits.T, ship_size).T
+        density += multiplier * coverage
+    return np.where(unknown, density, 0)
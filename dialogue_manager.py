@@ -6,8 +6,9 @@ from typing import Optional
 class DialogueManager:
     """Менеджер діалогів для AI-робота в грі морський бій"""
 
-    def __init__(self, difficulty: str = "easy"):
+    def __init__(self, difficulty: str = "easy", rng: random.Random = None):
         self.difficulty = difficulty
+        self.rng = rng or random
         self.robot_name = "AI-Адмірал" if difficulty == "hard" else "AI-Капітан"
 
         # Бази діалогів для різних подій
@@ -149,7 +150,7 @@ class DialogueManager:
     def get_dialogue(self, event: str) -> Optional[str]:
         """Повертає випадковий діалог для події"""
         if event in self.dialogues:
-            return random.choice(self.dialogues[event])
+            return self.rng.choice(self.dialogues[event])
         return None
 
     def get_emotion_for_event(self, event: str) -> str:
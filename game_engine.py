@@ -0,0 +1,424 @@
+import random
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from Board import Board, CellState, Orientation, Ship
+from ai_controllers import ControllerFactory, IAIController, difficulty_factory
+from rng import GameRNG
+
+PLAYER = "player"
+COMPUTER = "computer"
+
+# Стандартні флоти для полів гри
+SHIP_CONFIGURATIONS: Dict[int, List[int]] = {
+    # Маленьке поле: 1 крейсер (3), 1 есмінець (2), 3 катери (1)
+    6: [3, 2, 1, 1, 1],
+    # Нормальне поле (класика): 1 лінкор (4), 2 крейсери (3), 3 есмінці (2), 4 катери (1)
+    10: [4, 3, 3, 2, 2, 2, 1, 1, 1, 1],
+    # Велике поле: 1 авіаносець (5), 2 лінкори (4), 3 крейсери (3), 4 есмінці (2), 5 катерів (1)
+    14: [5, 4, 4, 3, 3, 3, 2, 2, 2, 2, 1, 1, 1, 1, 1],
+}
+
+
+def ship_configuration(board_size: int) -> List[int]:
+    """Флот для поля board_size x board_size.
+
+    Для 6/10/14 — стандартні флоти гри; для інших розмірів береться
+    найближчий менший стандартний флот, повторений пропорційно площі поля."""
+    if board_size in SHIP_CONFIGURATIONS:
+        return list(SHIP_CONFIGURATIONS[board_size])
+    base = max((size for size in SHIP_CONFIGURATIONS if size <= board_size), default=min(SHIP_CONFIGURATIONS))
+    copies = max(1, (board_size * board_size) // (base * base))
+    return sorted(SHIP_CONFIGURATIONS[base] * copies, reverse=True)
+
+
+class GameEvent(NamedTuple):
+    """Подія гри, яку отримують підписники рушія (GUI, логери, симулятори).
+
+    kind: "start", "shot", "rocket", "kraken", "turn" або "game_over".
+    actor — хто діяв ("player", "computer", "kraken"; для "turn" — чий
+    тепер хід, для "game_over" — переможець), target — чиє поле атаковано.
+    cells — відкриті клітинки (x, y, hit) для ракети або кракена, size —
+    радіус ракети або розмір області атаки кракена."""
+    kind: str
+    actor: Optional[str] = None
+    target: Optional[str] = None
+    x: int = -1
+    y: int = -1
+    hit: bool = False
+    sunk: bool = False
+    ship: Optional[Ship] = None
+    cells: Tuple[Tuple[int, int, bool], ...] = ()
+    sunk_ships: Tuple[Ship, ...] = ()
+    size: int = 0
+
+
+def strike_area(board: Board, cells) -> Tuple[Tuple[Tuple[int, int, bool], ...], Tuple[Ship, ...]]:
+    """Атакує всі ще не відкриті клітинки області в межах поля.
+
+    Повертає відкриті клітинки (x, y, hit) і потоплені цим ударом кораблі."""
+    opened = []
+    sunk_ships = []
+    for x, y in cells:
+        if 0 <= x < board.size and 0 <= y < board.size and not board.revealed[y][x]:
+            hit, sunk, ship = board.attack(x, y)
+            board.revealed[y][x] = True
+            opened.append((x, y, hit))
+            if sunk and ship is not None:
+                sunk_ships.append(ship)
+    return tuple(opened), tuple(sunk_ships)
+
+
+class RocketRules:
+    """Правила ракет без графіки: ліміти, радіус вибуху та рішення AI про кидок."""
+
+    DEFAULT_LIMITS = {6: 2, 10: 3, 14: 4}
+    AI_RANDOM_THROW_CHANCE = 0.15   # шанс кинути випадкову ракету, якщо своїх немає
+    AI_PLACED_THROW_CHANCE = 0.25   # шанс використати розставлену ракету
+
+    def __init__(self, board_size: int, limits: Dict[int, int] = None):
+        self.board_size = board_size
+        self.limits = limits if limits else self.DEFAULT_LIMITS
+        self.limit = self.limits.get(board_size, 3)
+        # radius=0 => 1x1; radius=1 => 3x3
+        self.radius = 0 if board_size == 6 else 1
+        self.player_used = 0
+        self.computer_rockets: Set[Tuple[int, int]] = set()
+
+    def reset(self):
+        self.player_used = 0
+        self.computer_rockets.clear()
+
+    def player_remaining(self) -> int:
+        return max(0, self.limit - self.player_used)
+
+    def blast_cells(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Клітинки в зоні вибуху з центром (x, y), що потрапляють на поле."""
+        return [
+            (x + dx, y + dy)
+            for dy in range(-self.radius, self.radius + 1)
+            for dx in range(-self.radius, self.radius + 1)
+            if 0 <= x + dx < self.board_size and 0 <= y + dy < self.board_size
+        ]
+
+    def place_computer_rockets(self, board: Board, rng: random.Random = None):
+        """Розставляє приховані ракети комп'ютера на порожні клітинки його поля."""
+        rng = rng or random
+        attempts = 0
+        while len(self.computer_rockets) < self.limit and attempts < 5000:
+            x = rng.randint(0, self.board_size - 1)
+            y = rng.randint(0, self.board_size - 1)
+            if board.grid[y][x] == CellState.EMPTY:
+                self.computer_rockets.add((x, y))
+            attempts += 1
+
+    def choose_ai_throw(self, rng: random.Random = None) -> Optional[Tuple[int, int]]:
+        """Чи кидає комп'ютер ракету цього ходу і куди; None — не кидає."""
+        rng = rng or random
+        if not self.computer_rockets:
+            # Без розставлених ракет комп'ютер інколи кидає випадкову
+            if rng.random() > self.AI_RANDOM_THROW_CHANCE:
+                return None
+            return rng.randint(0, self.board_size - 1), rng.randint(0, self.board_size - 1)
+
+        if rng.random() > self.AI_PLACED_THROW_CHANCE:
+            return None
+        target = rng.choice(tuple(self.computer_rockets))
+        self.computer_rockets.discard(target)
+        return target
+
+    def choose_player_ai_throw(self, rng: random.Random = None) -> Optional[Tuple[int, int]]:
+        """Кидок ракети гравцем, яким керує AI (самогра): витрачає ракети з ліміту гравця."""
+        rng = rng or random
+        if self.player_remaining() <= 0 or rng.random() > self.AI_PLACED_THROW_CHANCE:
+            return None
+        self.player_used += 1
+        return rng.randint(0, self.board_size - 1), rng.randint(0, self.board_size - 1)
+
+
+class KrakenRules:
+    """Правила атак кракена: лише на полях від 10x10, на великих — областю 3x3."""
+
+    def __init__(self, board_size: int):
+        self.board_size = board_size
+        self.active = board_size >= 10
+        self.attack_size = 3 if board_size >= 14 else 1
+
+    def choose_target(self, rng: random.Random = None) -> Tuple[str, int, int]:
+        """Випадкове поле та лівий верхній кут області атаки."""
+        rng = rng or random
+        target = rng.choice([PLAYER, COMPUTER])
+        max_coord = self.board_size - self.attack_size
+        return target, rng.randint(0, max_coord), rng.randint(0, max_coord)
+
+    def attack_cells(self, x: int, y: int) -> List[Tuple[int, int]]:
+        return [
+            (x + dx, y + dy)
+            for dx in range(self.attack_size)
+            for dy in range(self.attack_size)
+            if 0 <= x + dx < self.board_size and 0 <= y + dy < self.board_size
+        ]
+
+
+class GameEngine:
+    """Ігрова логіка морського бою без tkinter.
+
+    Володіє обома полями, AI-контролером комп'ютера, правилами ракет і
+    кракена та рахунком. Гра просувається явними викликами player_attack /
+    player_rocket (хід гравця), step() (хід AI) і kraken_attack(); про кожну
+    зміну стану підписники дізнаються через GameEvent. Жодних таймерів —
+    затримки між ходами вирішує той, хто викликає рушій.
+
+    Якщо задано player_ai_factory, за гравця теж грає AI (самогра, турніри),
+    і step() виконує хід тієї сторони, чия черга.
+
+    Уся випадковість партії походить з rng (GameRNG): кожне поле, кожен AI,
+    ракети й кракен мають свій потік rng.split(...), тож партія точно
+    відтворюється за rng.seed_value."""
+
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: List[int],
+        difficulty: str = "easy",
+        ai_factory: ControllerFactory = None,
+        player_ai_factory: ControllerFactory = None,
+        rockets_enabled: bool = True,
+        rocket_limits: Dict[int, int] = None,
+        kraken_enabled: bool = True,
+        rng: GameRNG = None,
+    ):
+        self.board_size = board_size
+        self.ship_sizes = ship_sizes
+        self.difficulty = difficulty
+        # Без явної фабрики AI комп'ютера визначається складністю (ai_controllers.DIFFICULTIES)
+        self.ai_factory = ai_factory or difficulty_factory(difficulty)
+        self.player_ai_factory = player_ai_factory
+        self.rng = rng if rng is not None else GameRNG()
+        self.rockets_rng = self.rng.split("rockets")
+        self.kraken_rng = self.rng.split("kraken")
+
+        self.rockets = RocketRules(board_size, rocket_limits) if rockets_enabled else None
+        self.kraken = KrakenRules(board_size) if kraken_enabled else None
+
+        self._subscribers: List[Callable[[GameEvent], None]] = []
+        self.ai_controller: Optional[IAIController] = None
+        self.player_controller: Optional[IAIController] = None
+        self.reset()
+
+    # ------------------------------------------------------------------ #
+    # Підписки
+    # ------------------------------------------------------------------ #
+    def subscribe(self, callback: Callable[[GameEvent], None]) -> Callable[[GameEvent], None]:
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[GameEvent], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _emit(self, event: GameEvent) -> GameEvent:
+        for callback in list(self._subscribers):
+            callback(event)
+        return event
+
+    # ------------------------------------------------------------------ #
+    # Підготовка
+    # ------------------------------------------------------------------ #
+    def reset(self):
+        """Нові порожні поля, обнулений рахунок і фаза розміщення."""
+        self.close()
+        self.player_board = Board(self.board_size, self.ship_sizes)
+        self.computer_board = Board(self.board_size, self.ship_sizes)
+        self.phase = "setup"   # setup (розміщення), playing (гра), ended (завершено)
+        self.turn = PLAYER
+        self.winner: Optional[str] = None
+
+        self.player_score = 0      # Влучання гравця
+        self.computer_score = 0    # Влучання комп'ютера
+        self.player_shots = 0      # Всього пострілів гравця
+        self.computer_shots = 0    # Всього пострілів комп'ютера
+
+        if self.rockets:
+            self.rockets.reset()
+
+    def place_player_ship(self, size: int, x: int, y: int, orientation: Orientation) -> bool:
+        if self.phase != "setup":
+            return False
+        return self.player_board.place_ship(size, x, y, orientation)
+
+    def place_player_ships_randomly(self):
+        """Розставляє весь флот гравця заново у випадкових позиціях."""
+        if self.phase != "setup":
+            return
+        self.player_board = Board(self.board_size, self.ship_sizes)
+        self.player_board.place_ships_randomly(self.rng.split("player_fleet"))
+
+    def start(self):
+        """Розставляє флот і ракети комп'ютера та починає гру з ходу гравця."""
+        if self.phase != "setup":
+            return
+        self.computer_board.place_ships_randomly(self.rng.split("computer_fleet"))
+        if self.rockets:
+            self.rockets.place_computer_rockets(self.computer_board, self.rockets_rng)
+
+        self.ai_controller = self.ai_factory(self.player_board, rng=self.rng.split("computer_ai"))
+        self.ai_controller.warm_up()
+        if self.player_ai_factory is not None:
+            self.player_controller = self.player_ai_factory(self.computer_board, rng=self.rng.split("player_ai"))
+            self.player_controller.warm_up()
+
+        self.phase = "playing"
+        self.turn = PLAYER
+        self._emit(GameEvent("start", actor=PLAYER))
+        self._emit(GameEvent("turn", actor=PLAYER))
+
+    def close(self):
+        """Звільняє ресурси AI-контролерів (наприклад, пул процесів)."""
+        if self.ai_controller is not None:
+            self.ai_controller.close()
+            self.ai_controller = None
+        if self.player_controller is not None:
+            self.player_controller.close()
+            self.player_controller = None
+
+    def board_for(self, name: str) -> Board:
+        return self.player_board if name == PLAYER else self.computer_board
+
+    # ------------------------------------------------------------------ #
+    # Ходи
+    # ------------------------------------------------------------------ #
+    def player_attack(self, x: int, y: int) -> Optional[GameEvent]:
+        """Звичайний постріл гравця; None, якщо зараз не можна стріляти в (x, y)."""
+        if self.phase != "playing" or self.turn != PLAYER:
+            return None
+        if not (0 <= x < self.board_size and 0 <= y < self.board_size):
+            return None
+        if self.computer_board.revealed[y][x]:
+            return None
+
+        self.player_shots += 1
+        hit, sunk, ship = self.computer_board.attack(x, y)
+        if hit:
+            self.player_score += 1
+        event = self._emit(GameEvent("shot", PLAYER, COMPUTER, x, y, hit, sunk, ship))
+        self._finish_action(keep_turn=hit)
+        return event
+
+    def player_rocket(self, x: int, y: int) -> Optional[GameEvent]:
+        """Кидок ракети гравцем по полю комп'ютера; хід зберігається при влучанні."""
+        if self.phase != "playing" or self.turn != PLAYER:
+            return None
+        if not self.rockets or self.rockets.player_remaining() <= 0:
+            return None
+
+        self.rockets.player_used += 1
+        event = self._rocket(PLAYER, COMPUTER, x, y)
+        self._finish_action(keep_turn=event.hit)
+        return event
+
+    def _turn_controller(self) -> Tuple[Optional[IAIController], Optional[str]]:
+        """AI сторони, чия черга, і поле, по якому він стріляє (None, якщо ходить людина)."""
+        if self.turn == COMPUTER:
+            return self.ai_controller, PLAYER
+        if self.player_controller is not None:
+            return self.player_controller, COMPUTER
+        return None, None
+
+    def prepare_step(self):
+        """Дозволяє AI почати рахувати хід у фоні; step() варто викликати, коли step_ready()."""
+        controller, _ = self._turn_controller()
+        if self.phase == "playing" and controller is not None:
+            controller.prepare_attack()
+
+    def step_ready(self) -> bool:
+        """Чи виконається step() без очікування на фонові обчислення AI."""
+        controller, _ = self._turn_controller()
+        return controller is None or controller.attack_ready()
+
+    def step(self) -> List[GameEvent]:
+        """Хід AI: постріл і можливий кидок ракети.
+
+        Ходить комп'ютер, а в самогрі — та сторона, чия черга. Сторона ходить
+        знову, якщо влучила або кинула ракету. Повертає події цього ходу
+        (порожній список, якщо зараз не черга AI)."""
+        if self.phase != "playing":
+            return []
+        controller, target = self._turn_controller()
+        if controller is None:
+            return []
+
+        actor = self.turn
+        board = self.board_for(target)
+        events = []
+        x, y = controller.perform_attack()
+        if x is None or y is None:
+            return events
+
+        hit, sunk, ship = board.attack(x, y)
+        controller.register_result(x, y, hit, sunk)
+        if actor == COMPUTER:
+            self.computer_shots += 1
+            self.computer_score += int(hit)
+        else:
+            self.player_shots += 1
+            self.player_score += int(hit)
+        events.append(self._emit(GameEvent("shot", actor, target, x, y, hit, sunk, ship)))
+
+        thrown = False
+        if self.rockets and not board.all_ships_sunk():
+            if actor == COMPUTER:
+                rocket_target = self.rockets.choose_ai_throw(self.rockets_rng)
+            else:
+                rocket_target = self.rockets.choose_player_ai_throw(self.rockets_rng)
+            if rocket_target is not None:
+                thrown = True
+                events.append(self._rocket(actor, target, *rocket_target))
+
+        self._finish_action(keep_turn=hit or thrown)
+        return events
+
+    def kraken_attack(self, target: str = None, x: int = None, y: int = None) -> Optional[GameEvent]:
+        """Атака кракена; без аргументів ціль обирається за KrakenRules."""
+        if self.phase != "playing" or not self.kraken or not self.kraken.active:
+            return None
+        if target is None or x is None or y is None:
+            target, x, y = self.kraken.choose_target(self.kraken_rng)
+
+        cells, sunk_ships = strike_area(self.board_for(target), self.kraken.attack_cells(x, y))
+        event = self._emit(GameEvent(
+            "kraken", "kraken", target, x, y,
+            hit=any(hit for _, _, hit in cells), sunk=bool(sunk_ships),
+            cells=cells, sunk_ships=sunk_ships, size=self.kraken.attack_size,
+        ))
+        self._check_game_over()
+        return event
+
+    def _rocket(self, actor: str, target: str, x: int, y: int) -> GameEvent:
+        cells, sunk_ships = strike_area(self.board_for(target), self.rockets.blast_cells(x, y))
+        return self._emit(GameEvent(
+            "rocket", actor, target, x, y,
+            hit=any(hit for _, _, hit in cells), sunk=bool(sunk_ships),
+            cells=cells, sunk_ships=sunk_ships, size=self.rockets.radius,
+        ))
+
+    def _finish_action(self, keep_turn: bool):
+        if self._check_game_over():
+            return
+        if not keep_turn:
+            self.turn = COMPUTER if self.turn == PLAYER else PLAYER
+        self._emit(GameEvent("turn", actor=self.turn))
+
+    def _check_game_over(self) -> bool:
+        if self.phase != "playing":
+            return self.phase == "ended"
+        if self.player_board.all_ships_sunk():
+            winner = COMPUTER
+        elif self.computer_board.all_ships_sunk():
+            winner = PLAYER
+        else:
+            return False
+        self.phase = "ended"
+        self.winner = winner
+        self.close()
+        self._emit(GameEvent("game_over", actor=winner))
+        return True
@@ -3,12 +3,17 @@ import math
 import random
 import tkinter as tk
 
+from animation_clock import get_clock
+from scene import RetainedScene
+from timers import TimerRegistry
+
 
 class HumanAvatar:
     """Анімований аватар гравця - морський капітан."""
 
-    def __init__(self, parent_frame: tk.Frame):
+    def __init__(self, parent_frame: tk.Frame, rng: random.Random = None):
         self.parent_frame = parent_frame
+        self.rng = rng or random
         self.active = True
         self.animation_phase = 0
         self.current_emotion = "confident"  # confident, happy, worried, determined, victorious
@@ -26,6 +31,8 @@ class HumanAvatar:
             highlightthickness=0,
         )
         self.canvas.pack(expand=True, pady=5)
+        # Елементи персонажа створюються один раз і лише оновлюються
+        self.scene = RetainedScene(self.canvas)
 
         # Колірна палітра
         self.palette = {
@@ -45,10 +52,12 @@ class HumanAvatar:
             "text": "#ffffff",
         }
 
-        self._blink_timer = random.randint(60, 100)
+        self._blink_timer = self.rng.randint(60, 100)
         self._blink_frames_remaining = 0
         self._blink_frames_total = 4
         self._idle_job = None
+        self.timers = TimerRegistry(parent_frame, "human_avatar")
+        self._hide_job = None
 
         # Текст діалогу
         self.dialogue_text = ""
@@ -61,8 +70,11 @@ class HumanAvatar:
         # Коефіцієнт масштабування
         self.scale = 0.64
 
-        # Запускаємо анімацію
+        # Запускаємо анімацію: кадри дає спільний годинник вікна
         self.animate_idle()
+        self._idle_job = get_clock(parent_frame).subscribe(
+            lambda dt: self.animate_idle(), interval_ms=80, name="human_avatar"
+        )
 
     def set_emotion(self, emotion: str):
         """Встановлює емоцію: confident, happy, worried, determined, victorious"""
@@ -72,8 +84,11 @@ class HumanAvatar:
         """Показує діалог на певний час"""
         self.dialogue_text = text
         self.dialogue_visible = True
+        # Новий діалог скасовує таймер попереднього, щоб той не сховав його раніше
+        self.timers.cancel(self._hide_job)
+        self._hide_job = None
         if duration > 0:
-            self.parent_frame.after(duration, self.hide_dialogue)
+            self._hide_job = self.timers.after(duration, self.hide_dialogue)
 
     def hide_dialogue(self):
         """Ховає діалог"""
@@ -96,7 +111,7 @@ class HumanAvatar:
             eye_state = "half" if frame_index in (0, self._blink_frames_total - 1) else "closed"
             self._blink_frames_remaining -= 1
             if self._blink_frames_remaining == 0:
-                self._blink_timer = random.randint(60, 100)
+                self._blink_timer = self.rng.randint(60, 100)
         else:
             if self._blink_timer <= 0:
                 self._blink_frames_remaining = self._blink_frames_total
@@ -106,28 +121,30 @@ class HumanAvatar:
                 eye_state = "open"
 
         self._draw_captain(body_offset, eye_state)
-        self._idle_job = self.parent_frame.after(80, self.animate_idle)
 
     def _draw_captain(self, body_offset: float, eye_state: str):
         """Малює капітана"""
-        self.canvas.delete("all")
+        self.scene.begin("background")
         p = self.palette
 
         # Фон
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             0, 0, self.canvas_width, self.canvas_height,
             fill=p["background"], outline=""
         )
 
+        # Покачування — зсув усього шару одним canvas.move
+        self.scene.begin("body", dy=body_offset)
+
         # Позиція
-        body_y = self.center_y + body_offset
+        body_y = self.center_y
 
         # Тіло (уніформа)
         body_width = int(100 * self.scale)
         body_height = int(140 * self.scale)
 
         # Торс
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x - body_width//2,
             body_y - body_height//2,
             self.center_x + body_width//2,
@@ -143,7 +160,7 @@ class HumanAvatar:
         shoulder_y = body_y - body_height//2 + int(15 * self.scale)
 
         for x_offset in [-body_width//2 + int(10 * self.scale), body_width//2 - int(10 * self.scale)]:
-            self.canvas.create_rectangle(
+            self.scene.create_rectangle(
                 self.center_x + x_offset - epaulet_width//2,
                 shoulder_y,
                 self.center_x + x_offset + epaulet_width//2,
@@ -156,7 +173,7 @@ class HumanAvatar:
         button_positions = [0, int(25 * self.scale), int(50 * self.scale)]
         button_radius = int(4 * self.scale)
         for offset_y in button_positions:
-            self.canvas.create_oval(
+            self.scene.create_oval(
                 self.center_x - button_radius,
                 body_y - int(30 * self.scale) + offset_y - button_radius,
                 self.center_x + button_radius,
@@ -170,7 +187,7 @@ class HumanAvatar:
         head_radius = int(35 * self.scale)
 
         # Обличчя (коло)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - head_radius,
             head_y - head_radius,
             self.center_x + head_radius,
@@ -186,7 +203,7 @@ class HumanAvatar:
         hat_top_y = head_y - head_radius - int(5 * self.scale)
 
         # Поля капелюха
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - hat_width//2,
             hat_top_y - int(8 * self.scale),
             self.center_x + hat_width//2,
@@ -196,7 +213,7 @@ class HumanAvatar:
         )
 
         # Верх капелюха
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             self.center_x - int(30 * self.scale),
             hat_top_y - hat_height,
             self.center_x + int(30 * self.scale),
@@ -206,7 +223,7 @@ class HumanAvatar:
         )
 
         # Золота кокарда на капелюсі
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - int(8 * self.scale),
             hat_top_y - int(15 * self.scale),
             self.center_x + int(8 * self.scale),
@@ -222,7 +239,7 @@ class HumanAvatar:
         nose_y = head_y + int(5 * self.scale)
         nose_width = int(8 * self.scale)
         nose_height = int(12 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - nose_width//2,
             nose_y - nose_height//2,
             self.center_x + nose_width//2,
@@ -242,7 +259,7 @@ class HumanAvatar:
         # Вуса
         mustache_width = int(25 * self.scale)
         mustache_y = head_y + int(15 * self.scale)
-        self.canvas.create_arc(
+        self.scene.create_arc(
             self.center_x - mustache_width,
             mustache_y - int(8 * self.scale),
             self.center_x,
@@ -253,7 +270,7 @@ class HumanAvatar:
             outline=p["beard"],
             style=tk.CHORD
         )
-        self.canvas.create_arc(
+        self.scene.create_arc(
             self.center_x,
             mustache_y - int(8 * self.scale),
             self.center_x + mustache_width,
@@ -266,7 +283,7 @@ class HumanAvatar:
         )
 
         # Невелика борідка
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - int(10 * self.scale),
             beard_y,
             self.center_x + int(10 * self.scale),
@@ -276,7 +293,7 @@ class HumanAvatar:
         )
 
         # Ранг (зірки на уніформі)
-        self.canvas.create_text(
+        self.scene.create_text(
             self.center_x,
             body_y + body_height//2 + int(25 * self.scale),
             text="⭐ КАПІТАН ⭐",
@@ -284,9 +301,11 @@ class HumanAvatar:
             fill=p["gold"]
         )
 
-        # Діалог
-        if self.dialogue_visible and self.dialogue_text:
+        # Діалог: хмаринка перемальовується лише при зміні тексту
+        visible_text = self.dialogue_text if self.dialogue_visible else None
+        if self.scene.begin("bubble", key=visible_text) and visible_text:
             self._draw_dialogue_bubble()
+        self.scene.end()
 
     def _draw_eyes(self, head_y: float, eye_state: str):
         """Малює очі"""
@@ -300,7 +319,7 @@ class HumanAvatar:
         if eye_state == "closed":
             # Закриті очі
             for x_offset in [-eye_spacing, eye_spacing]:
-                self.canvas.create_line(
+                self.scene.create_line(
                     self.center_x + x_offset - eye_width,
                     eye_y,
                     self.center_x + x_offset + eye_width,
@@ -312,7 +331,7 @@ class HumanAvatar:
         elif eye_state == "half":
             # Напіввідкриті
             for x_offset in [-eye_spacing, eye_spacing]:
-                self.canvas.create_rectangle(
+                self.scene.create_rectangle(
                     self.center_x + x_offset - eye_width//2,
                     eye_y - eye_height//4,
                     self.center_x + x_offset + eye_width//2,
@@ -324,7 +343,7 @@ class HumanAvatar:
             # Відкриті очі
             for x_offset in [-eye_spacing, eye_spacing]:
                 # Біле очей
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - eye_width//2,
                     eye_y - eye_height//2,
                     self.center_x + x_offset + eye_width//2,
@@ -334,7 +353,7 @@ class HumanAvatar:
                 )
                 # Райдужка
                 pupil_size = int(6 * self.scale)
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - pupil_size//2,
                     eye_y - pupil_size//2,
                     self.center_x + x_offset + pupil_size//2,
@@ -344,7 +363,7 @@ class HumanAvatar:
                 )
                 # Зіниця
                 pupil_mini = int(3 * self.scale)
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - pupil_mini//2,
                     eye_y - pupil_mini//2,
                     self.center_x + x_offset + pupil_mini//2,
@@ -354,7 +373,7 @@ class HumanAvatar:
                 )
                 # Відблиск
                 highlight = int(2 * self.scale)
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - pupil_mini//2 - highlight,
                     eye_y - pupil_mini//2 - highlight,
                     self.center_x + x_offset - pupil_mini//2,
@@ -371,7 +390,7 @@ class HumanAvatar:
 
         if self.current_emotion in ("happy", "victorious"):
             # Усміхнений рот (дуга вгору)
-            self.canvas.create_arc(
+            self.scene.create_arc(
                 self.center_x - mouth_width,
                 mouth_y - int(10 * self.scale),
                 self.center_x + mouth_width,
@@ -384,7 +403,7 @@ class HumanAvatar:
             )
         elif self.current_emotion == "worried":
             # Засмучений рот (дуга вниз)
-            self.canvas.create_arc(
+            self.scene.create_arc(
                 self.center_x - mouth_width,
                 mouth_y - int(5 * self.scale),
                 self.center_x + mouth_width,
@@ -397,7 +416,7 @@ class HumanAvatar:
             )
         elif self.current_emotion == "determined":
             # Рішучий рот (пряма лінія)
-            self.canvas.create_line(
+            self.scene.create_line(
                 self.center_x - mouth_width,
                 mouth_y,
                 self.center_x + mouth_width,
@@ -407,7 +426,7 @@ class HumanAvatar:
             )
         else:
             # Нейтральний (невелика усмішка)
-            self.canvas.create_arc(
+            self.scene.create_arc(
                 self.center_x - mouth_width,
                 mouth_y - int(8 * self.scale),
                 self.center_x + mouth_width,
@@ -427,7 +446,7 @@ class HumanAvatar:
         bubble_height = int(50 * self.scale)
 
         # Фон вікна
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             bubble_x,
             bubble_y,
             bubble_x + bubble_width,
@@ -439,7 +458,7 @@ class HumanAvatar:
 
         # Трикутник (хвостик)
         tail_size = int(10 * self.scale)
-        self.canvas.create_polygon(
+        self.scene.create_polygon(
             self.center_x - tail_size,
             bubble_y + bubble_height,
             self.center_x + tail_size,
@@ -452,7 +471,7 @@ class HumanAvatar:
         )
 
         # Текст
-        self.canvas.create_text(
+        self.scene.create_text(
             bubble_x + bubble_width//2,
             bubble_y + bubble_height//2,
             text=self.dialogue_text,
@@ -465,10 +484,8 @@ class HumanAvatar:
         """Знищує аватар"""
         self.active = False
         if self._idle_job is not None:
-            try:
-                self.parent_frame.after_cancel(self._idle_job)
-            except tk.TclError:
-                pass
+            self._idle_job.cancel()
             self._idle_job = None
+        self.timers.cancel_all()
         if hasattr(self, "canvas") and self.canvas:
             self.canvas.destroy()
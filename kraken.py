@@ -3,13 +3,80 @@ import random
 import tkinter as tk
 from typing import TYPE_CHECKING
 
+from animation_clock import get_clock
+from timers import TimerRegistry
+
 if TYPE_CHECKING:
     from battleship import Board
 
+# Tentacle items survive between frames; everything else is redrawn
+TENTACLE_TAG = "kraken_tentacle"
+_STALE_TAG = "kraken_stale"
+# The attack countdown advances one step per clock call
+ATTACK_TICK_MS = 100
+
+
+class TentacleKeyframes:
+    """Per-phase tentacle sway, computed once and shared by krakens of a board size.
+
+    animation_phase wraps at PHASES, so every frame is one of PHASES
+    keyframes. A keyframe stores each point and cup with its sway and lift
+    at amplitude 1; any tentacle_wave is then a multiply-add away, with no
+    trigonometry on the idle tick. Keyframes are filled lazily on first use.
+    """
+
+    PHASES = 1024
+
+    def __init__(self, tentacles: list, offsets: list):
+        self.tentacles = tentacles
+        self.offsets = offsets
+        self._frames: list = [None] * self.PHASES
+        self.computed = 0
+
+    def frame(self, phase: float) -> tuple:
+        """Per tentacle: ((px, py, sway, lift) per point, (cx, cy, sway, lift) per cup)."""
+        if isinstance(phase, int) and 0 <= phase < self.PHASES:
+            frame = self._frames[phase]
+            if frame is None:
+                frame = self._frames[phase] = self._compute(phase)
+            return frame
+        return self._compute(phase)
+
+    def _compute(self, phase: float) -> tuple:
+        self.computed += 1
+        frame = []
+        for idx, tentacle in enumerate(self.tentacles):
+            offset = self.offsets[idx]
+            base_points = tentacle["points"]
+            last = len(base_points) - 1
+            points = []
+            for point_idx, (px, py) in enumerate(base_points):
+                progress = point_idx / last if last > 0 else 0
+                phase_value = phase * 0.08 + progress * 2.3 + offset
+                points.append(
+                    (
+                        px,
+                        py,
+                        math.sin(phase_value) * (1 - progress * 0.25),
+                        math.cos(phase_value) * 0.35,
+                    )
+                )
+            cups = []
+            for cup_x, cup_y in tentacle["cups"]:
+                phase_value = phase * 0.08 + cup_y * 0.03 + offset
+                cups.append(
+                    (cup_x, cup_y, math.sin(phase_value) * 0.3, math.cos(phase_value) * 0.28)
+                )
+            frame.append((tuple(points), tuple(cups)))
+        return tuple(frame)
+
 
 class Kraken:
     """Animated kraken companion that attacks both boards."""
 
+    # board_size -> keyframes shared by every kraken on that board size
+    _keyframes: dict = {}
+
     def __init__(
         self,
         parent_frame: tk.Frame,
@@ -20,8 +87,15 @@ class Kraken:
         player_canvas: tk.Canvas | None = None,
         computer_canvas: tk.Canvas | None = None,
         cell_size: int | None = None,
+        engine=None,
+        rng: random.Random | None = None,
     ):
         self.parent_frame = parent_frame
+        self.rng = rng or random
+        # Every after() of the kraken goes through here and is cancelled on destroy
+        self.timers = TimerRegistry(parent_frame, "kraken")
+        # When a GameEngine is given, targets and damage follow its KrakenRules
+        self.engine = engine
         self.board_size = board_size
         self.player_board = player_board
         self.computer_board = computer_board
@@ -136,15 +210,21 @@ class Kraken:
                 "cups": [(-20, 60), (-16, 82)],
             },
         ]
-        self.tentacle_phase_offsets = [
-            random.uniform(0, 2 * math.pi) for _ in range(len(self.tentacles))
-        ]
-
-        self._blink_timer = random.randint(55, 90)
+        self.keyframes = self._keyframes.get(board_size)
+        if self.keyframes is None:
+            offsets = [self.rng.uniform(0, 2 * math.pi) for _ in range(len(self.tentacles))]
+            self.keyframes = self._keyframes[board_size] = TentacleKeyframes(self.tentacles, offsets)
+        self.tentacle_phase_offsets = self.keyframes.offsets
+        # Per tentacle: (outline line, fill line, [(cup, cup highlight), ...])
+        self._tentacle_items: list | None = None
+
+        self._blink_timer = self.rng.randint(55, 90)
         self._blink_frames_total = 4
         self._blink_frames_remaining = 0
         self._idle_job = None
         self._spawn_job = None
+        self._attack_job = None
+        self._attack_countdown = 0
 
         self.spawn_animation()
         self.schedule_next_attack()
@@ -155,17 +235,12 @@ class Kraken:
     def spawn_animation(self):
         if not self.active:
             return
-        self.canvas.delete("all")
         self.draw_bubbles()
         self.spawn_progress = 0
         self.spawn_steps = 14
 
-        if self._spawn_job is not None:
-            try:
-                self.parent_frame.after_cancel(self._spawn_job)
-            except tk.TclError:
-                pass
-        self._spawn_job = self.parent_frame.after(550, self._spawn_step)
+        self.timers.cancel(self._spawn_job)
+        self._spawn_job = self.timers.after(550, self._spawn_step)
 
     def _spawn_step(self):
         if not self.active:
@@ -173,6 +248,11 @@ class Kraken:
         if self.spawn_progress >= self.spawn_steps:
             self._spawn_job = None
             self.animate_idle()
+            # Idle frames come from the window's shared animation clock
+            if self._idle_job is None:
+                self._idle_job = get_clock(self.parent_frame).subscribe(
+                    lambda dt: self.animate_idle(), interval_ms=90, name="kraken"
+                )
             return
 
         progress = (self.spawn_progress + 1) / self.spawn_steps
@@ -189,10 +269,11 @@ class Kraken:
         )
         self.spawn_progress += 1
         delay = 160 if progress > 0.7 else 120
-        self._spawn_job = self.parent_frame.after(delay, self._spawn_step)
+        self._spawn_job = self.timers.after(delay, self._spawn_step)
 
     def draw_bubbles(self):
         self.canvas.delete("all")
+        self._tentacle_items = None
         self.canvas.create_rectangle(
             0,
             0,
@@ -202,9 +283,9 @@ class Kraken:
             fill=self.palette["background"],
         )
         for _ in range(30):
-            size = random.randint(6, 16)
-            x = random.randint(18, self.canvas_width - 18 - size)
-            y = random.randint(24, self.canvas_height - 70 - size)
+            size = self.rng.randint(6, 16)
+            x = self.rng.randint(18, self.canvas_width - 18 - size)
+            y = self.rng.randint(24, self.canvas_height - 70 - size)
             self.canvas.create_oval(
                 x,
                 y,
@@ -278,7 +359,7 @@ class Kraken:
             )
             self._blink_frames_remaining -= 1
             if self._blink_frames_remaining == 0:
-                self._blink_timer = random.randint(55, 95)
+                self._blink_timer = self.rng.randint(55, 95)
         else:
             if self._blink_timer <= 0:
                 self._blink_frames_remaining = self._blink_frames_total
@@ -294,7 +375,6 @@ class Kraken:
             eye_state=eye_state,
             glow_strength=0.0,
         )
-        self._idle_job = self.parent_frame.after(90, self.animate_idle)
 
     # ------------------------------------------------------------------ #
     # Attack animation
@@ -302,17 +382,41 @@ class Kraken:
     def schedule_next_attack(self):
         if not self.active:
             return
-        delay = random.randint(8000, 15000)
-        self.parent_frame.after(delay, self.execute_attack)
+        delay = self.rng.randint(8000, 15000)
+        # Counted in clock steps rather than wall time, so the countdown stops
+        # while the window is hidden and slows down with the clock in background
+        self._attack_countdown = delay
+        if self._attack_job is None:
+            self._attack_job = get_clock(self.parent_frame).subscribe(
+                self._count_down_attack, interval_ms=ATTACK_TICK_MS, name="kraken_attack"
+            )
+
+    def _count_down_attack(self, dt: float) -> bool:
+        if not self.active:
+            self._attack_job = None
+            return False
+        self._attack_countdown -= ATTACK_TICK_MS
+        if self._attack_countdown > 0:
+            return True
+        self._attack_job = None
+        self.execute_attack()
+        return False
 
     def execute_attack(self):
         if not self.active or self.attack_animation_active:
             return
-        target_board = random.choice([self.player_board, self.computer_board])
+        if self.engine is not None:
+            target_name, x, y = self.engine.kraken.choose_target(self.engine.kraken_rng)
+            target_board = self.engine.board_for(target_name)
+            attack_size = self.engine.kraken.attack_size
+            self.attack_target = (target_board, x, y, attack_size)
+            self.animate_attack()
+            return
+        target_board = self.rng.choice([self.player_board, self.computer_board])
         attack_size = 3 if self.board_size == 14 else 1
         max_coord = self.board_size - attack_size
-        x = random.randint(0, max_coord)
-        y = random.randint(0, max_coord)
+        x = self.rng.randint(0, max_coord)
+        y = self.rng.randint(0, max_coord)
         self.attack_target = (target_board, x, y, attack_size)
         self.animate_attack()
 
@@ -330,7 +434,7 @@ class Kraken:
                 return
             if phase < len(attack_frames):
                 attack_frames[phase]()
-                self.parent_frame.after(280, lambda: animate_attack_sequence(phase + 1))
+                self.timers.after(280, animate_attack_sequence, phase + 1)
             else:
                 self.apply_attack_damage()
                 self.attack_animation_active = False
@@ -359,8 +463,8 @@ class Kraken:
                 width=3,
             )
         for _ in range(7):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(60, 85)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(60, 85)
             sx = self.center_x + math.cos(angle) * distance
             sy = self.center_y - 18 + math.sin(angle) * distance * 0.6
             self.canvas.create_oval(
@@ -433,6 +537,12 @@ class Kraken:
         if not self.attack_target:
             return
         target_board, x, y, attack_size = self.attack_target
+        if self.engine is not None:
+            # The engine applies the damage and notifies its subscribers
+            target_name = "player" if target_board is self.engine.player_board else "computer"
+            self.engine.kraken_attack(target_name, x, y)
+            self.attack_target = None
+            return
         for dx in range(attack_size):
             for dy in range(attack_size):
                 attack_x = x + dx
@@ -448,17 +558,13 @@ class Kraken:
     def destroy(self):
         self.active = False
         if self._idle_job is not None:
-            try:
-                self.parent_frame.after_cancel(self._idle_job)
-            except tk.TclError:
-                pass
+            self._idle_job.cancel()
             self._idle_job = None
-        if self._spawn_job is not None:
-            try:
-                self.parent_frame.after_cancel(self._spawn_job)
-            except tk.TclError:
-                pass
-            self._spawn_job = None
+        if self._attack_job is not None:
+            self._attack_job.cancel()
+            self._attack_job = None
+        self.timers.cancel_all()
+        self._spawn_job = None
         if hasattr(self, "canvas") and self.canvas:
             self.canvas.destroy()
 
@@ -476,7 +582,12 @@ class Kraken:
         reveal_progress: float = 1.0,
         strike: dict | None = None,
     ):
-        self.canvas.delete("all")
+        if self._tentacle_items is None:
+            self.canvas.delete("all")
+        else:
+            self.canvas.addtag_all(_STALE_TAG)
+            self.canvas.dtag(TENTACLE_TAG, _STALE_TAG)
+            self.canvas.delete(_STALE_TAG)
         self._draw_background(glow_strength)
         reveal_progress = max(0.0, min(1.0, reveal_progress))
         reveal_offset = (1 - reveal_progress) * 140
@@ -485,17 +596,10 @@ class Kraken:
 
     def _draw_background(self, glow_strength: float):
         p = self.palette
-        self.canvas.create_rectangle(
-            0,
-            0,
-            self.canvas_width,
-            self.canvas_height,
-            fill=p["background"],
-            outline="",
-        )
+        # Tentacles are already on the canvas, so the background goes below them
         if glow_strength > 0:
             radius = 90 + glow_strength * 16
-            self.canvas.create_oval(
+            glow = self.canvas.create_oval(
                 self.center_x - radius,
                 self.center_y - 76,
                 self.center_x + radius,
@@ -503,6 +607,71 @@ class Kraken:
                 fill=p["glow"],
                 outline="",
             )
+            self.canvas.tag_lower(glow)
+        background = self.canvas.create_rectangle(
+            0,
+            0,
+            self.canvas_width,
+            self.canvas_height,
+            fill=p["background"],
+            outline="",
+        )
+        self.canvas.tag_lower(background)
+
+    def _create_tentacle_items(self) -> list:
+        """Creates the line and cup items of every tentacle once, in drawing order."""
+        p = self.palette
+        items = []
+        for _direction in (-1, 1):
+            for tentacle in self.tentacles:
+                outline = self.canvas.create_line(
+                    0,
+                    0,
+                    0,
+                    0,
+                    smooth=True,
+                    width=tentacle["width"] + 4,
+                    capstyle=tk.ROUND,
+                    joinstyle=tk.ROUND,
+                    fill=p["tentacle_outline"],
+                    tags=(TENTACLE_TAG,),
+                )
+                body = self.canvas.create_line(
+                    0,
+                    0,
+                    0,
+                    0,
+                    smooth=True,
+                    width=tentacle["width"],
+                    capstyle=tk.ROUND,
+                    joinstyle=tk.ROUND,
+                    fill=p["tentacle"],
+                    tags=(TENTACLE_TAG,),
+                )
+                cups = []
+                for _cup in tentacle["cups"]:
+                    cup = self.canvas.create_oval(
+                        0,
+                        0,
+                        0,
+                        0,
+                        fill=p["sucker"],
+                        outline=p["tentacle_outline"],
+                        width=1,
+                        tags=(TENTACLE_TAG,),
+                    )
+                    highlight = self.canvas.create_oval(
+                        0,
+                        0,
+                        0,
+                        0,
+                        fill=p["sucker_highlight"],
+                        outline="",
+                        tags=(TENTACLE_TAG,),
+                    )
+                    cups.append((cup, highlight))
+                items.append((outline, body, cups))
+        return items
 
     def _draw_tentacles(
         self,
@@ -511,7 +680,10 @@ class Kraken:
         reveal_offset: float,
         strike: dict | None,
     ):
-        p = self.palette
+        if self._tentacle_items is None:
+            self._tentacle_items = self._create_tentacle_items()
+        keyframe = self.keyframes.frame(phase)
+        items = iter(self._tentacle_items)
         margin_x = 22
         margin_y = 18
         attack_direction = strike["direction"] if strike else None
@@ -523,22 +695,17 @@ class Kraken:
 
         for direction in (-1, 1):
             for idx, tentacle in enumerate(self.tentacles):
-                base_points = tentacle["points"]
+                unit_points, unit_cups = keyframe[idx]
+                outline_item, body_item, cup_items = next(items)
                 amplitude = tentacle_wave * tentacle["amplitude"]
-                offset = self.tentacle_phase_offsets[idx]
-                points = []
-                for point_idx, (px, py) in enumerate(base_points):
-                    if len(base_points) > 1:
-                        progress = point_idx / (len(base_points) - 1)
-                    else:
-                        progress = 0
-                    phase_value = phase * 0.08 + progress * 2.3 + offset
-                    sway = math.sin(phase_value) * amplitude * (1 - progress * 0.25)
-                    lift = math.cos(phase_value) * amplitude * 0.35
-                    base_x = px if direction == -1 else -px
-                    x = self.center_x + base_x + direction * sway
-                    y = self.center_y + py + lift + reveal_offset
-                    points.append((x, y))
+                # The left tentacles are mirrored: x = center - px - sway
+                points = [
+                    (
+                        self.center_x + direction * (amplitude * sway - px),
+                        self.center_y + py + amplitude * lift + reveal_offset,
+                    )
+                    for px, py, sway, lift in unit_points
+                ]
 
                 attack_anchor = None
                 attack_eased = 0.0
@@ -571,31 +738,13 @@ class Kraken:
                     attack_eased = eased
                     attack_ripple = impact and attack_progress >= 1.0
 
-                outline_width = tentacle["width"] + 4
-                self.canvas.create_line(
-                    *self._flatten(points),
-                    smooth=True,
-                    width=outline_width,
-                    capstyle=tk.ROUND,
-                    joinstyle=tk.ROUND,
-                    fill=p["tentacle_outline"],
-                )
-                self.canvas.create_line(
-                    *self._flatten(points),
-                    smooth=True,
-                    width=tentacle["width"],
-                    capstyle=tk.ROUND,
-                    joinstyle=tk.ROUND,
-                    fill=p["tentacle"],
-                )
+                flat = self._flatten(points)
+                self.canvas.coords(outline_item, *flat)
+                self.canvas.coords(body_item, *flat)
 
-                for cup_idx, (cup_x, cup_y) in enumerate(tentacle["cups"]):
-                    base_x = cup_x if direction == -1 else -cup_x
-                    phase_value = phase * 0.08 + cup_y * 0.03 + offset
-                    sway = math.sin(phase_value) * amplitude * 0.3
-                    lift = math.cos(phase_value) * amplitude * 0.28
-                    cx = self.center_x + base_x + direction * sway
-                    cy = self.center_y + cup_y + lift + reveal_offset
+                for cup_idx, (cup_x, cup_y, sway, lift) in enumerate(unit_cups):
+                    cx = self.center_x + direction * (amplitude * sway - cup_x)
+                    cy = self.center_y + cup_y + amplitude * lift + reveal_offset
                     if (
                         attack_anchor
                         and direction == attack_direction
@@ -611,23 +760,21 @@ class Kraken:
                         cx = max(margin_x, min(self.canvas_width - margin_x, cx))
                         cy = max(margin_y, min(self.canvas_height - margin_y, cy))
                     radius = 4 if tentacle["width"] <= 12 else 5
-                    self.canvas.create_oval(
+                    cup_item, highlight_item = cup_items[cup_idx]
+                    self.canvas.coords(
+                        cup_item,
                         cx - radius,
                         cy - radius,
                         cx + radius,
                         cy + radius,
-                        fill=p["sucker"],
-                        outline=p["tentacle_outline"],
-                        width=1,
                     )
-                    self.canvas.create_oval(
+                    self.canvas.coords(
+                        highlight_item,
                         cx - radius * 0.45,
                         cy - radius * 0.45,
                         cx + radius * 0.45,
                         cy + radius * 0.45,
-                        fill=p["sucker_highlight"],
-                        outline="",
-            )
+                    )
 
     def _draw_body(self, body_offset: float, eye_state: str, reveal_offset: float):
         p = self.palette
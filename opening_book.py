@@ -0,0 +1,275 @@
+"""Дебютна книга AI, побудована офлайн самогрою.
+
+Найкращі перші постріли залежать лише від розміру поля і складу флоту, тож
+їх можна порахувати заздалегідь. build_book грає партії проти випадкових
+флотів, стріляючи за самою книгою, і для кожного нового стану поля перших
+depth пострілів один раз рахує найкращі клітинки (картою щільності або
+вибірками Монте-Карло з великим бюджетом). Стани, що трапились рідше за
+min_visits разів, відкидаються. Ключ стану — board.zobrist (zobrist.py), тож
+пошук у книзі — один запит до словника.
+
+Формат файлу (.bob, числа — varint як у replay.py):
+    MAGIC, розмір поля, кількість і розміри кораблів, глибина, кількість
+    станів; далі для кожного стану 8 байтів хешу, кількість клітинок і
+    номери клітинок y * size + x за зростанням (кожен — різницею з попереднім).
+
+Книги в books/ для стандартних полів 6, 10 і 14 зібрано командою
+    python opening_book.py build --size N --games 300
+
+Приклад:
+    python opening_book.py build --size 10 --games 5000 --depth 8 --evaluator montecarlo
+    python opening_book.py info books/10x10-4-3-3-2-2-2-1-1-1-1.bob
+"""
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import os
+import random
+import sys
+import time
+
+from bitboard import BitBoard
+from game_engine import ship_configuration
+from replay import ReplayError, read_varint, write_varint
+from rng import GameRNG
+import density
+import sampler
+
+MAGIC = b"BOB1"
+EXTENSION = ".bob"
+ENV_VAR = "BATTLESHIP_BOOK_DIR"
+BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+EVALUATORS = ("density", "montecarlo")
+
+
+class BookError(ValueError):
+    """Пошкоджений файл книги або книга для іншого поля."""
+
+
+class OpeningBook:
+    """Найкращі клітинки для станів поля на початку партії."""
+
+    def __init__(self, board_size: int, ship_sizes: Sequence[int], depth: int,
+                 moves: Optional[Dict[int, Tuple[int, ...]]] = None):
+        self.board_size = board_size
+        self.ship_sizes = tuple(ship_sizes)
+        self.depth = depth
+        self.moves: Dict[int, Tuple[int, ...]] = moves if moves is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def get(self, zobrist: int) -> Optional[Tuple[int, ...]]:
+        """Клітинки (y * size + x) для стану з хешем zobrist або None поза книгою."""
+        return self.moves.get(zobrist)
+
+    def matches(self, board_size: int, ship_sizes: Sequence[int]) -> bool:
+        return board_size == self.board_size and sorted(ship_sizes) == sorted(self.ship_sizes)
+
+    def encode(self) -> bytes:
+        out = bytearray(MAGIC)
+        write_varint(out, self.board_size)
+        write_varint(out, len(self.ship_sizes))
+        for size in self.ship_sizes:
+            write_varint(out, size)
+        write_varint(out, self.depth)
+        write_varint(out, len(self.moves))
+        for zobrist in sorted(self.moves):
+            out += zobrist.to_bytes(8, "little")
+            cells = sorted(self.moves[zobrist])
+            write_varint(out, len(cells))
+            previous = 0
+            for cell in cells:
+                write_varint(out, cell - previous)
+                previous = cell
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "OpeningBook":
+        if data[:len(MAGIC)] != MAGIC:
+            raise BookError("це не дебютна книга (невідомий заголовок)")
+        try:
+            pos = len(MAGIC)
+            board_size, pos = read_varint(data, pos)
+            count, pos = read_varint(data, pos)
+            ship_sizes = []
+            for _ in range(count):
+                size, pos = read_varint(data, pos)
+                ship_sizes.append(size)
+            depth, pos = read_varint(data, pos)
+            entries, pos = read_varint(data, pos)
+
+            moves: Dict[int, Tuple[int, ...]] = {}
+            for _ in range(entries):
+                if pos + 8 > len(data):
+                    raise BookError("книгу обірвано посеред стану")
+                zobrist = int.from_bytes(data[pos:pos + 8], "little")
+                pos += 8
+                cell_count, pos = read_varint(data, pos)
+                cells = []
+                cell = 0
+                for _ in range(cell_count):
+                    delta, pos = read_varint(data, pos)
+                    cell += delta
+                    cells.append(cell)
+                moves[zobrist] = tuple(cells)
+        except ReplayError as error:
+            raise BookError(str(error)) from error
+        return cls(board_size, ship_sizes, depth, moves)
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(self.encode())
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        with open(path, "rb") as handle:
+            return cls.decode(handle.read())
+
+
+def book_path(board_size: int, ship_sizes: Sequence[int], directory: Optional[str] = None) -> str:
+    """Типовий шлях книги для поля і флоту."""
+    directory = directory or os.environ.get(ENV_VAR) or BOOK_DIR
+    sizes = "-".join(str(size) for size in sorted(ship_sizes, reverse=True))
+    return os.path.join(directory, f"{board_size}x{board_size}-{sizes}{EXTENSION}")
+
+
+@lru_cache(maxsize=None)
+def _load_book(path: str) -> Optional[OpeningBook]:
+    try:
+        return OpeningBook.load(path)
+    except (OSError, BookError):
+        return None
+
+
+def book_for(board_size: int, ship_sizes: Sequence[int]) -> Optional[OpeningBook]:
+    """Книга з типового каталогу (завантажується один раз) або None, якщо її немає."""
+    book = _load_book(book_path(board_size, ship_sizes))
+    if book is None or not book.matches(board_size, ship_sizes):
+        return None
+    return book
+
+
+# ---------------------------------------------------------------------- #
+# Побудова книги
+# ---------------------------------------------------------------------- #
+def _montecarlo_best_cells(board, budget_ms: float, rng: random.Random) -> List[int]:
+    observation = density.observe(board)
+    if not observation.unknown:
+        return []
+    counts, samples = sampler.sample_occupancy(observation, budget_ms, rng)
+    if not samples:
+        return density.best_cells(board)
+
+    best_score = -1
+    best_cells: List[int] = []
+    for cell, score in enumerate(counts):
+        if not observation.unknown >> cell & 1:
+            continue
+        if score > best_score:
+            best_score = score
+            best_cells = [cell]
+        elif score == best_score:
+            best_cells.append(cell)
+    return best_cells
+
+
+def build_book(
+    board_size: int,
+    ship_sizes: Optional[Sequence[int]] = None,
+    games: int = 1000,
+    depth: int = 8,
+    evaluator: str = "density",
+    budget_ms: float = 200,
+    min_visits: int = 2,
+    seed: int = 0,
+) -> OpeningBook:
+    """Будує книгу самогрою: games партій, перші depth пострілів кожної.
+
+    Постріли обираються випадково серед клітинок книги, тож у книгу
+    потрапляють саме ті стани, у які її гравець реально приходить."""
+    if evaluator not in EVALUATORS:
+        raise ValueError(f"невідомий спосіб оцінки: {evaluator}")
+    ship_sizes = list(ship_sizes or ship_configuration(board_size))
+    rng = GameRNG(seed)
+    fleet_rng = rng.split("fleet")
+    policy_rng = rng.split("policy")
+    evaluator_rng = rng.split("evaluator")
+
+    moves: Dict[int, Tuple[int, ...]] = {}
+    visits: Counter = Counter()
+    for _ in range(games):
+        board = BitBoard(board_size, ship_sizes)
+        board.place_ships_randomly(fleet_rng)
+        for _ in range(depth):
+            key = board.zobrist
+            cells = moves.get(key)
+            if cells is None:
+                if evaluator == "montecarlo":
+                    cells = tuple(_montecarlo_best_cells(board, budget_ms, evaluator_rng))
+                else:
+                    cells = tuple(density.best_cells(board))
+                if not cells:
+                    break
+                moves[key] = cells
+            visits[key] += 1
+            cell = cells[policy_rng.randrange(len(cells))]
+            board.attack(cell % board_size, cell // board_size)
+            if board.all_ships_sunk():
+                break
+
+    kept = {key: cells for key, cells in moves.items() if visits[key] >= min_visits}
+    return OpeningBook(board_size, ship_sizes, depth, kept)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Дебютні книги AI морського бою")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="побудувати книгу самогрою")
+    build_parser.add_argument("--size", "-s", type=int, default=10, help="розмір поля")
+    build_parser.add_argument("--ships", default=None, help="розміри кораблів через кому (за замовчуванням — як у грі)")
+    build_parser.add_argument("--games", "-n", type=int, default=1000, help="кількість партій")
+    build_parser.add_argument("--depth", "-d", type=int, default=8, help="скільки перших пострілів партії вносити в книгу")
+    build_parser.add_argument("--evaluator", choices=EVALUATORS, default="density", help="оцінка стану")
+    build_parser.add_argument("--budget", type=float, default=200, help="бюджет вибірок на стан для montecarlo, мс")
+    build_parser.add_argument("--min-visits", type=int, default=2, help="відкидати стани, що трапились рідше")
+    build_parser.add_argument("--seed", type=int, default=0, help="зерно самогри")
+    build_parser.add_argument("--output", "-o", default=None, help="файл книги (за замовчуванням — у каталозі книг)")
+
+    info_parser = commands.add_parser("info", help="вміст файлу книги")
+    info_parser.add_argument("path", help="файл книги (.bob)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        ship_sizes = [int(size) for size in args.ships.split(",")] if args.ships else ship_configuration(args.size)
+        start = time.perf_counter()
+        book = build_book(args.size, ship_sizes, args.games, args.depth, args.evaluator,
+                          args.budget, args.min_visits, args.seed)
+        output = args.output or book_path(args.size, ship_sizes)
+        book.save(output)
+        print(f"Книга {args.size}x{args.size}: {len(book)} станів, {os.path.getsize(output)} байтів, "
+              f"{time.perf_counter() - start:.1f} с -> {output}")
+        return 0
+
+    try:
+        book = OpeningBook.load(args.path)
+    except (OSError, BookError) as error:
+        print(f"Не вдалося прочитати книгу: {error}", file=sys.stderr)
+        return 2
+    print(f"Поле {book.board_size}x{book.board_size}, флот {list(book.ship_sizes)}, "
+          f"глибина {book.depth}, станів {len(book)}")
+    opening = book.get(BitBoard(book.board_size, list(book.ship_sizes)).zobrist)
+    if opening:
+        first = ", ".join(f"({cell % book.board_size}, {cell // book.board_size})" for cell in opening)
+        print(f"Перший постріл: {first}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Система частинок для вибухів.
+
+Стан усіх частинок зберігається у масивах фіксованої місткості (структура
+масивів): координати, швидкості, розміри, залишок життя. Живі частинки
+займають перші count позицій; загибла частинка заміщується останньою.
+Овали на canvas беруться з пулу і повертаються в нього прихованими, тож
+нові вибухи не створюють нових елементів. Усі вибухи рухаються одним кроком
+на кадр спільного годинника.
+"""
+from array import array
+from typing import Dict, List, Optional, Sequence
+import math
+import random
+import tkinter as tk
+
+from animation_clock import AnimationClock
+
+# Скільки частинок одночасно може бути на всіх canvas
+DEFAULT_CAPACITY = 400
+STEP_MS = 30
+
+PARTICLE_LIFE = 15
+GRAVITY = 0.3
+DAMPING = 0.95
+SHRINK = 0.92
+
+
+def _exists(canvas: tk.Canvas) -> bool:
+    try:
+        return bool(canvas.winfo_exists())
+    except tk.TclError:
+        return False
+
+
+class ParticleSystem:
+    """Частинки всіх вибухів вікна з фіксованим бюджетом capacity."""
+
+    def __init__(self, clock: AnimationClock, capacity: int = DEFAULT_CAPACITY):
+        self.clock = clock
+        self.capacity = capacity
+        self.count = 0
+
+        self.x = array("d", bytes(8 * capacity))
+        self.y = array("d", bytes(8 * capacity))
+        self.vx = array("d", bytes(8 * capacity))
+        self.vy = array("d", bytes(8 * capacity))
+        self.size = array("d", bytes(8 * capacity))
+        self.life = array("i", bytes(4 * capacity))
+        self.item = array("l", bytes(array("l").itemsize * capacity))
+        self.canvas_index = array("i", bytes(4 * capacity))
+
+        self._canvases: List[tk.Canvas] = []
+        # Індекс canvas -> вільні (приховані) овали
+        self._free: Dict[int, List[int]] = {}
+        self._animation = None
+
+        self.emitted = 0
+        self.dropped = 0
+
+    def _canvas_slot(self, canvas: tk.Canvas) -> int:
+        for index, known in enumerate(self._canvases):
+            if known is canvas:
+                return index
+
+        # Новий canvas займає місце знищеного (після повернення в меню)
+        for index, known in enumerate(self._canvases):
+            if not _exists(known):
+                self._forget_canvas(index)
+                self._canvases[index] = canvas
+                return index
+        self._canvases.append(canvas)
+        self._free[len(self._canvases) - 1] = []
+        return len(self._canvases) - 1
+
+    def _take_item(self, slot: int, color: str) -> int:
+        canvas = self._canvases[slot]
+        free = self._free[slot]
+        if free:
+            item = free.pop()
+            canvas.itemconfig(item, fill=color, state="normal")
+            canvas.tag_raise(item)
+            return item
+        return canvas.create_oval(0, 0, 0, 0, fill=color, outline="", tags=("particle",))
+
+    def emit(
+        self,
+        canvas: tk.Canvas,
+        center_x: float,
+        center_y: float,
+        count: int,
+        colors: Sequence[str],
+        rng: random.Random = None,
+    ) -> int:
+        """Додає до count частинок, що розлітаються з точки; повертає, скільки додано.
+
+        Коли бюджет заповнюється, вибухи отримують пропорційно менше частинок,
+        а не витісняють ті, що вже летять."""
+        rng = rng or random
+        free = self.capacity - self.count
+        # Пропорційна частка, але не більше вільних місць (count може перевищувати capacity)
+        allowed = min(count, free, math.ceil(count * free / self.capacity))
+        self.dropped += count - allowed
+        if allowed <= 0:
+            return 0
+
+        slot = self._canvas_slot(canvas)
+        try:
+            for _ in range(allowed):
+                angle = rng.uniform(0, 2 * math.pi)
+                speed = rng.uniform(2, 6)
+                size = rng.randint(3, 8)
+                color = rng.choice(colors)
+
+                i = self.count
+                self.item[i] = self._take_item(slot, color)
+                self.canvas_index[i] = slot
+                self.x[i] = center_x
+                self.y[i] = center_y
+                self.vx[i] = math.cos(angle) * speed
+                self.vy[i] = math.sin(angle) * speed
+                self.size[i] = size
+                self.life[i] = PARTICLE_LIFE
+                self._place(i)
+                self.count += 1
+        except tk.TclError:
+            # Canvas знищено
+            self._forget_canvas(slot)
+            return 0
+
+        self.emitted += allowed
+        if self._animation is None or not self._animation.active:
+            self._animation = self.clock.subscribe(self._on_frame, interval_ms=STEP_MS, name="particles")
+        return allowed
+
+    def _place(self, i: int):
+        x, y, size = self.x[i], self.y[i], self.size[i]
+        self._canvases[self.canvas_index[i]].coords(self.item[i], x - size, y - size, x + size, y + size)
+
+    def _kill(self, i: int):
+        """Повертає овал у пул і ставить на місце i останню живу частинку."""
+        slot = self.canvas_index[i]
+        item = self.item[i]
+        try:
+            self._canvases[slot].itemconfig(item, state="hidden")
+            self._free[slot].append(item)
+        except tk.TclError:
+            pass
+
+        last = self.count - 1
+        if i != last:
+            for column in (self.x, self.y, self.vx, self.vy, self.size, self.life, self.item, self.canvas_index):
+                column[i] = column[last]
+        self.count = last
+
+    def _forget_canvas(self, slot: int):
+        """Прибирає частинки і пул canvas, який уже знищено."""
+        i = 0
+        while i < self.count:
+            if self.canvas_index[i] == slot:
+                self._kill(i)
+            else:
+                i += 1
+        self._free[slot] = []
+
+    def step(self) -> bool:
+        """Один крок усіх частинок; повертає True, поки є живі."""
+        x, y, vx, vy, size, life = self.x, self.y, self.vx, self.vy, self.size, self.life
+        i = 0
+        while i < self.count:
+            life[i] -= 1
+            if life[i] <= 0:
+                self._kill(i)
+                continue
+
+            x[i] += vx[i]
+            y[i] += vy[i]
+            vy[i] += GRAVITY
+            vx[i] *= DAMPING
+            vy[i] *= DAMPING
+            size[i] *= SHRINK
+            try:
+                self._place(i)
+            except tk.TclError:
+                self._forget_canvas(self.canvas_index[i])
+                continue
+            i += 1
+        return self.count > 0
+
+    def _on_frame(self, dt: float) -> bool:
+        alive = self.step()
+        if not alive:
+            self._animation = None
+        return alive
+
+    def clear(self, canvas: Optional[tk.Canvas] = None):
+        """Ховає частинки на canvas (або всі частинки)."""
+        i = 0
+        while i < self.count:
+            if canvas is None or self._canvases[self.canvas_index[i]] is canvas:
+                self._kill(i)
+            else:
+                i += 1
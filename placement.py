@@ -0,0 +1,191 @@
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import random
+
+from Board import Orientation
+
+
+class Placement(NamedTuple):
+    """Одне можливе розміщення корабля на полі.
+
+    cells — номери клітинок корабля (y * size + x), mask — ті самі клітинки
+    у вигляді бітової маски, halo — маска клітинок корабля разом із сусідами,
+    ring — номери сусідніх клітинок (ореол без самого корабля)."""
+    size: int
+    x: int
+    y: int
+    orientation: Orientation
+    cells: Tuple[int, ...]
+    mask: int
+    halo: int
+    ring: Tuple[int, ...]
+
+
+class PlacementTable:
+    """Таблиця всіх розміщень кораблів для поля заданого розміру.
+
+    Розміщення для кожного розміру корабля перелічуються один раз (ліниво)
+    і далі використовуються спільно всіма полями цього розміру."""
+
+    def __init__(self, board_size: int):
+        self.board_size = board_size
+        self._by_size: Dict[int, Tuple[Placement, ...]] = {}
+        self._lookup: Dict[Tuple[int, int, int, Orientation], Placement] = {}
+        self._cell_index: Dict[int, Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]] = {}
+        self._coverage: Dict[int, Tuple[int, ...]] = {}
+
+    @staticmethod
+    def for_board(board_size: int) -> "PlacementTable":
+        """Повертає спільну таблицю для поля board_size x board_size."""
+        return _table_for_board(board_size)
+
+    def placements(self, size: int) -> Tuple[Placement, ...]:
+        """Усі розміщення корабля розміру size у межах поля."""
+        table = self._by_size.get(size)
+        if table is None:
+            table = self._enumerate(size)
+            self._by_size[size] = table
+            for placement in table:
+                self._lookup[(size, placement.x, placement.y, placement.orientation)] = placement
+        return table
+
+    def lookup(self, size: int, x: int, y: int, orientation: Orientation) -> Optional[Placement]:
+        """Розміщення за координатами або None, якщо корабель виходить за поле."""
+        if size <= 0 or size > self.board_size:
+            return None
+        self.placements(size)
+        return self._lookup.get((size, x, y, orientation))
+
+    def cell_index(self, size: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+        """Зворотні індекси для розмірів size: для кожної клітинки — номери
+        розміщень, що її займають, і номери розміщень, для яких вона сусідня."""
+        index = self._cell_index.get(size)
+        if index is None:
+            cell_count = self.board_size * self.board_size
+            by_cell: List[List[int]] = [[] for _ in range(cell_count)]
+            by_ring: List[List[int]] = [[] for _ in range(cell_count)]
+            for placement_id, placement in enumerate(self.placements(size)):
+                for cell in placement.cells:
+                    by_cell[cell].append(placement_id)
+                for cell in placement.ring:
+                    by_ring[cell].append(placement_id)
+            index = (tuple(map(tuple, by_cell)), tuple(map(tuple, by_ring)))
+            self._cell_index[size] = index
+        return index
+
+    def base_coverage(self, size: int) -> Tuple[int, ...]:
+        """Скільки розміщень корабля розміру size покриває кожну клітинку порожнього поля."""
+        coverage = self._coverage.get(size)
+        if coverage is None:
+            coverage = tuple(len(ids) for ids in self.cell_index(size)[0])
+            self._coverage[size] = coverage
+        return coverage
+
+    def _enumerate(self, size: int) -> Tuple[Placement, ...]:
+        n = self.board_size
+        result = []
+        if size <= 0 or size > n:
+            return ()
+        for orientation in (Orientation.HORIZONTAL, Orientation.VERTICAL):
+            # Однопалубний корабль однаковий в обох орієнтаціях
+            if size == 1 and orientation == Orientation.VERTICAL:
+                continue
+            for y in range(n):
+                for x in range(n):
+                    if orientation == Orientation.HORIZONTAL:
+                        if x + size > n:
+                            continue
+                        coords = [(x + i, y) for i in range(size)]
+                    else:
+                        if y + size > n:
+                            continue
+                        coords = [(x, y + i) for i in range(size)]
+
+                    cells = tuple(cy * n + cx for cx, cy in coords)
+                    mask = 0
+                    halo = 0
+                    ring = set()
+                    for cx, cy in coords:
+                        mask |= 1 << (cy * n + cx)
+                        for dx in range(-1, 2):
+                            for dy in range(-1, 2):
+                                nx, ny = cx + dx, cy + dy
+                                if 0 <= nx < n and 0 <= ny < n:
+                                    halo |= 1 << (ny * n + nx)
+                                    ring.add(ny * n + nx)
+                    ring.difference_update(cells)
+                    result.append(Placement(size, x, y, orientation, cells, mask, halo, tuple(sorted(ring))))
+
+        if size == 1:
+            # Вертикальний однопалубник — той самий об'єкт, що й горизонтальний
+            for placement in result:
+                self._lookup[(1, placement.x, placement.y, Orientation.VERTICAL)] = placement
+        return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def _table_for_board(board_size: int) -> PlacementTable:
+    return PlacementTable(board_size)
+
+
+def generate_fleet(
+    board_size: int,
+    ship_sizes: Sequence[int],
+    rng: random.Random = None,
+    blocked: int = 0,
+) -> List[Placement]:
+    """Генерує повний флот без дотику кораблів.
+
+    Кандидати для кожного розміру беруться з PlacementTable і звужуються
+    після кожного поставленого корабля; якщо якийсь корабель не вміщується,
+    пошук відкочується назад. blocked — маска клітинок, де кораблі стояти не
+    можуть (наприклад, ореоли вже розміщених кораблів). Повертає розміщення
+    у порядку ship_sizes або кидає ValueError, якщо флот розмістити неможливо."""
+    rng = rng or random
+    table = PlacementTable.for_board(board_size)
+
+    # Великі кораблі ставимо першими — так пошук рідше відкочується
+    order = sorted(range(len(ship_sizes)), key=lambda i: -ship_sizes[i])
+    sizes = [ship_sizes[i] for i in order]
+    chosen: List[Placement] = []
+
+    def search(depth: int, blocked: int, pool: Sequence[Placement]) -> bool:
+        if depth == len(sizes):
+            return True
+        size = sizes[depth]
+        if depth == 0 or sizes[depth - 1] != size:
+            pool = table.placements(size)
+        # Кандидати попереднього кроку того ж розміру лише звужуються
+        options = [p for p in pool if not p.mask & blocked]
+        remaining = list(options)
+        while remaining:
+            # Вибір без повторень: випадковий елемент міняємо з останнім
+            pick = rng.randrange(len(remaining))
+            remaining[pick], remaining[-1] = remaining[-1], remaining[pick]
+            placement = remaining.pop()
+
+            chosen.append(placement)
+            # Однакові кораблі взаємозамінні: уже відкинуті варіанти глибше не перевіряємо
+            if search(depth + 1, blocked | placement.halo, remaining):
+                return True
+            chosen.pop()
+        return False
+
+    if not search(0, blocked, ()):
+        raise ValueError(f"Неможливо розмістити флот {list(ship_sizes)} на полі {board_size}x{board_size}")
+
+    result: List[Optional[Placement]] = [None] * len(ship_sizes)
+    for ship_index, placement in zip(order, chosen):
+        result[ship_index] = placement
+    return result
+
+
+def generate_fleets(
+    count: int,
+    board_size: int,
+    ship_sizes: Sequence[int],
+    rng: random.Random = None,
+) -> List[List[Placement]]:
+    """Генерує count незалежних флотів (для бенчмарків і симуляцій)."""
+    rng = rng or random
+    return [generate_fleet(board_size, ship_sizes, rng) for _ in range(count)]
@@ -3,12 +3,17 @@ import math
 import random
 import tkinter as tk
 
+from animation_clock import get_clock
+from scene import RetainedScene
+from timers import TimerRegistry
+
 
 class PlayerAvatar:
     """Анімований аватар гравця-капітана, що відображається у лівому куті екрану."""
 
-    def __init__(self, parent_frame: tk.Frame):
+    def __init__(self, parent_frame: tk.Frame, rng: random.Random = None):
         self.parent_frame = parent_frame
+        self.rng = rng or random
         self.active = True
         self.animation_phase = 0
         self.current_emotion = "neutral"  # neutral, happy, sad, excited, worried, thinking
@@ -26,6 +31,8 @@ class PlayerAvatar:
             highlightthickness=0,
         )
         self.canvas.pack(expand=True, pady=5)
+        # Елементи персонажа створюються один раз і лише оновлюються
+        self.scene = RetainedScene(self.canvas)
 
         # Колірна палітра (морська/людська тематика)
         self.palette = {
@@ -44,10 +51,12 @@ class PlayerAvatar:
             "text": "#ffffff",
         }
 
-        self._blink_timer = random.randint(60, 120)
+        self._blink_timer = self.rng.randint(60, 120)
         self._blink_frames_remaining = 0
         self._blink_frames_total = 4
         self._idle_job = None
+        self.timers = TimerRegistry(parent_frame, "player_avatar")
+        self._hide_job = None
 
         # Текст діалогу
         self.dialogue_text = ""
@@ -60,8 +69,11 @@ class PlayerAvatar:
         # Коефіцієнт масштабування
         self.scale = 0.64
 
-        # Запускаємо анімацію
+        # Запускаємо анімацію: кадри дає спільний годинник вікна
         self.animate_idle()
+        self._idle_job = get_clock(parent_frame).subscribe(
+            lambda dt: self.animate_idle(), interval_ms=80, name="player_avatar"
+        )
 
     def set_emotion(self, emotion: str):
         """Встановлює емоцію капітана: neutral, happy, sad, excited, worried, thinking"""
@@ -71,8 +83,11 @@ class PlayerAvatar:
         """Показує діалог на певний час (в мілісекундах)"""
         self.dialogue_text = text
         self.dialogue_visible = True
+        # Новий діалог скасовує таймер попереднього, щоб той не сховав його раніше
+        self.timers.cancel(self._hide_job)
+        self._hide_job = None
         if duration > 0:
-            self.parent_frame.after(duration, self.hide_dialogue)
+            self._hide_job = self.timers.after(duration, self.hide_dialogue)
 
     def hide_dialogue(self):
         """Ховає діалог"""
@@ -95,7 +110,7 @@ class PlayerAvatar:
             eye_state = "half" if frame_index in (0, self._blink_frames_total - 1) else "closed"
             self._blink_frames_remaining -= 1
             if self._blink_frames_remaining == 0:
-                self._blink_timer = random.randint(60, 120)
+                self._blink_timer = self.rng.randint(60, 120)
         else:
             if self._blink_timer <= 0:
                 self._blink_frames_remaining = self._blink_frames_total
@@ -105,26 +120,28 @@ class PlayerAvatar:
                 eye_state = "open"
 
         self._draw_captain(body_offset, eye_state)
-        self._idle_job = self.parent_frame.after(80, self.animate_idle)
 
     def _draw_captain(self, body_offset: float, eye_state: str):
         """Малює капітана"""
-        self.canvas.delete("all")
+        self.scene.begin("background")
         p = self.palette
 
         # Фон
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             0, 0, self.canvas_width, self.canvas_height,
             fill=p["background"], outline=""
         )
 
+        # Покачування — зсув усього шару одним canvas.move
+        self.scene.begin("body", dy=body_offset)
+
         # Тіло капітана (китель/піджак)
-        body_y = self.center_y + body_offset + int(20 * self.scale)
+        body_y = self.center_y + int(20 * self.scale)
         body_width = int(120 * self.scale)
         body_height = int(100 * self.scale)
 
         # Китель (трапеція)
-        self.canvas.create_polygon(
+        self.scene.create_polygon(
             self.center_x - int(40 * self.scale), body_y - int(20 * self.scale),
             self.center_x + int(40 * self.scale), body_y - int(20 * self.scale),
             self.center_x + int(60 * self.scale), body_y + int(80 * self.scale),
@@ -138,7 +155,7 @@ class PlayerAvatar:
         for i in range(3):
             button_y = body_y + i * int(25 * self.scale)
             button_radius = int(4 * self.scale)
-            self.canvas.create_oval(
+            self.scene.create_oval(
                 self.center_x - button_radius,
                 button_y - button_radius,
                 self.center_x + button_radius,
@@ -149,7 +166,7 @@ class PlayerAvatar:
 
         # Комір
         collar_y = body_y - int(20 * self.scale)
-        self.canvas.create_polygon(
+        self.scene.create_polygon(
             self.center_x - int(40 * self.scale), collar_y,
             self.center_x - int(30 * self.scale), collar_y - int(10 * self.scale),
             self.center_x + int(30 * self.scale), collar_y - int(10 * self.scale),
@@ -162,7 +179,7 @@ class PlayerAvatar:
         head_y = body_y - int(60 * self.scale)
         head_radius = int(35 * self.scale)
 
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - head_radius,
             head_y - head_radius,
             self.center_x + head_radius,
@@ -182,7 +199,7 @@ class PlayerAvatar:
         self._draw_arms(body_y, body_offset)
 
         # Підпис "ГРАВЕЦЬ"
-        self.canvas.create_text(
+        self.scene.create_text(
             self.center_x,
             body_y + int(90 * self.scale),
             text="👤 ГРАВЕЦЬ",
@@ -190,9 +207,11 @@ class PlayerAvatar:
             fill=p["accent"]
         )
 
-        # Діалог
-        if self.dialogue_visible and self.dialogue_text:
+        # Діалог: хмаринка перемальовується лише при зміні тексту
+        visible_text = self.dialogue_text if self.dialogue_visible else None
+        if self.scene.begin("bubble", key=visible_text) and visible_text:
             self._draw_dialogue_bubble()
+        self.scene.end()
 
     def _draw_captain_hat(self, head_y: float, head_radius: int):
         """Малює капітанську кепку"""
@@ -200,7 +219,7 @@ class PlayerAvatar:
 
         # Козирок кепки
         visor_y = head_y - int(5 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - int(45 * self.scale),
             visor_y - int(8 * self.scale),
             self.center_x + int(45 * self.scale),
@@ -211,7 +230,7 @@ class PlayerAvatar:
 
         # Верх кепки
         hat_y = head_y - head_radius - int(5 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - int(40 * self.scale),
             hat_y - int(20 * self.scale),
             self.center_x + int(40 * self.scale),
@@ -224,7 +243,7 @@ class PlayerAvatar:
         # Емблема на кепці (якір)
         anchor_y = hat_y - int(5 * self.scale)
         anchor_size = int(10 * self.scale)
-        self.canvas.create_text(
+        self.scene.create_text(
             self.center_x,
             anchor_y,
             text="⚓",
@@ -242,7 +261,7 @@ class PlayerAvatar:
         # Ніс
         nose_y = head_y + int(5 * self.scale)
         nose_size = int(4 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             self.center_x - nose_size,
             nose_y - nose_size // 2,
             self.center_x + nose_size,
@@ -258,7 +277,7 @@ class PlayerAvatar:
 
         if self.current_emotion == "happy" or self.current_emotion == "excited":
             # Усмішка
-            self.canvas.create_arc(
+            self.scene.create_arc(
                 self.center_x - mouth_width,
                 mouth_y - mouth_height,
                 self.center_x + mouth_width,
@@ -271,7 +290,7 @@ class PlayerAvatar:
             )
         elif self.current_emotion == "sad" or self.current_emotion == "worried":
             # Сумний рот
-            self.canvas.create_arc(
+            self.scene.create_arc(
                 self.center_x - mouth_width,
                 mouth_y,
                 self.center_x + mouth_width,
@@ -284,7 +303,7 @@ class PlayerAvatar:
             )
         else:
             # Нейтральний рот (пряма лінія)
-            self.canvas.create_line(
+            self.scene.create_line(
                 self.center_x - mouth_width,
                 mouth_y,
                 self.center_x + mouth_width,
@@ -304,7 +323,7 @@ class PlayerAvatar:
         if eye_state == "closed":
             # Закриті очі (лінії)
             for x_offset in [-eye_spacing, eye_spacing]:
-                self.canvas.create_line(
+                self.scene.create_line(
                     self.center_x + x_offset - eye_radius,
                     eye_y,
                     self.center_x + x_offset + eye_radius,
@@ -316,7 +335,7 @@ class PlayerAvatar:
         elif eye_state == "half":
             # Напіввідкриті
             for x_offset in [-eye_spacing, eye_spacing]:
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - eye_radius,
                     eye_y - eye_radius // 2,
                     self.center_x + x_offset + eye_radius,
@@ -328,7 +347,7 @@ class PlayerAvatar:
             # Відкриті очі
             for x_offset in [-eye_spacing, eye_spacing]:
                 # Біла частина ока
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - eye_radius,
                     eye_y - eye_radius,
                     self.center_x + x_offset + eye_radius,
@@ -348,7 +367,7 @@ class PlayerAvatar:
                 elif self.current_emotion == "thinking":
                     pupil_y_offset = int(2 * self.scale)
 
-                self.canvas.create_oval(
+                self.scene.create_oval(
                     self.center_x + x_offset - pupil_radius,
                     eye_y - pupil_radius + pupil_y_offset,
                     self.center_x + x_offset + pupil_radius,
@@ -362,7 +381,7 @@ class PlayerAvatar:
                 # Стурбовані брови
                 for x_offset in [-eye_spacing, eye_spacing]:
                     direction = 1 if x_offset < 0 else -1
-                    self.canvas.create_line(
+                    self.scene.create_line(
                         self.center_x + x_offset - eye_radius,
                         eye_y - eye_radius - int(5 * self.scale),
                         self.center_x + x_offset + eye_radius,
@@ -373,7 +392,7 @@ class PlayerAvatar:
             elif self.current_emotion == "excited":
                 # Здивовані брови
                 for x_offset in [-eye_spacing, eye_spacing]:
-                    self.canvas.create_arc(
+                    self.scene.create_arc(
                         self.center_x + x_offset - eye_radius,
                         eye_y - eye_radius - int(8 * self.scale),
                         self.center_x + x_offset + eye_radius,
@@ -396,7 +415,7 @@ class PlayerAvatar:
         left_arm_end_x = self.center_x - int(80 * self.scale)
         left_arm_end_y = arm_y + int(30 * self.scale) * math.sin(arm_angle)
 
-        self.canvas.create_line(
+        self.scene.create_line(
             self.center_x - int(40 * self.scale),
             arm_y,
             left_arm_end_x,
@@ -408,7 +427,7 @@ class PlayerAvatar:
 
         # Кисть лівої руки
         hand_radius = int(8 * self.scale)
-        self.canvas.create_oval(
+        self.scene.create_oval(
             left_arm_end_x - hand_radius,
             left_arm_end_y - hand_radius,
             left_arm_end_x + hand_radius,
@@ -422,7 +441,7 @@ class PlayerAvatar:
         right_arm_end_x = self.center_x + int(80 * self.scale)
         right_arm_end_y = arm_y - int(30 * self.scale) * math.sin(arm_angle)
 
-        self.canvas.create_line(
+        self.scene.create_line(
             self.center_x + int(40 * self.scale),
             arm_y,
             right_arm_end_x,
@@ -433,7 +452,7 @@ class PlayerAvatar:
         )
 
         # Кисть правої руки
-        self.canvas.create_oval(
+        self.scene.create_oval(
             right_arm_end_x - hand_radius,
             right_arm_end_y - hand_radius,
             right_arm_end_x + hand_radius,
@@ -452,7 +471,7 @@ class PlayerAvatar:
         bubble_height = int(60 * self.scale)
 
         # Фон вікна
-        self.canvas.create_rectangle(
+        self.scene.create_rectangle(
             bubble_x,
             bubble_y,
             bubble_x + bubble_width,
@@ -464,7 +483,7 @@ class PlayerAvatar:
 
         # Трикутник (хвостик)
         tail_size = int(10 * self.scale)
-        self.canvas.create_polygon(
+        self.scene.create_polygon(
             self.center_x - tail_size,
             bubble_y + bubble_height,
             self.center_x + tail_size,
@@ -477,7 +496,7 @@ class PlayerAvatar:
         )
 
         # Текст (збільшений шрифт)
-        self.canvas.create_text(
+        self.scene.create_text(
             bubble_x + bubble_width//2,
             bubble_y + bubble_height//2,
             text=self.dialogue_text,
@@ -490,10 +509,8 @@ class PlayerAvatar:
         """Знищує аватар"""
         self.active = False
         if self._idle_job is not None:
-            try:
-                self.parent_frame.after_cancel(self._idle_job)
-            except tk.TclError:
-                pass
+            self._idle_job.cancel()
             self._idle_job = None
+        self.timers.cancel_all()
         if hasattr(self, "canvas") and self.canvas:
             self.canvas.destroy()
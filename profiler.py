@@ -0,0 +1,275 @@
+"""Профілювання GUI: час колбеків Tk, кадрів і малювання.
+
+Вмикається лише явно: змінною середовища BATTLESHIP_PROFILE (шлях до
+JSON-звіту або 1) чи прапорцем --profile[=шлях] у battleship3.py. Тоді
+кожен колбек after, обробник подій і команда кнопки, а також основні
+методи малювання вимірюються; у куті вікна показується живий звіт, а при
+виході записується JSON з p50/p95/max для кожного колбека.
+
+Для кожного колбека зберігаються лише лічильник, сума, максимум і вибірка
+з не більше ніж SAMPLE_LIMIT тривалостей (reservoir sampling), тож пам'ять
+і вартість звіту не ростуть з довжиною сесії.
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+import atexit
+import functools
+import importlib
+import json
+import os
+import random
+import time
+import tkinter as tk
+
+from animation_clock import get_clock
+from stats import percentile
+from timers import outstanding
+from zobrist import cache_stats
+
+ENV_VAR = "BATTLESHIP_PROFILE"
+DEFAULT_OUTPUT = "profile.json"
+OVERLAY_REFRESH_MS = 500
+SAMPLE_LIMIT = 1024
+
+# Методи, що вимірюються завжди (модуль, клас, методи)
+DEFAULT_TARGETS = [
+    ("board_view", "BoardView", ("render",)),
+    ("animation_clock", "AnimationClock", ("_tick",)),
+    ("ai_robot", "AIRobot", ("_draw_robot",)),
+    ("player_avatar", "PlayerAvatar", ("_draw_captain",)),
+    ("human_avatar", "HumanAvatar", ("_draw_captain",)),
+    ("kraken", "Kraken", ("_draw_scene",)),
+    ("particles", "ParticleSystem", ("step",)),
+    ("visual_effects", "VisualEffects", ("_animate_explosion", "_animate_smoke")),
+]
+
+_WRAPPED = "_profiled"
+
+
+def output_path(argv: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Шлях до звіту, якщо профілювання увімкнено прапорцем або змінною середовища."""
+    for arg in argv or ():
+        if arg == "--profile":
+            return DEFAULT_OUTPUT
+        if arg.startswith("--profile="):
+            return arg.split("=", 1)[1] or DEFAULT_OUTPUT
+    value = os.environ.get(ENV_VAR, "")
+    if not value or value == "0":
+        return None
+    return DEFAULT_OUTPUT if value == "1" else value
+
+
+def _callback_name(func) -> str:
+    func = getattr(func, "__func__", func)
+    return getattr(func, "__qualname__", None) or type(func).__qualname__
+
+
+class _Timing:
+    """Тривалості одного колбека: точні calls/total/max і обмежена вибірка для перцентилів."""
+
+    __slots__ = ("calls", "total", "max", "samples", "_summary", "_summary_calls")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = array("d")
+        self._summary: Dict[str, float] = {}
+        self._summary_calls = -1
+
+    def add(self, seconds: float, rng: random.Random):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if len(self.samples) < SAMPLE_LIMIT:
+            self.samples.append(seconds)
+        else:
+            # Кожен виклик потрапляє у вибірку з імовірністю SAMPLE_LIMIT / calls
+            index = rng.randrange(self.calls)
+            if index < SAMPLE_LIMIT:
+                self.samples[index] = seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Зведення в мс; перераховується лише після нових викликів."""
+        if self._summary_calls != self.calls:
+            values = [value * 1000 for value in self.samples]
+            self._summary = {
+                "calls": self.calls,
+                "total_ms": self.total * 1000,
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "max_ms": self.max * 1000,
+            }
+            self._summary_calls = self.calls
+        return self._summary
+
+
+class Profiler:
+    """Збирає тривалості колбеків і кількість елементів на canvas."""
+
+    def __init__(self, output: str = DEFAULT_OUTPUT):
+        self.output = output
+        self.timings: Dict[str, _Timing] = {}
+        # Власний генератор: вибірка профайлера не зсуває випадковість гри
+        self._rng = random.Random()
+        self.canvas_items: Dict[str, Dict[str, int]] = {}
+        self.root: Optional[tk.Tk] = None
+        self._patches: List[tuple] = []
+        self._overlay: Optional[tk.Label] = None
+        self._last_frames = 0
+        self._last_refresh = time.perf_counter()
+        self.fps = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Вимірювання
+    # ------------------------------------------------------------------ #
+    def record(self, name: str, seconds: float):
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = _Timing()
+        timing.add(seconds, self._rng)
+
+    def wrap(self, func, name: str):
+        """Обгортка, що вимірює кожен виклик func під іменем name."""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        timed.__name__ = _WRAPPED
+        return timed
+
+    def _patch(self, owner, attribute: str, replacement):
+        self._patches.append((owner, attribute, owner.__dict__[attribute]))
+        setattr(owner, attribute, replacement)
+
+    def instrument(self, cls, *methods: str):
+        """Вимірює виклики методів класу (для всіх його екземплярів)."""
+        for method in methods:
+            if method in cls.__dict__:
+                self._patch(cls, method, self.wrap(cls.__dict__[method], f"{cls.__name__}.{method}"))
+
+    def _patch_tk(self):
+        profiler = self
+        original_after = tk.Misc.after
+        original_register = tk.Misc._register
+
+        def after(widget, ms, func=None, *args):
+            if func is not None:
+                func = profiler.wrap(func, f"after:{_callback_name(func)}")
+            return original_after(widget, ms, func, *args)
+
+        def register(widget, func, subst=None, needcleanup=1):
+            # Колбеки after уже обгорнуті вище; тут — обробники подій і команди
+            if getattr(func, "__name__", "") != _WRAPPED:
+                func = profiler.wrap(func, f"tk:{_callback_name(func)}")
+            return original_register(widget, func, subst, needcleanup)
+
+        self._patch(tk.Misc, "after", after)
+        self._patch(tk.Misc, "_register", register)
+
+    # ------------------------------------------------------------------ #
+    # Встановлення
+    # ------------------------------------------------------------------ #
+    def install(self, root: tk.Tk, targets: Iterable = DEFAULT_TARGETS, overlay: bool = True):
+        self.root = root
+        self._patch_tk()
+        for module_name, class_name, methods in targets:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            self.instrument(cls, *methods)
+        if overlay:
+            self._refresh()
+        atexit.register(self.dump)
+
+    def uninstall(self):
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches.clear()
+
+    # ------------------------------------------------------------------ #
+    # Canvas і живий звіт
+    # ------------------------------------------------------------------ #
+    def count_canvas_items(self):
+        """Оновлює поточну та максимальну кількість елементів на кожному canvas."""
+        pending = list(self.root.winfo_children())
+        while pending:
+            widget = pending.pop()
+            pending.extend(widget.winfo_children())
+            if isinstance(widget, tk.Canvas):
+                count = len(widget.find_all())
+                entry = self.canvas_items.setdefault(str(widget), {"current": 0, "max": 0})
+                entry["current"] = count
+                entry["max"] = max(entry["max"], count)
+
+    def _refresh(self):
+        if self.root is None:
+            return
+        try:
+            self.count_canvas_items()
+            now = time.perf_counter()
+            frames = get_clock(self.root).frames
+            self.fps = (frames - self._last_frames) / max(now - self._last_refresh, 1e-6)
+            self._last_frames = frames
+            self._last_refresh = now
+            self._show_overlay()
+            self.root.after(OVERLAY_REFRESH_MS, self._refresh)
+        except tk.TclError:
+            # Головне вікно закрито
+            self.root = None
+
+    def _show_overlay(self):
+        if self._overlay is None or not self._overlay.winfo_exists():
+            self._overlay = tk.Label(
+                self.root, font=("Courier", 9), bg="#000000", fg="#00ff88", justify=tk.LEFT, anchor="nw"
+            )
+            self._overlay.place(relx=1.0, y=0, anchor="ne")
+        self._overlay.lift()
+        self._overlay.config(text=self.overlay_text())
+
+    def overlay_text(self, top: int = 5) -> str:
+        report = self.callbacks()
+        frame = report.get("AnimationClock._tick", {})
+        items = sum(entry["current"] for entry in self.canvas_items.values())
+        lines = [
+            f"FPS {self.fps:5.1f}  кадр p95 {frame.get('p95_ms', 0.0):.1f} мс",
+            f"елементів canvas: {items}  таймерів: {sum(outstanding().values())}",
+        ]
+        slowest = sorted(report.items(), key=lambda item: -item[1]["p95_ms"])[:top]
+        for name, entry in slowest:
+            lines.append(f"{name[-28:]:<28} p95 {entry['p95_ms']:6.1f} max {entry['max_ms']:6.1f}")
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------ #
+    # Звіт
+    # ------------------------------------------------------------------ #
+    def callbacks(self) -> Dict[str, Dict[str, float]]:
+        """Зведення по колбеках (кешовані, поки колбек не викликався знову)."""
+        return {name: timing.summary() for name, timing in self.timings.items()}
+
+    def report(self) -> Dict[str, object]:
+        result = {"callbacks": self.callbacks(), "canvas_items": self.canvas_items, "timers": outstanding(), "ai_caches": cache_stats()}
+        if self.root is not None:
+            try:
+                result["clock"] = get_clock(self.root).stats()
+            except tk.TclError:
+                pass
+        return result
+
+    def dump(self, path: Optional[str] = None) -> str:
+        path = path or self.output
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, ensure_ascii=False, indent=2)
+        return path
+
+
+def install_from_args(root: tk.Tk, argv: Optional[Sequence[str]] = None) -> Optional[Profiler]:
+    """Вмикає профілювання, якщо його запитано; інакше нічого не робить."""
+    path = output_path(argv)
+    if path is None:
+        return None
+    profiler = Profiler(path)
+    profiler.install(root)
+    return profiler
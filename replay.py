@@ -0,0 +1,377 @@
+"""Компактний двійковий запис партії та його відтворення.
+
+Формат (усі числа — беззнакові varint, LEB128):
+    MAGIC (4 байти), розмір поля, зерно GameRNG, кількість кораблів і їхні
+    розміри; далі події до кінця файлу. Подія — один байт тегу (старші біти —
+    тип, молодші — чиє поле, влучання, потоплення, орієнтація) і номер
+    клітинки y * size + x; розміщення має ще розмір корабля.
+
+Партія 10x10 займає близько 300 байтів. Replay відновлює обидва поля на
+будь-якому кроці: кожні KEYFRAME_INTERVAL подій зберігається знімок полів,
+тож seek — бінарний пошук знімка і не більше KEYFRAME_INTERVAL подій.
+
+Приклад:
+    python replay.py game.bsr --turn 40
+"""
+from bisect import bisect_right
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import os
+import sys
+import time
+
+from Board import Board, CellState, Orientation
+from game_engine import COMPUTER, PLAYER, GameEngine, GameEvent, KrakenRules, RocketRules, strike_area
+from zobrist import board_hash
+
+MAGIC = b"BSR1"
+EXTENSION = ".bsr"
+KEYFRAME_INTERVAL = 32
+ENV_VAR = "BATTLESHIP_REPLAY_DIR"
+
+# Тип події — старші 4 біти тегу
+KIND_PLACE = 0x10
+KIND_SHOT = 0x20
+KIND_ROCKET = 0x30
+KIND_KRAKEN = 0x40
+KIND_END = 0x50
+KIND_MASK = 0xF0
+
+# Прапорці — молодші 4 біти
+FLAG_COMPUTER = 0x01   # поле комп'ютера (для END — переміг комп'ютер)
+FLAG_HIT = 0x02
+FLAG_SUNK = 0x04
+FLAG_VERTICAL = 0x08   # лише для KIND_PLACE
+
+KIND_NAMES = {
+    KIND_PLACE: "place",
+    KIND_SHOT: "shot",
+    KIND_ROCKET: "rocket",
+    KIND_KRAKEN: "kraken",
+    KIND_END: "end",
+}
+KIND_CODES = {name: code for code, name in KIND_NAMES.items()}
+
+
+class ReplayError(ValueError):
+    """Пошкоджений або не той файл запису."""
+
+
+def write_varint(out: bytearray, value: int):
+    if value < 0:
+        raise ValueError(f"varint не може бути від'ємним: {value}")
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Повертає (значення, позиція після нього)."""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("запис обірвано посеред числа")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class ReplayHeader(NamedTuple):
+    board_size: int
+    seed: int
+    ship_sizes: Tuple[int, ...]
+
+    def encode(self) -> bytes:
+        out = bytearray(MAGIC)
+        write_varint(out, self.board_size)
+        write_varint(out, self.seed)
+        write_varint(out, len(self.ship_sizes))
+        for size in self.ship_sizes:
+            write_varint(out, size)
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes, pos: int = 0) -> Tuple["ReplayHeader", int]:
+        if data[pos:pos + len(MAGIC)] != MAGIC:
+            raise ReplayError("це не запис партії (невідомий заголовок)")
+        pos += len(MAGIC)
+        board_size, pos = read_varint(data, pos)
+        seed, pos = read_varint(data, pos)
+        count, pos = read_varint(data, pos)
+        sizes = []
+        for _ in range(count):
+            size, pos = read_varint(data, pos)
+            sizes.append(size)
+        return cls(board_size, seed, tuple(sizes)), pos
+
+
+class ReplayEvent(NamedTuple):
+    """Одна подія запису; target — чиє поле змінилось (для end — переможець)."""
+    kind: str
+    target: str
+    x: int = -1
+    y: int = -1
+    hit: bool = False
+    sunk: bool = False
+    size: int = 0
+    vertical: bool = False
+
+
+def encode_event(out: bytearray, event: ReplayEvent, board_size: int):
+    kind = KIND_CODES[event.kind]
+    tag = kind
+    if event.target == COMPUTER:
+        tag |= FLAG_COMPUTER
+    if event.hit:
+        tag |= FLAG_HIT
+    if event.sunk:
+        tag |= FLAG_SUNK
+    if event.vertical:
+        tag |= FLAG_VERTICAL
+    out.append(tag)
+    if kind == KIND_END:
+        return
+    write_varint(out, event.y * board_size + event.x)
+    if kind == KIND_PLACE:
+        write_varint(out, event.size)
+
+
+def iter_events(data: bytes, pos: int, board_size: int, end: Optional[int] = None) -> Iterator[ReplayEvent]:
+    """Декодує події з data[pos:end] (типово — до кінця data) або до події end.
+
+    data може бути mmap чи memoryview: події читаються на місці, без копії."""
+    end = len(data) if end is None else end
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        kind = KIND_NAMES.get(tag & KIND_MASK)
+        if kind is None:
+            raise ReplayError(f"невідомий тег події 0x{tag:02x}")
+        target = COMPUTER if tag & FLAG_COMPUTER else PLAYER
+        if kind == "end":
+            yield ReplayEvent(kind, target)
+            return
+        cell, pos = read_varint(data, pos)
+        size = 0
+        if kind == "place":
+            size, pos = read_varint(data, pos)
+        yield ReplayEvent(
+            kind, target, cell % board_size, cell // board_size,
+            bool(tag & FLAG_HIT), bool(tag & FLAG_SUNK), size, bool(tag & FLAG_VERTICAL),
+        )
+
+
+class ReplayWriter:
+    """Підписник GameEngine, що дописує кожну зміну полів у двійковий запис.
+
+    Заголовок пишеться одразу, розстановка обох флотів — на події start.
+    Якщо передано шлях, файл відкривається тут і закривається після
+    game_over або close()."""
+
+    def __init__(self, engine: GameEngine, stream: BinaryIO):
+        self.engine = engine
+        self.stream = stream
+        self.path: Optional[str] = None
+        self._owns_stream = False
+        self.header = ReplayHeader(engine.board_size, engine.rng.seed_value, tuple(engine.ship_sizes))
+        self.bytes_written = 0
+        self._write(self.header.encode())
+        engine.subscribe(self.on_event)
+
+    @classmethod
+    def to_file(cls, engine: GameEngine, path: str) -> "ReplayWriter":
+        stream = open(path, "wb")
+        try:
+            writer = cls(engine, stream)
+        except BaseException:
+            # Незаписаний заголовок — не запис: не лишаємо ні відкритого файлу, ні порожнього
+            stream.close()
+            os.remove(path)
+            raise
+        writer._owns_stream = True
+        writer.path = path
+        return writer
+
+    def _write(self, data: bytes):
+        self.stream.write(data)
+        self.bytes_written += len(data)
+
+    def on_event(self, event: GameEvent):
+        size = self.header.board_size
+        out = bytearray()
+        if event.kind == "start":
+            for owner, board in ((PLAYER, self.engine.player_board), (COMPUTER, self.engine.computer_board)):
+                for ship in board.ships:
+                    x, y = ship.position
+                    encode_event(out, ReplayEvent(
+                        "place", owner, x, y, size=ship.size,
+                        vertical=ship.orientation == Orientation.VERTICAL,
+                    ), size)
+        elif event.kind in ("shot", "rocket", "kraken"):
+            encode_event(out, ReplayEvent(event.kind, event.target, event.x, event.y, event.hit, event.sunk), size)
+        elif event.kind == "game_over":
+            encode_event(out, ReplayEvent("end", event.actor), size)
+        if out:
+            self._write(bytes(out))
+        if event.kind == "game_over":
+            self.close()
+
+    def close(self):
+        self.engine.unsubscribe(self.on_event)
+        if self._owns_stream and not self.stream.closed:
+            self.stream.close()
+
+
+def record_game(engine: GameEngine, directory: str) -> ReplayWriter:
+    """Починає запис партії engine у новий файл каталогу directory."""
+    os.makedirs(directory, exist_ok=True)
+    stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{engine.rng.seed_value}"
+    path = os.path.join(directory, stem + EXTENSION)
+    # Кілька партій з тим самим зерном за одну секунду не перезаписують одна одну
+    index = 1
+    while os.path.exists(path):
+        index += 1
+        path = os.path.join(directory, f"{stem}-{index}{EXTENSION}")
+    return ReplayWriter.to_file(engine, path)
+
+
+def replay_dir_from_args(argv: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Каталог записів з прапорця --replay-dir=DIR або змінної BATTLESHIP_REPLAY_DIR."""
+    for arg in argv or ():
+        if arg.startswith("--replay-dir="):
+            return arg.split("=", 1)[1] or None
+    return os.environ.get(ENV_VAR) or None
+
+
+class _Keyframe(NamedTuple):
+    # Стан обох полів: (клітинки, відкриті, влучання кораблів)
+    boards: Tuple[Tuple[bytes, bytes, Tuple[int, ...]], ...]
+
+
+class Replay:
+    """Відтворення запису: поля обох гравців після будь-якої кількості подій."""
+
+    def __init__(self, data: bytes, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.header, pos = ReplayHeader.decode(data)
+        self.events: List[ReplayEvent] = list(iter_events(data, pos, self.header.board_size))
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._rockets = RocketRules(self.header.board_size)
+        self._kraken = KrakenRules(self.header.board_size)
+
+        # Розміщення кораблів (усі на початку запису) і знімки після кожних keyframe_interval подій
+        self._placements = [event for event in self.events if event.kind == "place"]
+        self._keyframe_turns: List[int] = []
+        self._keyframes: List[_Keyframe] = []
+        self._build_keyframes()
+
+    @classmethod
+    def load(cls, path: str, keyframe_interval: int = KEYFRAME_INTERVAL) -> "Replay":
+        with open(path, "rb") as handle:
+            return cls(handle.read(), keyframe_interval)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def winner(self) -> Optional[str]:
+        if self.events and self.events[-1].kind == "end":
+            return self.events[-1].target
+        return None
+
+    def _new_boards(self) -> Tuple[Board, Board]:
+        return (
+            Board(self.header.board_size, list(self.header.ship_sizes)),
+            Board(self.header.board_size, list(self.header.ship_sizes)),
+        )
+
+    def _apply(self, boards: Tuple[Board, Board], event: ReplayEvent):
+        board = boards[1] if event.target == COMPUTER else boards[0]
+        if event.kind == "place":
+            orientation = Orientation.VERTICAL if event.vertical else Orientation.HORIZONTAL
+            board.place_ship(event.size, event.x, event.y, orientation)
+        elif event.kind == "shot":
+            board.attack(event.x, event.y)
+        elif event.kind == "rocket":
+            strike_area(board, self._rockets.blast_cells(event.x, event.y))
+        elif event.kind == "kraken":
+            strike_area(board, self._kraken.attack_cells(event.x, event.y))
+
+    @staticmethod
+    def _snapshot(board: Board) -> Tuple[bytes, bytes, Tuple[int, ...]]:
+        return (
+            bytes(cell.value for row in board.grid for cell in row),
+            bytes(revealed for row in board.revealed for revealed in row),
+            tuple(ship.hits for ship in board.ships),
+        )
+
+    def _restore(self, boards: Tuple[Board, Board], keyframe: _Keyframe):
+        size = self.header.board_size
+        for board, (cells, revealed, hits) in zip(boards, keyframe.boards):
+            for y in range(size):
+                row = y * size
+                board.grid[y] = [CellState(value) for value in cells[row:row + size]]
+                board.revealed[y] = [bool(value) for value in revealed[row:row + size]]
+            for ship, ship_hits in zip(board.ships, hits):
+                ship.hits = ship_hits
+            # Поля змінено напряму, повз attack
+            board.zobrist = board_hash(board)
+
+    def _build_keyframes(self):
+        boards = self._new_boards()
+        for turn, event in enumerate(self.events, 1):
+            self._apply(boards, event)
+            if turn % self.keyframe_interval == 0:
+                self._keyframe_turns.append(turn)
+                self._keyframes.append(_Keyframe(tuple(self._snapshot(board) for board in boards)))
+
+    def boards_at(self, turn: int) -> Tuple[Board, Board]:
+        """Поля (гравця, комп'ютера) після перших turn подій запису."""
+        turn = max(0, min(turn, len(self.events)))
+        boards = self._new_boards()
+        index = bisect_right(self._keyframe_turns, turn) - 1
+        start = 0
+        if index >= 0:
+            start = self._keyframe_turns[index]
+            # Кораблі ставляться на самому початку, тож знімок їх уже містить
+            for event in self._placements[:start]:
+                self._apply(boards, event)
+            self._restore(boards, self._keyframes[index])
+        for event in self.events[start:turn]:
+            self._apply(boards, event)
+        return boards
+
+
+def render_board(board: Board, show_ships: bool = True) -> str:
+    symbols = {CellState.EMPTY: ".", CellState.SHIP: "#" if show_ships else ".", CellState.HIT: "X", CellState.MISS: "o"}
+    return "\n".join("".join(symbols[cell] for cell in row) for row in board.grid)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Перегляд двійкового запису партії")
+    parser.add_argument("path", help="файл запису (.bsr)")
+    parser.add_argument("--turn", type=int, default=None, help="показати поля після N подій (типово — кінець)")
+    args = parser.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.path)
+    except (OSError, ReplayError) as error:
+        print(f"Не вдалося прочитати запис: {error}", file=sys.stderr)
+        return 2
+
+    turn = len(replay) if args.turn is None else args.turn
+    header = replay.header
+    print(f"Поле {header.board_size}x{header.board_size}, зерно {header.seed}, подій {len(replay)}, "
+          f"переможець: {replay.winner or '—'}")
+    player, computer = replay.boards_at(turn)
+    print(f"\nПісля {min(turn, len(replay))} подій — гравець:\n{render_board(player)}")
+    print(f"\nКомп'ютер:\n{render_board(computer)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""Архів двійкових записів партій для великих турнірів і самогри.
+
+Файл архіву (.bsa) лише дописується: MAGIC, далі записи
+    varint довжина game_id, game_id (UTF-8), varint довжина запису, запис .bsr.
+Поруч лежить індекс (<архів>.idx): для кожної партії зсув і довжина запису
+та game_id. Архів читається через mmap, тож ітерація й доступ до партії за
+game_id не завантажують файл у пам'ять. Якщо запис перервано посеред партії,
+ArchiveWriter при наступному відкритті обрізає недописаний хвіст і
+добудовує індекс скануванням архіву.
+
+Приклади:
+    python replay_archive.py list games.bsa
+    python replay_archive.py show games.bsa 10/classic/hard/easy/3 --turn 40
+    python replay_archive.py heatmap games.bsa --size 10
+"""
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from game_engine import COMPUTER, PLAYER
+from replay import Replay, ReplayError, ReplayEvent, ReplayHeader, iter_events, read_varint, render_board, write_varint
+
+MAGIC = b"BSA1"
+INDEX_MAGIC = b"BSI1"
+EXTENSION = ".bsa"
+INDEX_SUFFIX = ".idx"
+
+# Запис індексу: зсув запису в архіві, довжина запису, довжина game_id
+_INDEX_ENTRY = struct.Struct("<QIH")
+
+
+class ArchiveEntry(NamedTuple):
+    game_id: str
+    offset: int
+    length: int
+
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _scan(data, pos: int) -> Tuple[List[ArchiveEntry], int]:
+    """Повні записи архіву з позиції pos; повертає їх і кінець останнього повного запису."""
+    entries = []
+    end = len(data)
+    while pos < end:
+        try:
+            id_length, cursor = read_varint(data, pos)
+            game_id = bytes(data[cursor:cursor + id_length]).decode("utf-8")
+            cursor += id_length
+            length, cursor = read_varint(data, cursor)
+        except (ReplayError, UnicodeDecodeError):
+            break
+        if cursor + length > end:
+            break
+        entries.append(ArchiveEntry(game_id, cursor, length))
+        pos = cursor + length
+    return entries, pos
+
+
+def _read_index(path: str) -> List[ArchiveEntry]:
+    """Записи індексу; недописаний останній запис відкидається."""
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        return []
+    if data[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        return []
+    entries = []
+    pos = len(INDEX_MAGIC)
+    while pos + _INDEX_ENTRY.size <= len(data):
+        offset, length, id_length = _INDEX_ENTRY.unpack_from(data, pos)
+        pos += _INDEX_ENTRY.size
+        if pos + id_length > len(data):
+            break
+        entries.append(ArchiveEntry(data[pos:pos + id_length].decode("utf-8"), offset, length))
+        pos += id_length
+    return entries
+
+
+def _encode_index_entry(entry: ArchiveEntry) -> bytes:
+    game_id = entry.game_id.encode("utf-8")
+    return _INDEX_ENTRY.pack(entry.offset, entry.length, len(game_id)) + game_id
+
+
+def _load_entries(path: str, data) -> Tuple[List[ArchiveEntry], int, bool]:
+    """Індекс архіву, звірений з самим архівом.
+
+    Повертає (записи, кінець останнього повного запису, чи довелось
+    досканувати архів — тоді індекс на диску застарів)."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ReplayError("це не архів записів (невідомий заголовок)")
+    entries = _read_index(index_path(path))
+    end = len(MAGIC)
+    if entries:
+        last = entries[-1]
+        if last.offset + last.length <= len(data):
+            end = last.offset + last.length
+        else:
+            entries = []
+    tail, scanned_end = _scan(data, end)
+    return entries + tail, scanned_end, bool(tail) or scanned_end != len(data)
+
+
+class ReplayArchive:
+    """Читання архіву через mmap: ітерація партій і доступ за game_id."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            self.entries, _, _ = _load_entries(path, self._data)
+        except ReplayError:
+            self.close()
+            raise
+        self._by_id: Dict[str, ArchiveEntry] = {entry.game_id: entry for entry in self.entries}
+
+    def __enter__(self) -> "ReplayArchive":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._by_id
+
+    def ids(self) -> List[str]:
+        return [entry.game_id for entry in self.entries]
+
+    def data(self, game_id: str) -> bytes:
+        """Байти запису .bsr партії game_id (копіюється лише ця партія)."""
+        entry = self._by_id.get(game_id)
+        if entry is None:
+            raise KeyError(game_id)
+        return self._data[entry.offset:entry.offset + entry.length]
+
+    def header(self, game_id: str) -> ReplayHeader:
+        entry = self._by_id.get(game_id)
+        if entry is None:
+            raise KeyError(game_id)
+        return ReplayHeader.decode(self._data, entry.offset)[0]
+
+    def replay(self, game_id: str) -> Replay:
+        return Replay(self.data(game_id))
+
+    def iter_records(self) -> Iterator[Tuple[str, ReplayHeader, Iterator[ReplayEvent]]]:
+        """(game_id, заголовок, події) для кожної партії в порядку запису."""
+        for entry in self.entries:
+            header, pos = ReplayHeader.decode(self._data, entry.offset)
+            yield entry.game_id, header, iter_events(self._data, pos, header.board_size, entry.offset + entry.length)
+
+    def iter_games(self) -> Iterator[Tuple[str, Iterator[ReplayEvent]]]:
+        """(game_id, події) для кожної партії; події декодуються ліниво прямо з mmap."""
+        for game_id, _, events in self.iter_records():
+            yield game_id, events
+
+
+class ArchiveWriter:
+    """Дописує записи партій в архів і його індекс.
+
+    Партії, що вже є в архіві, пропускаються — так повторний запуск
+    турніру не дублює партії, записані перед перериванням."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as handle:
+                handle.write(MAGIC)
+            with open(index_path(path), "wb") as handle:
+                handle.write(INDEX_MAGIC)
+            entries: List[ArchiveEntry] = []
+        else:
+            with open(path, "rb") as handle:
+                data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    entries, end, stale = _load_entries(path, data)
+                finally:
+                    data.close()
+            if stale:
+                self._repair(entries, end)
+
+        self._ids = {entry.game_id for entry in entries}
+        self._data: BinaryIO = open(path, "ab")
+        self._index: BinaryIO = open(index_path(path), "ab")
+        self._end = self._data.tell()
+        self.appended = 0
+
+    def _repair(self, entries: List[ArchiveEntry], end: int):
+        """Обрізає недописаний хвіст архіву і переписує індекс."""
+        with open(self.path, "rb+") as handle:
+            handle.truncate(end)
+        with open(index_path(self.path), "wb") as handle:
+            handle.write(INDEX_MAGIC)
+            for entry in entries:
+                handle.write(_encode_index_entry(entry))
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._ids
+
+    def append(self, game_id: str, data: bytes) -> bool:
+        """Дописує запис партії; False, якщо game_id уже є в архіві."""
+        if game_id in self._ids:
+            return False
+        encoded_id = game_id.encode("utf-8")
+        prefix = bytearray()
+        write_varint(prefix, len(encoded_id))
+        prefix += encoded_id
+        write_varint(prefix, len(data))
+
+        entry = ArchiveEntry(game_id, self._end + len(prefix), len(data))
+        # Спершу архів, потім індекс: індекс ніколи не вказує на недописаний запис
+        self._data.write(prefix)
+        self._data.write(data)
+        self._data.flush()
+        self._index.write(_encode_index_entry(entry))
+        self._index.flush()
+
+        self._end = entry.offset + entry.length
+        self._ids.add(game_id)
+        self.appended += 1
+        return True
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+
+class Heatmap(NamedTuple):
+    """Постріли та влучання по клітинках полів одного розміру."""
+    board_size: int
+    games: int
+    shots: List[List[int]]
+    hits: List[List[int]]
+
+    def hit_rate(self, x: int, y: int) -> float:
+        shots = self.shots[y][x]
+        return self.hits[y][x] / shots if shots else 0.0
+
+
+def hit_heatmaps(archive: ReplayArchive, target: Optional[str] = None) -> Dict[int, Heatmap]:
+    """Теплові карти пострілів і влучань за один прохід архівом, окремо для кожного розміру поля.
+
+    Враховуються звичайні постріли по полю target (None — по обох полях);
+    удари ракет і кракена зачіпають кілька клітинок і сюди не входять."""
+    maps: Dict[int, Heatmap] = {}
+    for _, header, events in archive.iter_records():
+        size = header.board_size
+        heatmap = maps.get(size)
+        if heatmap is None:
+            heatmap = maps[size] = Heatmap(size, 0, [[0] * size for _ in range(size)], [[0] * size for _ in range(size)])
+        shots, hits = heatmap.shots, heatmap.hits
+        for event in events:
+            if event.kind != "shot" or (target is not None and event.target != target):
+                continue
+            shots[event.y][event.x] += 1
+            if event.hit:
+                hits[event.y][event.x] += 1
+        maps[size] = heatmap._replace(games=heatmap.games + 1)
+    return maps
+
+
+def render_heatmap(heatmap: Heatmap) -> str:
+    """Частка влучань у відсотках для кожної клітинки."""
+    return "\n".join(
+        " ".join(f"{heatmap.hit_rate(x, y) * 100:3.0f}" for x in range(heatmap.board_size))
+        for y in range(heatmap.board_size)
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Архів записів партій морського бою")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="перелік партій архіву")
+    list_parser.add_argument("path", help="файл архіву (.bsa)")
+
+    show_parser = commands.add_parser("show", help="поля партії на вибраному кроці")
+    show_parser.add_argument("path", help="файл архіву (.bsa)")
+    show_parser.add_argument("game_id", help="ідентифікатор партії")
+    show_parser.add_argument("--turn", type=int, default=None, help="показати поля після N подій (типово — кінець)")
+
+    heatmap_parser = commands.add_parser("heatmap", help="частка влучань по клітинках за всіма партіями")
+    heatmap_parser.add_argument("path", help="файл архіву (.bsa)")
+    heatmap_parser.add_argument("--size", "-s", type=int, default=None, help="лише поля цього розміру")
+    heatmap_parser.add_argument("--target", choices=[PLAYER, COMPUTER], default=None,
+                                help="лише постріли по полю гравця або комп'ютера")
+    args = parser.parse_args(argv)
+
+    try:
+        archive = ReplayArchive(args.path)
+    except (OSError, ReplayError) as error:
+        print(f"Не вдалося відкрити архів: {error}", file=sys.stderr)
+        return 2
+
+    with archive:
+        if args.command == "list":
+            for game_id, header, _ in archive.iter_records():
+                print(f"{game_id}\t{header.board_size}x{header.board_size}\tзерно {header.seed}")
+            print(f"Усього партій: {len(archive)}")
+
+        elif args.command == "show":
+            if args.game_id not in archive:
+                print(f"Партії {args.game_id} немає в архіві", file=sys.stderr)
+                return 2
+            replay = archive.replay(args.game_id)
+            turn = len(replay) if args.turn is None else args.turn
+            player, computer = replay.boards_at(turn)
+            print(f"{args.game_id}: подій {len(replay)}, переможець: {replay.winner or '—'}")
+            print(f"\nПісля {min(turn, len(replay))} подій — гравець:\n{render_board(player)}")
+            print(f"\nКомп'ютер:\n{render_board(computer)}")
+
+        else:
+            maps = hit_heatmaps(archive, args.target)
+            for size in sorted(maps):
+                if args.size is not None and size != args.size:
+                    continue
+                heatmap = maps[size]
+                total_shots = sum(map(sum, heatmap.shots))
+                total_hits = sum(map(sum, heatmap.hits))
+                print(f"Поле {size}x{size}: {heatmap.games} партій, {total_shots} пострілів, {total_hits} влучань")
+                print(render_heatmap(heatmap))
+                print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
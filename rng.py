@@ -0,0 +1,59 @@
+"""Детермінований генератор випадкових чисел гри.
+
+Усі випадкові рішення партії (розстановка флоту, ходи AI, ракети, кракен,
+репліки, ефекти) беруть числа з одного GameRNG, а не з глобального модуля
+random. Кожна підсистема отримує власний потік через split(name): потік
+залежить лише від зерна гри та назви, тож зайвий виклик в одній підсистемі
+не зсуває послідовності інших, а партію можна точно відтворити за зерном.
+"""
+from typing import Dict, Optional, Sequence
+import hashlib
+import os
+import random
+
+ENV_VAR = "BATTLESHIP_SEED"
+# Зерно — беззнакове 64-бітне число (так його пишуть записи партій replay.py)
+SEED_MASK = (1 << 64) - 1
+
+
+def derive_seed(seed: int, name: str) -> int:
+    """Зерно потоку name; однакове в усіх процесах (на відміну від hash())."""
+    digest = hashlib.blake2b(f"{seed}/{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class GameRNG(random.Random):
+    """random.Random із запам'ятованим зерном і незалежними потоками.
+
+    Без зерна бере його з ентропії системи, тож навіть така партія
+    відтворюється за значенням seed. Від'ємне або завелике зерно береться за
+    модулем 2**64 (--seed=-1 — те саме, що 2**64 - 1)."""
+
+    def __init__(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        seed &= SEED_MASK
+        self.seed_value = seed
+        self._streams: Dict[str, "GameRNG"] = {}
+        super().__init__(seed)
+
+    def split(self, name: str) -> "GameRNG":
+        """Потік підсистеми name; повторний виклик повертає той самий потік."""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = GameRNG(derive_seed(self.seed_value, name))
+        return stream
+
+    def __repr__(self) -> str:
+        return f"GameRNG(seed={self.seed_value})"
+
+
+def seed_from_args(argv: Optional[Sequence[str]] = None) -> Optional[int]:
+    """Зерно з прапорця --seed=N або змінної середовища BATTLESHIP_SEED."""
+    for index, arg in enumerate(argv or ()):
+        if arg.startswith("--seed="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--seed" and index + 1 < len(argv):
+            return int(argv[index + 1])
+    value = os.environ.get(ENV_VAR, "")
+    return int(value) if value else None
@@ -1,16 +1,18 @@
 # rockets.py
-import random
 import tkinter as tk
 from typing import Optional, Tuple, Set, Callable
 
+from timers import TimerRegistry
+
 
 class RocketsManager:
     """
     Менеджер ракет для BattleshipGame.
     - Підтримує ручне розміщення 'ракеть' гравцем під час фази setup (опційно).
     - Дозволяє кидати ракету під час гри (1x1 на 6x6 або 3x3 на більших полях).
-    - Підтримує ракети противника (приховані).
     - Малює тимчасовий ефект вибуху на canvas.
+    Самі правила (ліміти, радіус, ракети противника) живуть у
+    game_engine.RocketRules, а кидки виконує GameEngine.
     """
 
     def __init__(
@@ -24,19 +26,23 @@ class RocketsManager:
     ):
         self.game = game
         self.root = root
+        # відкладене очищення вибухів; скасовується при виході в меню
+        self.timers = TimerRegistry(root, "rockets")
         self.player_canvas = player_canvas
         self.computer_canvas = computer_canvas
         self.board_size = board_size
 
-        # кількість ракет залежно від розміру поля (за замовчуванням)
-        default = {6: 2, 10: 3, 14: 4}
-        self.rockets_limit = rockets_limit_map if rockets_limit_map else default
-        self.rockets_limit_count = self.rockets_limit.get(board_size, 3)
+        # правила ракет беремо з ігрового рушія
+        self.engine = game.engine
+        self.rules = self.engine.rockets
+        if rockets_limit_map:
+            self.rules.limits = rockets_limit_map
+            self.rules.limit = rockets_limit_map.get(board_size, 3)
+        self.rockets_limit = self.rules.limits
+        self.rockets_limit_count = self.rules.limit
 
         # зберігаємо координати "розміщених" ракет гравця як множину (можна не використовувати)
         self.player_rockets: Set[Tuple[int, int]] = set()
-        # ракети комп'ютера (якщо хочеш — можна розміщати приховано)
-        self.computer_rockets: Set[Tuple[int, int]] = set()
 
         # режими: None, "placing" (розміщення гравцем), "throw" (кидання під час ходу)
         self.mode: Optional[str] = None
@@ -56,10 +62,13 @@ class RocketsManager:
         # прив'язка до гри
         setattr(self.game, "rockets_manager", self)
 
-        # лічильник використаних ракет гравцем
-        if not hasattr(self.game, "player_rockets_used"):
-            self.game.player_rockets_used = []
+        # вибухи малюємо за подіями рушія (і для гравця, і для комп'ютера)
+        self.engine.subscribe(self._on_engine_event)
 
+    @property
+    def computer_rockets(self) -> Set[Tuple[int, int]]:
+        """Приховані ракети комп'ютера."""
+        return self.rules.computer_rockets
 
     def start_placing(self):
         if self.game.game_phase != "setup":
@@ -100,16 +109,8 @@ class RocketsManager:
     # Розміщення ракет комп'ютера (приховано)
     # ------------------------
     def place_computer_rockets_random(self):
-        """Розставляє приховані ракети комп'ютера."""
-        attempts = 0
-        while len(self.computer_rockets) < self.rockets_limit_count and attempts < 5000:
-            x = random.randint(0, self.board_size - 1)
-            y = random.randint(0, self.board_size - 1)
-            # тільки на пусті клітинки (не поверх кораблів)
-            if self.game.computer_board.grid[y][x] == self.game.computer_board.grid[y][x].__class__.EMPTY:
-                if (x, y) not in self.computer_rockets:
-                    self.computer_rockets.add((x, y))
-            attempts += 1
+        """Розставляє приховані ракети комп'ютера (GameEngine.start робить це сам)."""
+        self.rules.place_computer_rockets(self.game.computer_board)
 
     # ------------------------
     # Кидок ракети під час ходу
@@ -128,61 +129,36 @@ class RocketsManager:
         self.game.update_info_label()
 
     def rockets_remaining_for_player(self) -> int:
-        used = len(getattr(self.game, "player_rockets_used", []))
-        return max(0, self.rockets_limit_count - used)
-
-    def _use_player_rocket(self):
-        self.game.player_rockets_used.append(True)
+        return self.rules.player_remaining()
 
     def _get_rocket_radius(self) -> int:
         """Повертає 'radius' у клітинках: radius=0 => 1x1; radius=1 => 3x3"""
-        return 0 if self.board_size == 6 else 1
+        return self.rules.radius
 
     def throw_rocket_at(self, target_board_name: str, x: int, y: int):
         """
-        Виконує логіку вибуху: якщо radius=0 => 1x1, інакше 3x3.
+        Кидає ракету гравця по полю комп'ютера через GameEngine.
         Повертає (hit_any, coords_hit) як і старий модуль.
+        Ракети комп'ютера кидає сам рушій у GameEngine.step.
         """
-        if target_board_name == "computer":
-            board = self.game.computer_board
-        else:
-            board = self.game.player_board
-
-        radius = self._get_rocket_radius()
-        hit_any = False
-        coords_hit = []
-
-        for dy in range(-radius, radius + 1):
-            for dx in range(-radius, radius + 1):
-                tx = x + dx
-                ty = y + dy
-                if 0 <= tx < self.board_size and 0 <= ty < self.board_size:
-                    if not board.revealed[ty][tx]:
-                        hit, sunk, ship = board.attack(tx, ty)
-                        board.revealed[ty][tx] = True
-                        coords_hit.append((tx, ty, hit))
-                        if hit:
-                            hit_any = True
-
+        if target_board_name != "computer":
+            return False, []
+        event = self.engine.player_rocket(x, y)
+        if event is None:
+            return False, []
+        return event.hit, list(event.cells)
+
+    def _on_engine_event(self, event):
+        if event.kind != "rocket":
+            return
         # анімація вибуху на canvas (область залежить від radius)
-        target_canvas = self.computer_canvas if target_board_name == "computer" else self.player_canvas
-        self._animate_explosion(target_canvas, x, y, radius)
-
-        # якщо кидала гравець — відмічаємо використання
-        if target_board_name == "computer":
-            self._use_player_rocket()
-
-        # якщо кидала AI і була ракета з computer_rockets, видаляємо її
-        if target_board_name == "player":
-            # якщо там була ракета комп'ютера — видалимо
-            if (x, y) in self.computer_rockets:
-                self.computer_rockets.remove((x, y))
+        target_canvas = self.computer_canvas if event.target == "computer" else self.player_canvas
+        self._animate_explosion(target_canvas, event.x, event.y, event.size)
+        self._update_rockets_label()
 
         # колбек для оновлення UI/логіки
         if self.on_rocket_thrown_callback:
-            self.on_rocket_thrown_callback(target_board_name, x, y, radius)
-
-        return hit_any, coords_hit
+            self.on_rocket_thrown_callback(event.target, event.x, event.y, event.size)
 
     # ------------------------
     # Графіка
@@ -251,7 +227,7 @@ class RocketsManager:
             except tk.TclError:
                 pass
 
-        self.root.after(800, clear)
+        self.timers.after(800, clear)
 
     # ------------------------
     # UI: кнопка та лічильник
@@ -287,8 +263,7 @@ class RocketsManager:
         self._update_rockets_label()
 
     def _update_rockets_label(self):
-        used = len(getattr(self.game, "player_rockets_used", []))
-        remaining = max(0, self.rockets_limit_count - used)
+        remaining = self.rules.player_remaining()
         if self.rockets_label:
             self.rockets_label.config(text=f"×{remaining}")
         if self.rocket_button:
@@ -296,41 +271,3 @@ class RocketsManager:
                 self.rocket_button.config(state=tk.DISABLED)
             else:
                 self.rocket_button.config(state=tk.NORMAL)
-
-    # ------------------------
-    # AI: комп'ютер використовує ракети
-    # ------------------------
-    def ai_maybe_throw(self):
-        """
-        Викликається під час ходу комп'ютера — з певним шансом комп кидає ракету.
-        Повертає True якщо була кинута ракета і вона влучила хоча б в одну клітинку (hit_any).
-        """
-        # комп'ютер кидає ракету тільки якщо у нього є хоча б одна (комп'ютер_ракетки)
-        if not self.computer_rockets and len(self.computer_rockets) == 0:
-            # якщо комп'ютер не мав попередньо розставлених ракет, даємо йому шанс кинути випадкову,
-            # але обмежимо загальну кількість ходів: імплементуємо шанс лише коли рандом пройшов.
-            # Тут логіка: якщо є ліміт, комп може створити тимчасову ракету та кинути її.
-            # шанс кидка
-            chance = 0.15  # 15% шанс кинути випадкову ракету
-            if random.random() > chance:
-                return False
-            # обираємо випадкову ціль
-            tx = random.randint(0, self.board_size - 1)
-            ty = random.randint(0, self.board_size - 1)
-            hit_any, _ = self.throw_rocket_at("player", tx, ty)
-            return hit_any
-
-        # якщо комп'ютер розставив свої ракети при старті — використовує одну з них із імовірністю
-        if self.computer_rockets:
-            # шанс використання ракети зараз (наприклад 25%)
-            if random.random() > 0.25:
-                return False
-            tx, ty = random.choice(tuple(self.computer_rockets))
-            # виконуємо вибух на позиції ракети
-            hit_any, _ = self.throw_rocket_at("player", tx, ty)
-            # після використання видаляємо її
-            if (tx, ty) in self.computer_rockets:
-                self.computer_rockets.remove((tx, ty))
-            return hit_any
-
-        return False
@@ -0,0 +1,304 @@
+from concurrent.futures import BrokenExecutor, CancelledError, Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import multiprocessing
+import os
+import random
+import time
+
+from density import Observation
+from placement import Placement, PlacementTable
+
+# На скільки завдань ділиться фіксована кількість вибірок (не залежить від кількості воркерів)
+SAMPLE_CHUNKS = 8
+# Без бюджету часу: скільки спроб на одну потрібну вибірку, перш ніж здатися
+ATTEMPTS_PER_SAMPLE = 4
+
+
+def sample_fleet(
+    observation: Observation,
+    rng: random.Random = None,
+    max_steps: int = 2_000,
+) -> Optional[List[Placement]]:
+    """Випадковий повний флот, сумісний зі спостереженням.
+
+    Спершу кожне непотоплене влучання накривається кораблем, що не торкається
+    інших влучань, потім решта кораблів розставляється на вільні місця за тими
+    ж правилами, що й у Board.can_place_ship (кораблі не торкаються навіть
+    кутами). Пошук із відкатами обмежено max_steps вузлами; якщо за цей час
+    флот не знайдено, повертає None."""
+    rng = rng or random
+    table = PlacementTable.for_board(observation.size)
+    hits = observation.open_hits
+    sizes = sorted(
+        (size for size, count in observation.remaining.items() for _ in range(count)),
+        reverse=True,
+    )
+    chosen: List[Placement] = []
+    steps = 0
+
+    def fits(placement: Placement, blocked: int) -> bool:
+        # Корабель не може стояти на заблокованих клітинках і торкатися чужих влучань
+        return not placement.mask & blocked and not placement.halo & ~placement.mask & hits
+
+    def cover_hits(blocked: int, covered: int, sizes: List[int]) -> bool:
+        nonlocal steps
+        steps += 1
+        if steps > max_steps:
+            return False
+
+        uncovered = hits & ~covered
+        if not uncovered:
+            return fill(0, blocked, sizes, ())
+
+        # Найменше ще не накрите влучання має належати одному з кораблів
+        cell = (uncovered & -uncovered).bit_length() - 1
+        options = []
+        for size in set(sizes):
+            placements = table.placements(size)
+            for placement_id in table.cell_index(size)[0][cell]:
+                placement = placements[placement_id]
+                if fits(placement, blocked):
+                    options.append(placement)
+        rng.shuffle(options)
+
+        for placement in options:
+            rest = list(sizes)
+            rest.remove(placement.size)
+            chosen.append(placement)
+            if cover_hits(blocked | placement.halo, covered | placement.mask, rest):
+                return True
+            chosen.pop()
+            if steps > max_steps:
+                return False
+        return False
+
+    def fill(depth: int, blocked: int, sizes: Sequence[int], pool: Sequence[Placement]) -> bool:
+        nonlocal steps
+        if depth == len(sizes):
+            return True
+        steps += 1
+        if steps > max_steps:
+            return False
+
+        size = sizes[depth]
+        if depth == 0 or sizes[depth - 1] != size:
+            pool = table.placements(size)
+        # Як і в generate_fleet: однакові кораблі беруть кандидатів лише з ще не перевірених
+        remaining = [p for p in pool if not p.mask & blocked]
+        while remaining:
+            pick = rng.randrange(len(remaining))
+            remaining[pick], remaining[-1] = remaining[-1], remaining[pick]
+            placement = remaining.pop()
+
+            chosen.append(placement)
+            if fill(depth + 1, blocked | placement.halo, sizes, remaining):
+                return True
+            chosen.pop()
+            if steps > max_steps:
+                return False
+        return False
+
+    if not cover_hits(observation.blocked, 0, sizes):
+        return None
+    return chosen
+
+
+def sample_occupancy(
+    observation: Observation,
+    time_budget_ms: Optional[float],
+    rng: random.Random = None,
+    max_samples: Optional[int] = None,
+) -> Tuple[List[int], int]:
+    """Скільки разів кожна клітинка зайнята кораблем у випадкових сумісних флотах.
+
+    Генерує флоти, доки не вичерпано time_budget_ms (або max_samples), але
+    щонайменше одну спробу. Без бюджету (None) результат залежить лише від rng:
+    рахуються max_samples флотів, але не більше ATTEMPTS_PER_SAMPLE спроб на
+    кожен. Повертає лічильники для клітинок y * size + x і кількість
+    отриманих флотів."""
+    if time_budget_ms is None and max_samples is None:
+        raise ValueError("потрібен бюджет часу або кількість вибірок")
+    rng = rng or random
+    counts = [0] * (observation.size * observation.size)
+    samples = 0
+    attempts = 0
+    deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000.0
+
+    while True:
+        fleet = sample_fleet(observation, rng)
+        attempts += 1
+        if fleet is not None:
+            samples += 1
+            for placement in fleet:
+                for cell in placement.cells:
+                    counts[cell] += 1
+        if max_samples is not None and samples >= max_samples:
+            break
+        if deadline is None:
+            if attempts >= max_samples * ATTEMPTS_PER_SAMPLE:
+                break
+        elif time.perf_counter() >= deadline:
+            break
+
+    return counts, samples
+
+
+def sample_chunks(max_samples: int, seed: int) -> List[Tuple[int, int]]:
+    """Ділить max_samples вибірок на SAMPLE_CHUNKS завдань: (кількість, зерно)."""
+    rng = random.Random(seed)
+    base, extra = divmod(max_samples, SAMPLE_CHUNKS)
+    chunks = [(base + (index < extra), rng.getrandbits(64)) for index in range(SAMPLE_CHUNKS)]
+    return [(count, chunk_seed) for count, chunk_seed in chunks if count]
+
+
+def fixed_occupancy(observation: Observation, max_samples: int, seed: int) -> Tuple[List[int], int]:
+    """sample_occupancy рівно на max_samples вибірок, що залежить лише від seed.
+
+    Вибірки рахуються тими ж завданнями, що й у SamplerPool.submit_fixed, тож
+    результат в одному процесі і в пулі з будь-якою кількістю воркерів однаковий."""
+    counts = [0] * (observation.size * observation.size)
+    samples = 0
+    for count, chunk_seed in sample_chunks(max_samples, seed):
+        chunk_counts, chunk_samples = sample_occupancy(observation, None, random.Random(chunk_seed), count)
+        samples += chunk_samples
+        for cell, value in enumerate(chunk_counts):
+            counts[cell] += value
+    return counts, samples
+
+
+def _prepare_worker(board_size: int, ship_sizes: Sequence[int]) -> int:
+    """Будує в процесі-воркері таблиці розміщень, щоб перший хід їх не чекав."""
+    table = PlacementTable.for_board(board_size)
+    for size in set(ship_sizes):
+        table.cell_index(size)
+    return os.getpid()
+
+
+def _occupancy_task(
+    observation: Observation,
+    time_budget_ms: Optional[float],
+    seed: int,
+    max_samples: Optional[int] = None,
+) -> Tuple[List[int], int]:
+    return sample_occupancy(observation, time_budget_ms, random.Random(seed), max_samples)
+
+
+class SamplerPool:
+    """Паралельна генерація вибірок у пулі процесів.
+
+    Кожен воркер отримує компактне спостереження (бітові маски та розміри
+    кораблів), рахує зайнятість клітинок протягом бюджету часу і повертає
+    лише лічильники; головний процес їх підсумовує. Процеси стартують через
+    "spawn", щоб не успадковувати з'єднання Tk батьківського процесу.
+
+    Якщо воркер аварійно завершився, пул стає зламаним: collect() повертає
+    None, а наступне завдання запускає пул заново."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard_executor(self):
+        """Відкидає зламаний пул; _get_executor створить новий."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, fn, *args) -> Future:
+        try:
+            return self._get_executor().submit(fn, *args)
+        except BrokenExecutor:
+            self._discard_executor()
+            return self._get_executor().submit(fn, *args)
+
+    def warm_up(self, board_size: int, ship_sizes: Sequence[int]):
+        """Запускає процеси і готує в них таблиці, не блокуючи виклик.
+
+        Завдання розігріву стоять у черзі першими, тож вибірки просто
+        почнуться після них — ніхто не чекає на розігрів явно."""
+        for _ in range(self.workers):
+            self._submit(_prepare_worker, board_size, tuple(ship_sizes))
+
+    def submit(
+        self,
+        observation: Observation,
+        time_budget_ms: float,
+        rng: random.Random = None,
+    ) -> List[Future]:
+        """Ставить вибірки на всі воркери і одразу повертає їхні Future.
+
+        Так GUI не блокується: він перевіряє done() таймером after і
+        забирає результат через collect(), коли все готово."""
+        rng = rng or random
+        return [
+            self._submit(_occupancy_task, observation, time_budget_ms, rng.getrandbits(64))
+            for _ in range(self.workers)
+        ]
+
+    def submit_fixed(self, observation: Observation, max_samples: int, seed: int) -> List[Future]:
+        """Як submit, але завдання fixed_occupancy: рівно max_samples вибірок від seed."""
+        return [
+            self._submit(_occupancy_task, observation, None, chunk_seed, count)
+            for count, chunk_seed in sample_chunks(max_samples, seed)
+        ]
+
+    def occupancy(
+        self,
+        observation: Observation,
+        time_budget_ms: float,
+        rng: random.Random = None,
+    ) -> Tuple[List[int], int]:
+        """Те саме, що sample_occupancy, але вибірки рахують усі воркери одночасно (блокує до кінця).
+
+        Якщо пул зламався, вибірки рахуються в цьому процесі."""
+        result = self.collect(self.submit(observation, time_budget_ms, rng), observation.size)
+        if result is None:
+            return sample_occupancy(observation, time_budget_ms, rng)
+        return result
+
+    def collect(self, futures: Sequence[Future], board_size: int) -> Optional[Tuple[List[int], int]]:
+        """Підсумовує лічильники воркерів (чекає ще не завершені Future).
+
+        None — воркер аварійно завершився або завдання скасовано."""
+        try:
+            results = [future.result() for future in futures]
+        except BrokenExecutor:
+            self._discard_executor()
+            return None
+        except CancelledError:
+            return None
+
+        counts = [0] * (board_size * board_size)
+        samples = 0
+        for worker_counts, worker_samples in results:
+            samples += worker_samples
+            for cell, count in enumerate(worker_counts):
+                if count:
+                    counts[cell] += count
+        return counts, samples
+
+    def close(self):
+        self._discard_executor()
+
+
+_shared_pools: Dict[int, SamplerPool] = {}
+
+
+def shared_pool(workers: Optional[int] = None) -> SamplerPool:
+    """Спільний на весь процес пул з workers воркерами (None — усі ядра).
+
+    Контролер створюється на кожну партію, тож власний пул означав би запуск
+    усіх процесів заново щоразу; спільний пул живе до кінця програми."""
+    workers = workers or os.cpu_count() or 1
+    pool = _shared_pools.get(workers)
+    if pool is None:
+        pool = _shared_pools[workers] = SamplerPool(workers)
+    return pool
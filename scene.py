@@ -0,0 +1,156 @@
+"""Збережена сцена для анімованих персонажів на canvas.
+
+Код малювання кадру лишається звичайним (викликає create_*), але замість
+canvas.delete("all") і створення всього заново RetainedScene зіставляє
+i-й виклик шару з i-м елементом попереднього кадру і лише оновлює coords
+або змінені опції. Шар має власний зсув (покачування персонажа — один
+canvas.move на весь шар) і необов'язковий ключ: якщо ключ не змінився,
+шар не перемальовується зовсім (діалогова хмаринка з тим самим текстом).
+"""
+from typing import Dict, List, Optional, Tuple
+import tkinter as tk
+
+_UNSET = object()
+
+
+class _Slot:
+    __slots__ = ("item", "kind", "coords", "options", "hidden")
+
+    def __init__(self, item: int, kind: str, coords: Tuple[float, ...], options: Dict[str, object]):
+        self.item = item
+        self.kind = kind
+        self.coords = coords
+        self.options = options
+        self.hidden = False
+
+
+class _Layer:
+    def __init__(self, name: str, anchor: int):
+        self.name = name
+        self.tag = f"scene_{name}"
+        # Невидимий елемент над шаром: нові елементи шару опускаються під нього
+        self.anchor = anchor
+        self.slots: List[_Slot] = []
+        self.cursor = 0
+        self.offset = (0.0, 0.0)
+        self.key = _UNSET
+
+
+class RetainedScene:
+    """Повторно використовує елементи canvas між кадрами.
+
+    Порядок шарів на canvas — порядок їх першого begin."""
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self._layers: Dict[str, _Layer] = {}
+        self._layer: Optional[_Layer] = None
+
+        self.created = 0
+        self.updated = 0
+
+    def begin(self, name: str, dx: float = 0.0, dy: float = 0.0, key=_UNSET) -> bool:
+        """Починає шар name зі зсувом (dx, dy).
+
+        Повертає False, якщо ключ шару не змінився з минулого кадру — тоді
+        шар лишається як є і малювати його не потрібно."""
+        self._finish_layer()
+        layer = self._layers.get(name)
+        if layer is None:
+            anchor = self.canvas.create_line(0, 0, 0, 0, state="hidden", tags=("scene_anchor",))
+            layer = self._layers[name] = _Layer(name, anchor)
+        self._layer = layer
+
+        old_dx, old_dy = layer.offset
+        if (dx, dy) != layer.offset:
+            self.canvas.move(layer.tag, dx - old_dx, dy - old_dy)
+            layer.offset = (dx, dy)
+
+        if key is not _UNSET and key == layer.key:
+            layer.cursor = sum(1 for slot in layer.slots if not slot.hidden)
+            return False
+        layer.key = key
+        layer.cursor = 0
+        return True
+
+    def end(self):
+        """Завершує кадр: ховає елементи, що не знадобились у поточному шарі."""
+        self._finish_layer()
+        self._layer = None
+
+    def _finish_layer(self):
+        layer = self._layer
+        if layer is None:
+            return
+        for slot in layer.slots[layer.cursor:]:
+            if not slot.hidden:
+                self.canvas.itemconfig(slot.item, state="hidden")
+                slot.hidden = True
+
+    def __getattr__(self, name):
+        if not name.startswith("create_"):
+            return getattr(self.canvas, name)
+        kind = name[len("create_"):]
+
+        def create(*args, **options):
+            return self._create(kind, args, options)
+        return create
+
+    def _shifted(self, coords: Tuple[float, ...], layer: _Layer) -> List[float]:
+        dx, dy = layer.offset
+        return [value + (dx if index % 2 == 0 else dy) for index, value in enumerate(coords)]
+
+    def _create(self, kind: str, args: tuple, options: Dict[str, object]) -> int:
+        layer = self._layer
+        if layer is None:
+            raise RuntimeError("RetainedScene: create_* поза begin()/end()")
+        coords = []
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                coords.extend(arg)
+            else:
+                coords.append(arg)
+        coords = tuple(coords)
+
+        index = layer.cursor
+        layer.cursor += 1
+        canvas = self.canvas
+        slot = layer.slots[index] if index < len(layer.slots) else None
+
+        # Той самий тип і той самий набір опцій — оновлюємо наявний елемент
+        if slot is not None and slot.kind == kind and slot.options.keys() == options.keys():
+            if coords != slot.coords:
+                canvas.coords(slot.item, *self._shifted(coords, layer))
+                slot.coords = coords
+                self.updated += 1
+            changed = {
+                key: value for key, value in options.items() if key != "tags" and slot.options[key] != value
+            }
+            if changed:
+                slot.options.update(changed)
+            if slot.hidden:
+                changed["state"] = "normal"
+                slot.hidden = False
+            if changed:
+                canvas.itemconfig(slot.item, **changed)
+                self.updated += 1
+            return slot.item
+
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item = getattr(canvas, f"create_{kind}")(*self._shifted(coords, layer), tags=(layer.tag,) + tuple(tags), **options)
+        if tags:
+            options["tags"] = tags
+        self.created += 1
+
+        if slot is None:
+            canvas.tag_lower(item, layer.anchor)
+            layer.slots.append(_Slot(item, kind, coords, options))
+        else:
+            # Інший тип (наприклад, заплющені очі замість розплющених): замінюємо на місці
+            canvas.delete(slot.item)
+            below = layer.slots[index + 1].item if index + 1 < len(layer.slots) else layer.anchor
+            canvas.tag_lower(item, below)
+            layer.slots[index] = _Slot(item, kind, coords, options)
+        return item
@@ -0,0 +1,187 @@
+"""Пакетна самогра AI проти випадкового флоту (без tkinter).
+
+Приклад:
+    python selfplay.py --controller density --size 10 --games 500 --seed 1
+    python selfplay.py --controller hard --games 10000 --archive hard.bsa
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from Board import Board, Orientation
+from ai_controllers import CONTROLLERS, ControllerFactory
+from bitboard import BitBoard
+from game_engine import COMPUTER, PLAYER, ship_configuration
+from replay import ReplayEvent, ReplayHeader, encode_event
+from replay_archive import ArchiveWriter
+from rng import GameRNG
+from stats import percentile
+from zobrist import cache_stats, clear_caches
+
+
+class GameResult(NamedTuple):
+    """Підсумок однієї партії: кількість пострілів до перемоги і час на рішення AI."""
+    seed: int
+    shots: int
+    decision_time: float
+
+
+def play_game(
+    controller_factory: ControllerFactory,
+    board_size: int,
+    ship_sizes: Sequence[int],
+    seed: int,
+    board_cls=Board,
+    log: Optional[bytearray] = None,
+) -> GameResult:
+    """Грає одну партію: AI стріляє по випадково розставленому флоту до повного потоплення.
+
+    Випадковість флоту і AI визначається seed, тож партію можна відтворити.
+    Якщо передано log, у нього дописується запис партії у форматі replay.py
+    (AI — комп'ютер, флот — гравця)."""
+    rng = GameRNG(seed)
+    board = board_cls(board_size, list(ship_sizes))
+    board.place_ships_randomly(rng.split("fleet"))
+    if log is not None:
+        log += ReplayHeader(board_size, rng.seed_value, tuple(ship_sizes)).encode()
+        for ship in board.ships:
+            x, y = ship.position
+            encode_event(log, ReplayEvent(
+                "place", PLAYER, x, y, size=ship.size, vertical=ship.orientation == Orientation.VERTICAL,
+            ), board_size)
+    controller = controller_factory(board, rng=rng.split("ai"))
+    controller.warm_up()
+
+    shots = 0
+    decision_time = 0.0
+    max_shots = board_size * board_size
+    try:
+        while not board.all_ships_sunk():
+            start = time.perf_counter()
+            x, y = controller.perform_attack()
+            decision_time += time.perf_counter() - start
+            if x is None or y is None or shots >= max_shots:
+                raise RuntimeError(f"Контролер не завершив гру (seed={seed}, постріл {shots + 1})")
+
+            hit, sunk, _ = board.attack(x, y)
+            if log is not None:
+                encode_event(log, ReplayEvent("shot", PLAYER, x, y, hit, sunk), board_size)
+            start = time.perf_counter()
+            controller.register_result(x, y, hit, sunk)
+            decision_time += time.perf_counter() - start
+            shots += 1
+    finally:
+        controller.close()
+
+    if log is not None:
+        encode_event(log, ReplayEvent("end", COMPUTER), board_size)
+    return GameResult(seed, shots, decision_time)
+
+
+def summarize(results: List[GameResult], wall_time: float) -> Dict[str, float]:
+    shots = [result.shots for result in results]
+    total_decisions = sum(shots)
+    total_decision_time = sum(result.decision_time for result in results)
+    return {
+        "games": len(results),
+        "mean_shots": statistics.mean(shots),
+        "median_shots": statistics.median(shots),
+        "p95_shots": percentile(shots, 95),
+        "min_shots": min(shots),
+        "max_shots": max(shots),
+        "decisions_per_second": total_decisions / total_decision_time if total_decision_time else float("inf"),
+        "wall_time": wall_time,
+    }
+
+
+def run(
+    controller: str,
+    board_size: int,
+    games: int,
+    seed: int = 0,
+    ship_sizes: Optional[Sequence[int]] = None,
+    board_cls=Board,
+    archive: Optional[str] = None,
+) -> Dict[str, float]:
+    """Грає games партій контролером controller і повертає зведену статистику.
+
+    Якщо задано archive, записи партій дописуються в цей архів
+    (replay_archive.py) з game_id виду "controller/size/seed".
+
+    Кеші оцінок AI (zobrist.py) спільні для класу контролера, тож перед
+    кожним запуском вони очищаються: інакше результат контролера залежав би
+    від того, хто грав до нього."""
+    factory = CONTROLLERS[controller]
+    ship_sizes = ship_sizes or ship_configuration(board_size)
+
+    clear_caches()
+    start = time.perf_counter()
+    results = []
+    with (ArchiveWriter(archive) if archive else nullcontext()) as writer:
+        for index in range(games):
+            log = bytearray() if writer else None
+            results.append(play_game(factory, board_size, ship_sizes, seed + index, board_cls, log))
+            if writer:
+                writer.append(f"{controller}/{board_size}/{seed + index}", bytes(log))
+    report = summarize(results, time.perf_counter() - start)
+
+    hits, misses = _cache_lookups()
+    report["cache_hits"] = hits
+    report["cache_hit_rate"] = hits / (hits + misses) if hits + misses else 0.0
+    return report
+
+
+def _cache_lookups():
+    """Сумарні (влучання, промахи) кешів оцінок AI від останнього clear_caches()."""
+    stats = cache_stats().values()
+    return sum(entry["hits"] for entry in stats), sum(entry["misses"] for entry in stats)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Самогра AI морського бою для порівняння контролерів.")
+    parser.add_argument("--controller", "-c", choices=sorted(CONTROLLERS), default="hard",
+                        help="контролер AI")
+    parser.add_argument("--compare", default=None,
+                        help="список контролерів через кому, що грають ті самі флоти")
+    parser.add_argument("--size", "-s", type=int, default=10, help="розмір поля")
+    parser.add_argument("--games", "-n", type=int, default=100, help="кількість партій")
+    parser.add_argument("--seed", type=int, default=0, help="початкове зерно; партія i має зерно seed + i")
+    parser.add_argument("--ships", default=None, help="розміри кораблів через кому (за замовчуванням — як у грі)")
+    parser.add_argument("--bitboard", action="store_true", help="використовувати BitBoard замість Board")
+    parser.add_argument("--json", action="store_true", help="вивести результат у JSON")
+    parser.add_argument("--archive", default=None, help="дописувати записи партій у цей архів (.bsa)")
+    args = parser.parse_args(argv)
+
+    names = args.compare.split(",") if args.compare else [args.controller]
+    unknown = [name for name in names if name not in CONTROLLERS]
+    if unknown:
+        parser.error(f"невідомі контролери: {', '.join(unknown)}")
+    ship_sizes = [int(size) for size in args.ships.split(",")] if args.ships else None
+    board_cls = BitBoard if args.bitboard else Board
+
+    reports = {}
+    for name in names:
+        reports[name] = run(name, args.size, args.games, args.seed, ship_sizes, board_cls, args.archive)
+
+    if args.json:
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+        return 0
+
+    for name, report in reports.items():
+        print(f"{name}: {report['games']} партій на полі {args.size}x{args.size}, seed={args.seed}")
+        print(f"  пострілів до перемоги: середнє {report['mean_shots']:.2f}, медіана {report['median_shots']:.1f}, "
+              f"p95 {report['p95_shots']}, мін {report['min_shots']}, макс {report['max_shots']}")
+        print(f"  рішень за секунду: {report['decisions_per_second']:.0f}")
+        if report["cache_hits"]:
+            print(f"  кеш оцінок за хешем поля: {report['cache_hit_rate'] * 100:.1f}% влучань")
+        print(f"  час: {report['wall_time']:.2f} с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
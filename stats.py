@@ -0,0 +1,18 @@
+"""Невеликі статистичні допоміжні функції для звітів самогри, турнірів і профайлера."""
+from typing import Sequence
+import math
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Перцентиль q (0..100) методом найближчого рангу: ранг ceil(q * n / 100).
+
+    >>> percentile(range(1, 101), 95), percentile(range(1, 21), 95), percentile(range(1, 11), 50)
+    (95, 19, 5)
+    >>> percentile([7], 50), percentile([3, 1, 2], 0), percentile([3, 1, 2], 100), percentile([], 95)
+    (7, 1, 3, 0.0)
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), math.ceil(q * len(ordered) / 100)))
+    return ordered[rank - 1]
@@ -0,0 +1,105 @@
+"""BitBoard поводиться так само, як Board.Board, на випадкових послідовностях дій.
+
+    python -m unittest test_bitboard
+"""
+import random
+import unittest
+
+from Board import Board, CellState, Orientation
+from bitboard import BitBoard
+from game_engine import ship_configuration
+
+
+def board_state(board):
+    return (
+        [list(row) for row in board.grid],
+        [list(row) for row in board.revealed],
+        [(ship.size, ship.position, ship.orientation, ship.hits) for ship in board.ships],
+        board.zobrist,
+        board.all_ships_sunk(),
+    )
+
+
+def ship_key(ship):
+    return None if ship is None else (ship.size, ship.position, ship.orientation)
+
+
+class BitBoardEquivalenceTest(unittest.TestCase):
+    GAMES = 60
+
+    def assertSameBoards(self, board, bitboard, context):
+        self.assertEqual(board_state(bitboard), board_state(board), context)
+
+    def random_args(self, rng, size):
+        # Корабель може виходити за правий і нижній край (Board не перевіряє від'ємні координати)
+        return (
+            rng.randint(1, 5),
+            rng.randrange(size),
+            rng.randrange(size),
+            rng.choice((Orientation.HORIZONTAL, Orientation.VERTICAL)),
+        )
+
+    def test_manual_placement_and_attacks(self):
+        for game in range(self.GAMES):
+            rng = random.Random(game)
+            size = rng.choice((6, 10, 14))
+            ship_sizes = ship_configuration(size)
+            board, bitboard = Board(size, ship_sizes), BitBoard(size, ship_sizes)
+
+            for step in range(rng.randint(20, 4 * size * size)):
+                context = f"гра {game}, крок {step}"
+                action = rng.random()
+                if action < 0.3:
+                    args = self.random_args(rng, size)
+                    self.assertEqual(bitboard.can_place_ship(*args), board.can_place_ship(*args), context)
+                    self.assertEqual(bitboard.place_ship(*args), board.place_ship(*args), context)
+                else:
+                    x, y = rng.randint(-1, size), rng.randint(-1, size)
+                    hit, sunk, ship = board.attack(x, y)
+                    bit_hit, bit_sunk, bit_ship = bitboard.attack(x, y)
+                    self.assertEqual((bit_hit, bit_sunk, ship_key(bit_ship)), (hit, sunk, ship_key(ship)), context)
+                self.assertSameBoards(board, bitboard, context)
+
+    def test_random_fleet_games(self):
+        for game in range(self.GAMES):
+            rng = random.Random(1000 + game)
+            size = rng.choice((6, 10, 14))
+            ship_sizes = ship_configuration(size)
+            board, bitboard = Board(size, ship_sizes), BitBoard(size, ship_sizes)
+
+            # Кілька кораблів вручну, решту — розстановкою з тим самим зерном
+            for _ in range(rng.randint(0, 3)):
+                args = self.random_args(rng, size)
+                self.assertEqual(bitboard.place_ship(*args), board.place_ship(*args))
+            fleet_seed = rng.getrandbits(32)
+            board.place_ships_randomly(random.Random(fleet_seed))
+            bitboard.place_ships_randomly(random.Random(fleet_seed))
+            self.assertSameBoards(board, bitboard, f"гра {game}, розстановка")
+
+            cells = [(x, y) for y in range(size) for x in range(size)]
+            rng.shuffle(cells)
+            for x, y in cells:
+                if board.all_ships_sunk():
+                    break
+                hit, sunk, ship = board.attack(x, y)
+                bit_hit, bit_sunk, bit_ship = bitboard.attack(x, y)
+                self.assertEqual((bit_hit, bit_sunk, ship_key(bit_ship)), (hit, sunk, ship_key(ship)))
+            self.assertSameBoards(board, bitboard, f"гра {game}, кінець")
+
+    def test_grid_writes(self):
+        rng = random.Random(7)
+        board, bitboard = Board(10), BitBoard(10)
+        for _ in range(500):
+            x, y = rng.randrange(10), rng.randrange(10)
+            state = rng.choice(list(CellState))
+            board.grid[y][x] = state
+            bitboard.grid[y][x] = state
+            revealed = rng.random() < 0.5
+            board.revealed[y][x] = revealed
+            bitboard.revealed[y][x] = revealed
+            self.assertEqual([list(row) for row in bitboard.grid], board.grid)
+            self.assertEqual([list(row) for row in bitboard.revealed], board.revealed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Запис партії replay.py: кодування, декодування і відтворення полів (без tkinter).
+
+    python -m unittest test_replay
+"""
+import io
+import unittest
+
+from ai_controllers import CONTROLLERS
+from game_engine import GameEngine, ship_configuration
+from replay import Replay, ReplayError, ReplayHeader, ReplayWriter
+from rng import GameRNG
+
+
+def board_state(board):
+    return (
+        tuple(tuple(row) for row in board.grid),
+        tuple(tuple(row) for row in board.revealed),
+        board.zobrist,
+    )
+
+
+def play_recorded(board_size: int, seed: int, kraken_interval: int = 5):
+    """Партія AI проти AI з ракетами і кракеном; повертає запис і стан полів після кожної події запису."""
+    engine = GameEngine(
+        board_size,
+        ship_configuration(board_size),
+        ai_factory=CONTROLLERS["density"],
+        player_ai_factory=CONTROLLERS["density"],
+        rng=GameRNG(seed),
+    )
+    stream = io.BytesIO()
+    ReplayWriter(engine, stream)
+    states = []
+
+    def on_event(event):
+        if event.kind in ("shot", "rocket", "kraken"):
+            states.append((board_state(engine.player_board), board_state(engine.computer_board)))
+
+    engine.subscribe(on_event)
+    engine.place_player_ships_randomly()
+    engine.start()
+    actions = 0
+    while engine.phase == "playing":
+        engine.step()
+        actions += 1
+        if actions % kraken_interval == 0:
+            engine.kraken_attack()
+    return stream.getvalue(), engine.winner, states
+
+
+class ReplayRoundTripTest(unittest.TestCase):
+    GAMES = [(10, seed) for seed in range(4)] + [(14, seed) for seed in range(2)]
+
+    def test_header_round_trip(self):
+        header = ReplayHeader(14, (1 << 64) - 1, (5, 4, 1))
+        self.assertEqual(ReplayHeader.decode(header.encode()), (header, len(header.encode())))
+
+    def test_boards_at_matches_engine(self):
+        kinds = set()
+        for board_size, seed in self.GAMES:
+            with self.subTest(board_size=board_size, seed=seed):
+                data, winner, states = play_recorded(board_size, seed)
+                replay = Replay(data)
+                self.assertEqual(replay.header.seed, seed)
+                self.assertEqual(replay.winner, winner)
+                kinds.update(event.kind for event in replay.events)
+
+                placements = sum(1 for event in replay.events if event.kind == "place")
+                for index, expected in enumerate(states):
+                    player, computer = replay.boards_at(placements + index + 1)
+                    self.assertEqual((board_state(player), board_state(computer)), expected)
+        # Ігри мають покривати всі типи подій, інакше тест перевіряє не все
+        self.assertLessEqual({"place", "shot", "rocket", "kraken", "end"}, kinds)
+
+    def test_keyframe_seek_matches_linear_replay(self):
+        for board_size, seed in self.GAMES[:3]:
+            with self.subTest(board_size=board_size, seed=seed):
+                data, _, _ = play_recorded(board_size, seed)
+                keyframed = Replay(data, keyframe_interval=7)
+                linear = Replay(data, keyframe_interval=len(data))
+                for turn in range(len(linear) + 1):
+                    self.assertEqual(
+                        [board_state(board) for board in keyframed.boards_at(turn)],
+                        [board_state(board) for board in linear.boards_at(turn)],
+                    )
+
+    def test_truncated_record(self):
+        data, _, _ = play_recorded(10, 0)
+        with self.assertRaises(ReplayError):
+            Replay(data[:3])
+        # Обрізано номер клітинки останнього пострілу (на полі 10x10 — один байт) і кінець
+        with self.assertRaises(ReplayError):
+            Replay(data[:-2])
+        with self.assertRaises(ReplayError):
+            Replay(b"XXXX" + data[4:])
+
+
+if __name__ == "__main__":
+    unittest.main()
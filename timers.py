@@ -0,0 +1,73 @@
+"""Таймери after, що належать своєму власнику.
+
+Кожен компонент (робот, кракен, ефекти, гра) планує відкладені дії через
+власний TimerRegistry. Реєстр пам'ятає ще не виконані таймери і скасовує їх
+усі при знищенні компонента, тож після нової гри чи повернення в меню старі
+колбеки не спрацьовують на знищених canvas і не накопичуються в черзі Tk.
+outstanding() показує, скільки таймерів чекає у кожного власника.
+"""
+from typing import Callable, Dict, Optional, Set
+import tkinter as tk
+import weakref
+
+_registries: "weakref.WeakSet[TimerRegistry]" = weakref.WeakSet()
+
+
+class TimerRegistry:
+    """Відкладені виклики одного власника з можливістю скасувати всі разом."""
+
+    def __init__(self, widget: tk.Misc, owner: str):
+        self.widget = widget
+        self.owner = owner
+        self._jobs: Set[str] = set()
+
+        self.scheduled = 0
+        self.cancelled = 0
+        _registries.add(self)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job: Optional[str]) -> bool:
+        """Чи таймер job ще чекає (не спрацював і не скасований)."""
+        return job in self._jobs
+
+    def after(self, ms: int, func: Callable, *args) -> Optional[str]:
+        """Як widget.after, але таймер належить реєстру; None — віджет уже знищено."""
+        job = None
+
+        def fire():
+            self._jobs.discard(job)
+            func(*args)
+
+        try:
+            job = self.widget.after(ms, fire)
+        except tk.TclError:
+            return None
+        self._jobs.add(job)
+        self.scheduled += 1
+        return job
+
+    def cancel(self, job: Optional[str]):
+        """Скасовує таймер, якщо він ще не спрацював."""
+        if job is None or job not in self._jobs:
+            return
+        self._jobs.discard(job)
+        self.cancelled += 1
+        try:
+            self.widget.after_cancel(job)
+        except tk.TclError:
+            pass
+
+    def cancel_all(self):
+        for job in list(self._jobs):
+            self.cancel(job)
+
+
+def outstanding() -> Dict[str, int]:
+    """Кількість таймерів, що ще чекають, за власниками."""
+    counts: Dict[str, int] = {}
+    for registry in list(_registries):
+        if len(registry):
+            counts[registry.owner] = counts.get(registry.owner, 0) + len(registry)
+    return counts
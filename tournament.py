@@ -0,0 +1,313 @@
+"""Кругові турніри AI-контролерів на кількох ядрах (без tkinter).
+
+Кожна пара різних контролерів грає на обох місцях (гравець/комп'ютер) у
+кожному варіанті правил. Зерно партії залежить лише від розміру поля,
+варіанта і номера партії, тож усі пари грають ті самі флоти. Результати
+дописуються у JSONL або CSV одразу після кожної партії; повторний запуск з тим
+самим файлом пропускає вже зіграні партії. З --archive записи всіх партій
+(replay.py) зберігаються в архів replay_archive.py за game_id.
+
+Приклад:
+    python tournament.py --games 1000 --size 10 --workers 32 --output results.jsonl --archive games.bsa
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Sequence, Set
+
+from ai_controllers import CONTROLLERS
+from game_engine import PLAYER, GameEngine, ship_configuration
+from replay import ReplayWriter
+from replay_archive import ArchiveWriter
+from rng import GameRNG
+
+# Варіанти правил: чи є ракети і кракен
+VARIANTS: Dict[str, Dict[str, bool]] = {
+    "classic": {"rockets": False, "kraken": False},
+    "rockets": {"rockets": True, "kraken": False},
+    "kraken": {"rockets": False, "kraken": True},
+    "rockets+kraken": {"rockets": True, "kraken": True},
+}
+
+FIELDS = [
+    "game_id", "variant", "board_size", "seed", "player", "computer", "winner", "winner_side",
+    "player_shots", "computer_shots", "player_hits", "computer_hits", "actions", "kraken_attacks", "duration",
+]
+
+
+class MatchSpec(NamedTuple):
+    """Опис однієї партії турніру; передається у процеси пулу."""
+    game_id: str
+    variant: str
+    board_size: int
+    player: str
+    computer: str
+    seed: int
+    kraken_interval: int
+    record_replay: bool = False
+
+
+def game_seed(base_seed: int, board_size: int, variant: str, index: int) -> int:
+    """Детерміноване 64-бітне зерно партії, однакове в усіх процесах і запусках."""
+    key = f"{base_seed}/{board_size}/{variant}/{index}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def schedule(
+    controllers: Sequence[str],
+    variants: Sequence[str],
+    games: int,
+    board_size: int,
+    base_seed: int = 0,
+    kraken_interval: int = 10,
+    record_replay: bool = False,
+) -> Iterator[MatchSpec]:
+    """Усі партії кругового турніру (ліниво, щоб не тримати мільйони в пам'яті)."""
+    for variant in variants:
+        for index in range(games):
+            seed = game_seed(base_seed, board_size, variant, index)
+            for player in controllers:
+                for computer in controllers:
+                    if player == computer:
+                        continue
+                    game_id = f"{board_size}/{variant}/{player}/{computer}/{index}"
+                    yield MatchSpec(game_id, variant, board_size, player, computer, seed, kraken_interval, record_replay)
+
+
+def play_match(spec: MatchSpec) -> Dict[str, object]:
+    """Грає одну партію AI проти AI через GameEngine і повертає запис для файлу результатів.
+
+    Кракен без GUI атакує кожні kraken_interval дій (пострілів AI). Якщо
+    spec.record_replay, запис партії повертається в полі "replay" (bytes)."""
+    rules = VARIANTS[spec.variant]
+    engine = GameEngine(
+        spec.board_size,
+        ship_configuration(spec.board_size),
+        ai_factory=CONTROLLERS[spec.computer],
+        player_ai_factory=CONTROLLERS[spec.player],
+        rockets_enabled=rules["rockets"],
+        kraken_enabled=rules["kraken"],
+        rng=GameRNG(spec.seed),
+    )
+    replay = ReplayWriter(engine, io.BytesIO()) if spec.record_replay else None
+    start = time.perf_counter()
+    engine.place_player_ships_randomly()
+    engine.start()
+
+    actions = 0
+    kraken_attacks = 0
+    max_actions = 4 * spec.board_size * spec.board_size
+    try:
+        while engine.phase == "playing":
+            if not engine.step():
+                raise RuntimeError(f"Партія {spec.game_id} зупинилась: AI не зробив ходу")
+            actions += 1
+            if rules["kraken"] and spec.kraken_interval and actions % spec.kraken_interval == 0:
+                if engine.kraken_attack() is not None:
+                    kraken_attacks += 1
+            if actions > max_actions:
+                raise RuntimeError(f"Партія {spec.game_id} не завершилась за {max_actions} дій")
+    finally:
+        engine.close()
+        if replay:
+            replay.close()
+
+    record = {
+        "game_id": spec.game_id,
+        "variant": spec.variant,
+        "board_size": spec.board_size,
+        "seed": spec.seed,
+        "player": spec.player,
+        "computer": spec.computer,
+        "winner": spec.player if engine.winner == PLAYER else spec.computer,
+        "winner_side": engine.winner,
+        "player_shots": engine.player_shots,
+        "computer_shots": engine.computer_shots,
+        "player_hits": engine.player_score,
+        "computer_hits": engine.computer_score,
+        "actions": actions,
+        "kraken_attacks": kraken_attacks,
+        "duration": round(time.perf_counter() - start, 6),
+    }
+    if replay:
+        record["replay"] = replay.stream.getvalue()
+    return record
+
+
+# ---------------------------------------------------------------------- #
+# Файл результатів
+# ---------------------------------------------------------------------- #
+def _output_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _drop_partial_line(path: str, chunk_size: int = 64 * 1024):
+    """Обрізає недописаний останній рядок, що лишився після переривання.
+
+    Читає файл з кінця шматками по chunk_size байтів, тож великий файл
+    результатів не вантажиться в пам'ять цілком."""
+    with open(path, "rb+") as handle:
+        end = handle.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        handle.seek(end - 1)
+        if handle.read(1) == b"\n":
+            return
+        while end > 0:
+            start = max(0, end - chunk_size)
+            handle.seek(start)
+            newline = handle.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                handle.truncate(start + newline + 1)
+                return
+            end = start
+        handle.truncate(0)
+
+
+def read_results(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, object]]:
+    """Записи з файлу результатів (JSONL або CSV)."""
+    if not os.path.exists(path):
+        return
+    fmt = _output_format(path, fmt)
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def completed_games(path: str, fmt: Optional[str] = None) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    _drop_partial_line(path)
+    return {str(record["game_id"]) for record in read_results(path, fmt)}
+
+
+def run_tournament(
+    specs: Iterable[MatchSpec],
+    output: str,
+    fmt: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    archive: Optional[str] = None,
+) -> int:
+    """Грає партії в пулі процесів і дописує результати у файл у міру завершення.
+
+    Уже записані у файлі партії пропускаються. Записи партій (якщо їх
+    просили в specs) дописуються в архів archive. Повертає кількість нових партій."""
+    fmt = _output_format(output, fmt)
+    done = completed_games(output, fmt)
+    pending = (spec for spec in specs if spec.game_id not in done)
+    new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+
+    played = 0
+    with open(output, "a", newline="", encoding="utf-8") as handle, \
+            (ArchiveWriter(archive) if archive else nullcontext()) as replays:
+        writer = csv.DictWriter(handle, fieldnames=FIELDS) if fmt == "csv" else None
+        if writer and new_file:
+            writer.writeheader()
+
+        with multiprocessing.Pool(workers) as pool:
+            try:
+                for record in pool.imap_unordered(play_match, pending, chunksize):
+                    replay = record.pop("replay", None)
+                    if replays and replay:
+                        # Архів — першим: перерваний запуск не лишить у результатах партію без запису
+                        replays.append(str(record["game_id"]), replay)
+                    if writer:
+                        writer.writerow(record)
+                    else:
+                        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    handle.flush()
+                    played += 1
+            except KeyboardInterrupt:
+                # Уже записане лишається у файлі — наступний запуск продовжить з цього місця
+                pool.terminate()
+                raise
+    return played
+
+
+def summarize(records: Iterable[Dict[str, object]]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Перемоги та середня кількість пострілів переможця для кожного варіанта і контролера."""
+    stats = defaultdict(lambda: defaultdict(lambda: {"games": 0, "wins": 0, "winning_shots": 0}))
+    for record in records:
+        variant = record["variant"]
+        winner_shots = int(record["player_shots"] if record["winner_side"] == PLAYER else record["computer_shots"])
+        for name in (record["player"], record["computer"]):
+            stats[variant][name]["games"] += 1
+        entry = stats[variant][record["winner"]]
+        entry["wins"] += 1
+        entry["winning_shots"] += winner_shots
+
+    summary = {}
+    for variant, by_controller in stats.items():
+        summary[variant] = {}
+        for name, entry in by_controller.items():
+            summary[variant][name] = {
+                "games": entry["games"],
+                "win_rate": entry["wins"] / entry["games"] if entry["games"] else 0.0,
+                "mean_shots_to_win": entry["winning_shots"] / entry["wins"] if entry["wins"] else 0.0,
+            }
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Круговий турнір AI-контролерів морського бою.")
+    parser.add_argument("--controllers", default=",".join(CONTROLLERS),
+                        help="контролери через кому (за замовчуванням — усі зареєстровані)")
+    parser.add_argument("--variants", default=",".join(VARIANTS),
+                        help=f"варіанти правил через кому: {', '.join(VARIANTS)}")
+    parser.add_argument("--size", "-s", type=int, default=10, help="розмір поля")
+    parser.add_argument("--games", "-n", type=int, default=10, help="партій на кожну пару місць і варіант")
+    parser.add_argument("--seed", type=int, default=0, help="базове зерно турніру")
+    parser.add_argument("--kraken-interval", type=int, default=10, help="атака кракена кожні N дій AI")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="кількість процесів (за замовчуванням — усі ядра)")
+    parser.add_argument("--chunksize", type=int, default=16, help="партій на одне завдання пулу")
+    parser.add_argument("--output", "-o", default="tournament.jsonl", help="файл результатів (.jsonl або .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="формат файлу результатів")
+    parser.add_argument("--archive", default=None, help="зберігати записи партій у цей архів (.bsa)")
+    args = parser.parse_args(argv)
+
+    controllers = args.controllers.split(",")
+    variants = args.variants.split(",")
+    unknown = [name for name in controllers if name not in CONTROLLERS] + [v for v in variants if v not in VARIANTS]
+    if unknown:
+        parser.error(f"невідомі контролери або варіанти: {', '.join(unknown)}")
+    if len(controllers) < 2:
+        parser.error("для турніру потрібно щонайменше два контролери")
+
+    specs = schedule(
+        controllers, variants, args.games, args.size, args.seed, args.kraken_interval, record_replay=bool(args.archive)
+    )
+    start = time.perf_counter()
+    played = run_tournament(specs, args.output, args.format, args.workers, args.chunksize, args.archive)
+    wall_time = time.perf_counter() - start
+    print(f"Зіграно нових партій: {played} за {wall_time:.1f} с -> {args.output}")
+
+    records = read_results(args.output, args.format)
+    summary = summarize(record for record in records if int(record["board_size"]) == args.size)
+    for variant in variants:
+        if variant not in summary:
+            continue
+        print(f"\n{variant}:")
+        ranking = sorted(summary[variant].items(), key=lambda item: -item[1]["win_rate"])
+        for name, entry in ranking:
+            print(f"  {name:<12} перемог {entry['win_rate'] * 100:5.1f}% з {entry['games']} партій, "
+                  f"пострілів до перемоги {entry['mean_shots_to_win']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,37 @@
 # visual_effects.py
 import tkinter as tk
+import itertools
 import random
 import math
 
+from animation_clock import get_clock
+from particles import ParticleSystem
+from timers import TimerRegistry
+
 
 class VisualEffects:
     """Клас для візуальних ефектів: тремтіння, частинки, дим"""
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, rng: random.Random = None):
         self.root = root
-        self.particles = []
+        self.rng = rng or random
+        # Усі ефекти анімуються кадрами спільного годинника вікна
+        self.clock = get_clock(root)
+        self.particles = ParticleSystem(self.clock)
+        # Відкладені дії ефектів (прибирання диму тощо)
+        self.timers = TimerRegistry(root, "visual_effects")
         self.smoke_effects = []
 
+    def _start_animation(self, step, interval_ms: int, name: str):
+        """Виконує перший крок одразу, а наступні — не частіше ніж раз на interval_ms.
+        step повертає False, коли ефект завершився"""
+        try:
+            if step() is False:
+                return
+        except tk.TclError:
+            return
+        self.clock.subscribe(lambda dt: step(), interval_ms=interval_ms, name=name)
+
     def shake_canvas(self, canvas: tk.Canvas, intensity: int = 5, duration: int = 300):
         """Ефект удару - мигання рамки canvas"""
         original_color = canvas.cget('highlightbackground')
@@ -26,7 +46,7 @@ class VisualEffects:
                     canvas.config(highlightbackground=original_color)
                 except tk.TclError:
                     pass
-                return
+                return False
 
             # Чергуємо червоний і оригінальний колір
             try:
@@ -35,12 +55,11 @@ class VisualEffects:
                 else:
                     canvas.config(highlightbackground=original_color, highlightthickness=2)
             except tk.TclError:
-                return
+                return False
 
             shake_count += 1
-            self.root.after(80, flash_step)
 
-        flash_step()
+        self._start_animation(flash_step, 80, 'shake')
 
     def create_explosion_particles(
         self,
@@ -54,88 +73,8 @@ class VisualEffects:
         if colors is None:
             colors = ['#ff6b6b', '#ff9f43', '#ffd166', '#ff4444', '#ffaa00']
 
-        particles_data = []
-
-        for _ in range(count):
-            # Випадковий напрямок та швидкість
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 6)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-
-            # Розмір частинки
-            size = random.randint(3, 8)
-            color = random.choice(colors)
-
-            # Створюємо частинку
-            particle = canvas.create_oval(
-                center_x - size, center_y - size,
-                center_x + size, center_y + size,
-                fill=color, outline='', tags=('particle',)
-            )
-
-            particles_data.append({
-                'id': particle,
-                'x': center_x,
-                'y': center_y,
-                'vx': vx,
-                'vy': vy,
-                'life': 15,  # кількість кадрів життя
-                'size': size
-            })
-
-        self._animate_particles(canvas, particles_data)
-
-    def _animate_particles(self, canvas: tk.Canvas, particles_data: list, frame: int = 0):
-        """Анімує частинки"""
-        if frame > 20 or not particles_data:
-            # Видаляємо всі частинки
-            try:
-                canvas.delete('particle')
-            except tk.TclError:
-                pass
-            return
-
-        alive_particles = []
-
-        for particle in particles_data:
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                try:
-                    canvas.delete(particle['id'])
-                except tk.TclError:
-                    pass
-                continue
-
-            # Оновлюємо позицію
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-
-            # Гравітація
-            particle['vy'] += 0.3
-
-            # Затухання швидкості
-            particle['vx'] *= 0.95
-            particle['vy'] *= 0.95
-
-            # Зменшуємо розмір
-            particle['size'] *= 0.92
-
-            try:
-                # Оновлюємо позицію на canvas
-                canvas.coords(
-                    particle['id'],
-                    particle['x'] - particle['size'],
-                    particle['y'] - particle['size'],
-                    particle['x'] + particle['size'],
-                    particle['y'] + particle['size']
-                )
-                alive_particles.append(particle)
-            except tk.TclError:
-                pass
-
-        if alive_particles:
-            self.root.after(30, lambda: self._animate_particles(canvas, alive_particles, frame + 1))
+        # Частинки живуть у спільній системі з пулом овалів і бюджетом
+        self.particles.emit(canvas, center_x, center_y, count, colors, self.rng)
 
     def animate_ship_sinking(
         self,
@@ -152,30 +91,34 @@ class VisualEffects:
     def _flash_ship(self, canvas: tk.Canvas, coordinates: list, cell_size: int,
                    flash_count: int, max_flashes: int, next_callback):
         """Блимання корабля перед вибухом"""
-        if flash_count >= max_flashes:
-            next_callback()
-            return
-
-        # Створюємо блимаючі прямокутники
-        for x, y in coordinates:
-            x1 = x * cell_size
-            y1 = y * cell_size
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
+        counter = itertools.count(flash_count)
 
-            color = '#ffff00' if flash_count % 2 == 0 else '#ff0000'
-
-            canvas.create_rectangle(
-                x1, y1, x2, y2,
-                fill=color,
-                outline='',
-                tags=('flash_ship',)
-            )
+        def flash_step():
+            count = next(counter)
+            # Прибираємо прямокутники попереднього кадру
+            if count > flash_count:
+                canvas.delete('flash_ship')
+            if count >= max_flashes:
+                next_callback()
+                return False
+
+            # Створюємо блимаючі прямокутники
+            for x, y in coordinates:
+                x1 = x * cell_size
+                y1 = y * cell_size
+                x2 = x1 + cell_size
+                y2 = y1 + cell_size
+
+                color = '#ffff00' if count % 2 == 0 else '#ff0000'
+
+                canvas.create_rectangle(
+                    x1, y1, x2, y2,
+                    fill=color,
+                    outline='',
+                    tags=('flash_ship',)
+                )
 
-        # Видаляємо через короткий час
-        self.root.after(80, lambda: canvas.delete('flash_ship'))
-        self.root.after(80, lambda: self._flash_ship(canvas, coordinates, cell_size,
-                                                      flash_count + 1, max_flashes, next_callback))
+        self._start_animation(flash_step, 80, 'flash_ship')
 
     def _explode_ship(self, canvas: tk.Canvas, coordinates: list, cell_size: int, callback):
         """Вибух корабля з розлітанням частин"""
@@ -188,16 +131,16 @@ class VisualEffects:
 
         # Створюємо великий вибух в центрі
         for _ in range(50):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 10)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(3, 10)
             vx = math.cos(angle) * speed
             vy = math.sin(angle) * speed
-            size = random.randint(4, 12)
+            size = self.rng.randint(4, 12)
 
             particle = canvas.create_oval(
                 center_x - size, center_y - size,
                 center_x + size, center_y + size,
-                fill=random.choice(['#ff6b00', '#ff0000', '#ffaa00', '#fff', '#ff9f43']),
+                fill=self.rng.choice(['#ff6b00', '#ff0000', '#ffaa00', '#fff', '#ff9f43']),
                 outline='',
                 tags=('explosion_particle',)
             )
@@ -214,8 +157,8 @@ class VisualEffects:
             distance = math.sqrt(dx*dx + dy*dy) or 1
 
             # Нормалізуємо і додаємо швидкість
-            vx = (dx / distance) * random.uniform(4, 8)
-            vy = (dy / distance) * random.uniform(4, 8)
+            vx = (dx / distance) * self.rng.uniform(4, 8)
+            vy = (dy / distance) * self.rng.uniform(4, 8)
 
             # Створюємо уламок корабля
             piece_size = cell_size // 3
@@ -233,16 +176,19 @@ class VisualEffects:
                 'y': cy,
                 'vx': vx,
                 'vy': vy,
-                'rotation': random.uniform(0, 360),
-                'rotation_speed': random.uniform(-20, 20),
+                'rotation': self.rng.uniform(0, 360),
+                'rotation_speed': self.rng.uniform(-20, 20),
                 'life': 20
             })
 
         # Анімуємо розлітання
-        self._animate_explosion(canvas, ship_pieces, 0, callback)
+        frames = itertools.count()
+        self._start_animation(
+            lambda: self._animate_explosion(canvas, ship_pieces, next(frames), callback), 50, 'ship_explosion'
+        )
 
     def _animate_explosion(self, canvas: tk.Canvas, ship_pieces: list, frame: int, callback):
-        """Анімує розлітання уламків"""
+        """Один кадр розлітання уламків; повертає False, коли анімація завершилась"""
         if frame >= 20:
             # Видаляємо все
             try:
@@ -253,7 +199,7 @@ class VisualEffects:
             # Викликаємо callback
             if callback:
                 callback()
-            return
+            return False
 
         alive_pieces = []
 
@@ -298,8 +244,7 @@ class VisualEffects:
             except tk.TclError:
                 pass
 
-        if alive_pieces or frame < 20:
-            self.root.after(50, lambda: self._animate_explosion(canvas, alive_pieces, frame + 1, callback))
+        ship_pieces[:] = alive_pieces
 
     def _create_shockwave(self, canvas: tk.Canvas, center_x: int, center_y: int):
         """Створює ударну хвилю що розширюється"""
@@ -319,16 +264,20 @@ class VisualEffects:
                 'delay': i * 2
             })
 
-        self._animate_shockwave(canvas, shockwave_circles, center_x, center_y, 0)
+        frames = itertools.count()
+        self._start_animation(
+            lambda: self._animate_shockwave(canvas, shockwave_circles, center_x, center_y, next(frames)),
+            40, 'shockwave'
+        )
 
     def _animate_shockwave(self, canvas: tk.Canvas, circles: list, cx: int, cy: int, frame: int):
-        """Анімує розширення ударної хвилі"""
+        """Один кадр ударної хвилі; повертає False, коли анімація завершилась"""
         if frame >= 15:
             try:
                 canvas.delete('shockwave')
             except tk.TclError:
                 pass
-            return
+            return False
 
         for circle_data in circles:
             if frame < circle_data['delay']:
@@ -353,8 +302,6 @@ class VisualEffects:
             except tk.TclError:
                 pass
 
-        self.root.after(40, lambda: self._animate_shockwave(canvas, circles, cx, cy, frame + 1))
-
     def create_smoke_effect(
         self,
         canvas: tk.Canvas,
@@ -371,9 +318,9 @@ class VisualEffects:
         # Створюємо кілька хмарок диму
         smoke_items = []
         for i in range(3):
-            offset_x = random.randint(-cell_size//4, cell_size//4)
-            offset_y = random.randint(-cell_size//4, cell_size//4)
-            size = cell_size // 2 + random.randint(-5, 5)
+            offset_x = self.rng.randint(-cell_size//4, cell_size//4)
+            offset_y = self.rng.randint(-cell_size//4, cell_size//4)
+            size = cell_size // 2 + self.rng.randint(-5, 5)
 
             smoke = canvas.create_oval(
                 center_x + offset_x - size,
@@ -393,7 +340,10 @@ class VisualEffects:
                 'alpha': 1.0
             })
 
-        self._animate_smoke(canvas, smoke_items, smoke_id, 0, duration // 100)
+        frames = itertools.count()
+        self._start_animation(
+            lambda: self._animate_smoke(canvas, smoke_items, smoke_id, next(frames), duration // 100), 100, 'smoke'
+        )
 
         # Видалимо дим через заданий час
         def remove_smoke():
@@ -402,12 +352,12 @@ class VisualEffects:
             except tk.TclError:
                 pass
 
-        self.root.after(duration, remove_smoke)
+        self.timers.after(duration, remove_smoke)
 
     def _animate_smoke(self, canvas: tk.Canvas, smoke_items: list, smoke_id: str, frame: int, max_frames: int):
-        """Анімує дим (піднімається вгору)"""
+        """Один кадр диму (піднімається вгору); повертає False, коли анімація завершилась"""
         if frame >= max_frames:
-            return
+            return False
 
         for smoke in smoke_items:
             # Підніммаємо вгору
@@ -423,9 +373,7 @@ class VisualEffects:
                     smoke['y'] + smoke['size']
                 )
             except tk.TclError:
-                return
-
-        self.root.after(100, lambda: self._animate_smoke(canvas, smoke_items, smoke_id, frame + 1, max_frames))
+                return False
 
     def create_water_waves(self, canvas: tk.Canvas, board_size: int, cell_size: int):
         """Створює анімацію хвиль на фоні"""
@@ -445,12 +393,15 @@ class VisualEffects:
             )
             wave_lines.append({'id': wave_line, 'base_y': y_pos, 'offset': i * 1.5})
 
-        self._animate_waves(canvas, wave_lines, 0, canvas_width)
+        frames = itertools.count()
+        self._start_animation(
+            lambda: self._animate_waves(canvas, wave_lines, next(frames), canvas_width), 50, 'waves'
+        )
 
     def _animate_waves(self, canvas: tk.Canvas, wave_lines: list, frame: int, canvas_width: int):
-        """Анімує хвилі"""
+        """Один кадр хвиль; повертає False, коли canvas зник"""
         if not wave_lines:
-            return
+            return False
 
         for wave in wave_lines:
             # Обчислюємо хвильову форму
@@ -463,9 +414,7 @@ class VisualEffects:
                 try:
                     canvas.coords(wave['id'], *points)
                 except tk.TclError:
-                    return
-
-        self.root.after(50, lambda: self._animate_waves(canvas, wave_lines, frame + 1, canvas_width))
+                    return False
 
     def create_hit_flash(self, canvas: tk.Canvas, x: int, y: int, cell_size: int, color: str = '#ffff00'):
         """Створює спалах при попаданні"""
@@ -485,16 +434,19 @@ class VisualEffects:
         )
 
         # Анімуємо розширення та зникнення
-        self._animate_flash(canvas, flash, center_x, center_y, cell_size//2, 0)
+        frames = itertools.count()
+        self._start_animation(
+            lambda: self._animate_flash(canvas, flash, center_x, center_y, cell_size//2, next(frames)), 40, 'hit_flash'
+        )
 
     def _animate_flash(self, canvas: tk.Canvas, flash_id: int, center_x: int, center_y: int, start_size: int, frame: int):
-        """Анімує спалах"""
+        """Один кадр спалаху; повертає False, коли анімація завершилась"""
         if frame >= 8:
             try:
                 canvas.delete(flash_id)
             except tk.TclError:
                 pass
-            return
+            return False
 
         # Збільшуємо розмір
         size = start_size + frame * 5
@@ -508,6 +460,4 @@ class VisualEffects:
                 center_y + size
             )
         except tk.TclError:
-            return
-
-        self.root.after(40, lambda: self._animate_flash(canvas, flash_id, center_x, center_y, start_size, frame + 1))
+            return False
@@ -0,0 +1,148 @@
+"""Хеш Зобріста спостережуваного стану поля та кеш рішень AI за ним.
+
+Рішення AI залежить лише від того, що видно на полі противника: влучань,
+промахів, потоплених кораблів і набору кораблів флоту. Board і BitBoard
+підтримують хеш цього стану (board.zobrist) інкрементально: attack і
+mark_surrounding_as_miss роблять XOR з ключем відкритої клітинки або
+потопленого корабля. Однакові стани постійно повторюються між партіями
+(особливо на початку), тож контролери зберігають дорогі оцінки в
+TranspositionCache за цим хешем. cache_stats() показує частку влучань кешів,
+clear_caches() очищає їх усі.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+import hashlib
+import weakref
+
+_caches: "weakref.WeakSet[TranspositionCache]" = weakref.WeakSet()
+
+
+def _key(*parts) -> int:
+    """64-бітний ключ, однаковий в усіх процесах і запусках."""
+    digest = hashlib.blake2b("/".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class ZobristKeys:
+    """Ключі Зобріста для поля заданого розміру.
+
+    Ключі клітинок обчислюються один раз і спільні для всіх полів цього
+    розміру; ключ потопленого корабля — за його розміщенням."""
+
+    def __init__(self, board_size: int):
+        self.board_size = board_size
+        cell_count = board_size * board_size
+        self.hit: Tuple[int, ...] = tuple(_key(board_size, "hit", cell) for cell in range(cell_count))
+        self.miss: Tuple[int, ...] = tuple(_key(board_size, "miss", cell) for cell in range(cell_count))
+        self._sunk: Dict[Tuple[int, int, int, int], int] = {}
+
+    @staticmethod
+    def for_board(board_size: int) -> "ZobristKeys":
+        """Повертає спільні ключі для поля board_size x board_size."""
+        return _keys_for_board(board_size)
+
+    def fleet(self, ship_sizes: Sequence[int]) -> int:
+        """Початковий хеш: розмір поля і склад флоту (від нього залежать кораблі, що лишились)."""
+        return _key(self.board_size, "fleet", *sorted(ship_sizes))
+
+    def sunk(self, ship) -> int:
+        """Ключ потопленого корабля; однопалубник однаковий в обох орієнтаціях."""
+        x, y = ship.position
+        orientation = ship.orientation.value if ship.size > 1 else 0
+        placement = (ship.size, x, y, orientation)
+        key = self._sunk.get(placement)
+        if key is None:
+            key = self._sunk[placement] = _key(self.board_size, "sunk", *placement)
+        return key
+
+
+@lru_cache(maxsize=None)
+def _keys_for_board(board_size: int) -> ZobristKeys:
+    return ZobristKeys(board_size)
+
+
+def board_hash(board) -> int:
+    """Хеш стану поля, обчислений з нуля (для перевірки та полів, змінених напряму)."""
+    # Імпорт тут, бо Board сам залежить від цього модуля
+    from Board import CellState
+
+    keys = ZobristKeys.for_board(board.size)
+    value = keys.fleet(board.ship_sizes)
+    grid = board.grid
+    for y, row in enumerate(board.revealed):
+        grid_row = grid[y]
+        for x, is_revealed in enumerate(row):
+            if is_revealed:
+                cell = y * board.size + x
+                value ^= keys.hit[cell] if grid_row[x] == CellState.HIT else keys.miss[cell]
+    for ship in board.ships:
+        if ship.is_sunk():
+            value ^= keys.sunk(ship)
+    return value
+
+
+class TranspositionCache:
+    """Обмежений LRU-кеш оцінок AI за хешем стану поля.
+
+    Зазвичай один на клас контролера, тож оцінки переходять між партіями."""
+
+    def __init__(self, name: str, maxsize: int = 100_000):
+        self.name = name
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Перевірка без впливу на статистику і порядок LRU."""
+        return key in self._entries
+
+    def get(self, key: Hashable, default=None):
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_MISSING = object()
+
+
+def clear_caches():
+    """Очищає всі кеші оцінок (і їхню статистику), наприклад перед холодним замірянням."""
+    for cache in list(_caches):
+        cache.clear()
+
+
+def cache_stats(name: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Статистика всіх кешів (або лише кешу name) за назвами."""
+    return {cache.name: cache.stats() for cache in list(_caches) if name is None or cache.name == name}